@@ -1,6 +1,111 @@
-import sys
-from pathlib import Path
+from __future__ import annotations
 
-ROOT = Path(__file__).resolve().parents[1]
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
+import random
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+
+import numpy as np
+import pytest
+
+from wealth_sim_germany.config.schemas import (
+    GovernmentSpendingConfig,
+    MacroParams,
+    PopulationConfig,
+    ScenarioConfig,
+    TaxConfig,
+)
+from wealth_sim_germany.data.distributions import DistributionFactory
+from wealth_sim_germany.models.transfers import FlatTransfer
+from wealth_sim_germany.simulation.engine import SimulationController
+from wealth_sim_germany.utils.types import GovFunction
+
+# Uniform ranges for every distribution the income and wealth models draw from.
+INCOME_RANGES = {
+    "labor_income": (20_000.0, 60_000.0),
+    "capital_income": (0.0, 5_000.0),
+    "savings_rate": (0.0, 0.2),
+    "labor_return": (0.0, 0.02),
+    "capital_return": (0.0, 0.05),
+}
+SMALL_RANGES = dict.fromkeys(INCOME_RANGES, (0.0, 0.1))
+
+
+@dataclass(frozen=True)
+class UniformSampler:
+    low: float
+    high: float
+
+    def __call__(self, rng: random.Random, conditions: dict | None = None) -> float:
+        return rng.uniform(self.low, self.high)
+
+    def batch(
+        self,
+        generator: np.random.Generator,
+        size: int,
+        conditions: dict | None = None,
+    ) -> np.ndarray:
+        return generator.uniform(self.low, self.high, size)
+
+
+def build_scenario(
+    name: str,
+    years: int = 3,
+    synthetic_n: int = 20,
+    total_population: int = 1_000,
+    spending_shares: Mapping[GovFunction, float] | None = None,
+) -> ScenarioConfig:
+    return ScenarioConfig(
+        name=name,
+        start_year=2020,
+        years=years,
+        tax=TaxConfig(income_tax_rate=0.2, capital_gains_rate=0.25, social_contrib_rate=0.1),
+        government=GovernmentSpendingConfig(
+            spending_shares=dict(
+                {GovFunction.EDUCATION: 1.0} if spending_shares is None else spending_shares
+            ),
+            deficit_limit=0.03,
+        ),
+        population=PopulationConfig(total_population=total_population, synthetic_n=synthetic_n),
+        macro=MacroParams(gdp_growth=0.01, inflation=0.02),
+    )
+
+
+def build_controller(
+    scenario: ScenarioConfig,
+    ranges: Mapping[str, tuple[float, float]] = INCOME_RANGES,
+    batch: bool = True,
+    transfer: float = 100.0,
+    seed: int | None = None,
+    columnar: bool = False,
+) -> SimulationController:
+    """A controller drawing every distribution uniformly from ``ranges``.
+
+    ``batch`` also registers vectorised samplers; without them columnar runs draw
+    person by person from ``rng``.
+    """
+    factory = DistributionFactory()
+    for name, (low, high) in ranges.items():
+        sampler = UniformSampler(low, high)
+        factory.register(name, sampler, sampler.batch if batch else None)
+    return SimulationController(
+        scenario=scenario,
+        distribution_factory=factory,
+        transfer_rule=FlatTransfer(transfer),
+        rng=None if seed is None else random.Random(seed),
+        columnar=columnar,
+    )
+
+
+@pytest.fixture
+def make_scenario() -> Callable[..., ScenarioConfig]:
+    return build_scenario
+
+
+@pytest.fixture
+def make_controller() -> Callable[..., SimulationController]:
+    return build_controller
+
+
+@pytest.fixture
+def small_ranges() -> Mapping[str, tuple[float, float]]:
+    return SMALL_RANGES
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from wealth_sim_germany.benchmarks import BenchmarkReport, BenchmarkResult, run_benchmarks
+from wealth_sim_germany.benchmarks.__main__ import main
+
+
+def test_benchmark_smoke_run_writes_and_reloads_baseline(tmp_path) -> None:
+    report = run_benchmarks(sizes=[200, 400], cases=["tax_batch", "run_columnar"], repeats=1)
+
+    assert [(result.case, result.size) for result in report.results] == [
+        ("tax_batch", 200),
+        ("tax_batch", 400),
+        ("run_columnar", 200),
+        ("run_columnar", 400),
+    ]
+    assert all(result.throughput > 0 for result in report.results)
+    assert set(report.scaling_exponents()) == {"tax_batch", "run_columnar"}
+    reloaded = BenchmarkReport.load(report.write(tmp_path / "baseline.json"))
+    assert reloaded.results == report.results
+
+
+def test_empirical_sampling_cases_run() -> None:
+    cases = ["sample_empirical", "sample_empirical_batch"]
+    report = run_benchmarks(sizes=[200], cases=cases, repeats=1)
+
+    assert [result.case for result in report.results] == cases
+    assert all(result.throughput > 0 for result in report.results)
+
+
+def test_compare_flags_throughput_and_memory_regressions() -> None:
+    baseline = BenchmarkReport([BenchmarkResult("gini", 1_000, 1.0, 1_000.0, 100)])
+    current = BenchmarkReport(
+        [
+            BenchmarkResult("gini", 1_000, 2.0, 500.0, 200),
+            BenchmarkResult("gini", 10_000, 2.0, 5_000.0, 200),
+        ]
+    )
+
+    regressions = current.compare(baseline, tolerance=0.25)
+
+    assert [(r.metric, r.ratio) for r in regressions] == [("throughput", 0.5), ("peak_bytes", 2.0)]
+    assert baseline.compare(baseline) == []
+
+
+def test_command_line_reports_regressions_in_exit_code(tmp_path) -> None:
+    output = tmp_path / "baseline.json"
+    args = ["--sizes", "1e2", "--cases", "collect_taxes", "--repeats", "1"]
+
+    assert main([*args, "--output", str(output)]) == 0
+    assert main([*args, "--baseline", str(output), "--tolerance", "1e9"]) == 0
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Callable
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from wealth_sim_germany.models.population import ROW_BYTES, Population
+from wealth_sim_germany.simulation.checkpoint import checkpoint_path, load_checkpoint
+from wealth_sim_germany.simulation.engine import SimulationController
+from wealth_sim_germany.simulation.time_step import CHUNK_OVERHEAD, CHUNK_WORKING_SET
+from wealth_sim_germany.utils.rng import AntitheticGenerator, CounterStreams, NamedStreams
+from wealth_sim_germany.utils.types import GovFunction
+
+
+@pytest.fixture
+def build_controller(make_scenario, make_controller) -> Callable[[bool], SimulationController]:
+    scenario = make_scenario(
+        "checkpointed",
+        years=4,
+        synthetic_n=25,
+        spending_shares={GovFunction.EDUCATION: 0.4, GovFunction.HEALTH: 0.6},
+    )
+    return lambda columnar: make_controller(scenario, seed=11, columnar=columnar)
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_resume_from_checkpoint_is_bit_exact(build_controller, tmp_path, columnar: bool) -> None:
+    full = build_controller(columnar).run(checkpoint_dir=tmp_path, checkpoint_every=2)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["year-2021", "year-2023"]
+    resumed = build_controller(columnar).run(resume_from=checkpoint_path(tmp_path, 2021))
+
+    assert resumed.yearly == full.yearly
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_resume_restores_named_streams(build_controller, tmp_path, columnar: bool) -> None:
+    controller = build_controller(columnar)
+    controller.streams = NamedStreams(5, antithetic=True)
+    full = controller.run(checkpoint_dir=tmp_path, checkpoint_every=2)
+
+    checkpoint = load_checkpoint(checkpoint_path(tmp_path, 2021))
+    resumed = build_controller(columnar).run(resume_from=checkpoint_path(tmp_path, 2021))
+
+    assert isinstance(checkpoint.streams, NamedStreams) and checkpoint.streams.antithetic
+    if columnar:
+        assert isinstance(checkpoint.streams.generator("labor_income"), AntitheticGenerator)
+    assert resumed.yearly == full.yearly
+
+
+def test_load_checkpoint_maps_population_columns(build_controller, tmp_path) -> None:
+    controller = build_controller(columnar=True)
+    controller.run(checkpoint_dir=tmp_path, checkpoint_every=4)
+
+    checkpoint = load_checkpoint(checkpoint_path(tmp_path, 2023))
+
+    assert isinstance(controller.persons, Population)
+    assert checkpoint.next_year == 2024
+    assert isinstance(checkpoint.population.net_wealth, np.memmap)
+    assert np.array_equal(checkpoint.population.net_wealth, controller.persons.net_wealth)
+    assert checkpoint.government == controller.government
+    assert len(checkpoint.yearly) == 4
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_forked_scenarios_match_full_runs_and_diverge_after_reform(
+    build_controller, columnar: bool
+) -> None:
+    controller = build_controller(columnar)
+    baseline = controller.scenario
+    reform = replace(baseline, tax=replace(baseline.tax, income_tax_rate=0.35))
+
+    forks = controller.fork_scenarios(2022, {"baseline": baseline, "reform": reform})
+
+    assert forks["baseline"].yearly == build_controller(columnar).run().yearly
+    assert forks["reform"].yearly[:2] == forks["baseline"].yearly[:2]
+    assert (
+        forks["reform"].yearly[2]["avg_net_income"] < forks["baseline"].yearly[2]["avg_net_income"]
+    )
+
+
+def test_fork_shares_population_columns_until_divergence(build_controller) -> None:
+    state = build_controller(columnar=True).run_until(2021)
+    fork = state.fork()
+
+    assert isinstance(state.persons, Population)
+    assert isinstance(fork.persons, Population)
+    assert fork.persons.net_wealth is state.persons.net_wealth
+    fork.persons.update_wealth(np.full(len(fork.persons), 0.1), 0.0, 0.0)
+    assert fork.persons.net_wealth is not state.persons.net_wealth
+    assert fork.persons.age is state.persons.age
+
+
+def _chunked_controller(build_controller, tmp_path, chunk_size: int) -> SimulationController:
+    controller = build_controller(columnar=True)
+    return SimulationController(
+        scenario=controller.scenario,
+        distribution_factory=controller.distribution_factory,
+        transfer_rule=controller.transfer_rule,
+        rng=random.Random(11),
+        storage_dir=tmp_path,
+        memory_budget=CHUNK_OVERHEAD + chunk_size * ROW_BYTES * CHUNK_WORKING_SET,
+    )
+
+
+def test_single_chunk_run_matches_columnar_run(build_controller, tmp_path) -> None:
+    chunked = _chunked_controller(build_controller, tmp_path, chunk_size=100)
+    assert chunked.chunk_size == 100
+
+    result = chunked.run()
+
+    expected = build_controller(columnar=True).run().yearly
+    assert result.yearly == [pytest.approx(row) for row in expected]
+
+
+def test_chunked_run_reduces_revenue_and_aggregates_across_chunks(
+    build_controller, tmp_path
+) -> None:
+    controller = _chunked_controller(build_controller, tmp_path, chunk_size=7)
+    result = controller.run()
+
+    population = controller.persons
+    assert isinstance(population, Population)
+    assert isinstance(population.net_wealth, np.memmap)
+    assert population.net_wealth.filename is not None
+    assert tmp_path in Path(population.net_wealth.filename).parents
+    assert controller.government is not None
+    assert controller.government.tax_revenue == pytest.approx(float(population.taxes.sum()))
+    assert result.yearly[-1]["population"] == 25
+    assert result.yearly[-1]["total_net_income"] == pytest.approx(
+        float(population.net_income.sum())
+    )
+    assert (
+        _chunked_controller(build_controller, tmp_path, chunk_size=7).run().yearly == result.yearly
+    )
+
+
+def test_replicas_and_forks_delete_their_population_storage(build_controller, tmp_path) -> None:
+    controller = _chunked_controller(build_controller, tmp_path, chunk_size=7)
+
+    controller.run_ensemble(3, seed=2)
+    assert list(tmp_path.iterdir()) == []
+
+    controller.fork_scenarios(2021, {"baseline": controller.scenario})
+    assert len(list(tmp_path.iterdir())) == 1
+    controller.close()
+    assert list(tmp_path.iterdir()) == []
+    assert controller.persons is None
+
+
+def test_counter_streams_make_results_independent_of_chunking(build_controller, tmp_path) -> None:
+    runs = {}
+    for chunk_size in (4, 7, 100):
+        controller = _chunked_controller(build_controller, tmp_path, chunk_size)
+        controller.streams = CounterStreams(21)
+        runs[chunk_size] = (controller.run().yearly, controller.persons)
+    columnar = build_controller(columnar=True)
+    columnar.streams = CounterStreams(21)
+    persons = build_controller(columnar=False)
+    persons.streams = CounterStreams(21)
+
+    expected = columnar.run().yearly
+    assert persons.run().yearly == [pytest.approx(row) for row in expected]
+    assert isinstance(columnar.persons, Population)
+    for yearly, population in runs.values():
+        assert yearly == [pytest.approx(row) for row in expected]
+        assert isinstance(population, Population)
+        assert np.array_equal(population.net_wealth, columnar.persons.net_wealth)
+
+
+def test_resume_with_counter_streams_is_bit_exact(build_controller, tmp_path) -> None:
+    controller = build_controller(columnar=True)
+    controller.streams = CounterStreams(3)
+    full = controller.run(checkpoint_dir=tmp_path, checkpoint_every=2)
+
+    assert load_checkpoint(checkpoint_path(tmp_path, 2021)).streams == CounterStreams(3)
+    resumed = build_controller(columnar=True).run(resume_from=checkpoint_path(tmp_path, 2021))
+
+    assert resumed.yearly == full.yearly
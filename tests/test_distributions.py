@@ -1,8 +1,16 @@
 import random
 
+import numpy as np
 import pytest
 
-from wealth_sim_germany.data.distributions import DistributionFactory
+from wealth_sim_germany.data.cells import DemographicCells
+from wealth_sim_germany.data.distributions import (
+    AliasTable,
+    DistributionFactory,
+    EmpiricalDistribution,
+)
+from wealth_sim_germany.models.person import Person
+from wealth_sim_germany.utils.types import EducationLevel, Region, Sex
 
 
 def test_distribution_factory_register_and_sample_parametric():
@@ -34,3 +42,180 @@ def test_distribution_factory_missing_distribution_raises():
 
     with pytest.raises(KeyError):
         factory.sample("missing", random.Random(0))
+
+
+def test_empirical_sampling_matches_full_scan_for_condition_subsets():
+    records = [
+        {"value": float(idx), "conditions": {"region": region, "sex": sex}}
+        for idx, (region, sex) in enumerate(
+            [("north", "male"), ("south", "female"), ("north", "female"), ("north", "male")]
+        )
+    ]
+    distribution = EmpiricalDistribution(records=records)
+
+    assert distribution.candidates({"region": "north"}).tolist() == [0.0, 2.0, 3.0]
+    assert distribution.candidates({"sex": "male", "region": "north"}).tolist() == [0.0, 3.0]
+    assert distribution.candidates({"region": "east"}).tolist() == []
+    assert distribution.candidates({"age": 40}).tolist() == []
+
+    for seed in range(5):
+        expected_rng = random.Random(seed)
+        expected = expected_rng.choice([0.0, 3.0])
+        sample = distribution.sample(random.Random(seed), {"region": "north", "sex": "male"})
+        assert sample == expected
+
+
+def test_empirical_sampling_without_match_raises():
+    distribution = EmpiricalDistribution(records=[{"value": 1.0, "conditions": {"age": 30}}])
+
+    with pytest.raises(ValueError):
+        distribution.sample(random.Random(0), {"age": 31})
+
+
+def test_records_keyword_matches_from_records_and_excludes_columns():
+    records = [{"value": 1.0, "weight": 2.0, "conditions": {"age": 30}}, {"value": 2.0}]
+
+    distribution = EmpiricalDistribution(records=records)
+    expected = EmpiricalDistribution.from_records(records)
+
+    assert distribution.values.tolist() == expected.values.tolist()
+    assert distribution.weights.tolist() == expected.weights.tolist()
+    assert distribution.levels == expected.levels
+    assert distribution.codes["age"].tolist() == expected.codes["age"].tolist()
+    with pytest.raises(ValueError, match="either records or value columns"):
+        EmpiricalDistribution(np.array([1.0]), records=records)
+
+
+def test_sample_batch_groups_empirical_draws_by_cell():
+    factory = DistributionFactory()
+    factory.register_empirical(
+        "regional_income",
+        [
+            {"value": 10.0, "conditions": {"region": "north"}},
+            {"value": 20.0, "conditions": {"region": "south"}},
+            {"value": 30.0, "conditions": {"region": "north"}},
+        ],
+    )
+    cell_ids = np.array([0, 1, 0, 1, 1])
+
+    samples = factory.sample_batch(
+        "regional_income",
+        np.random.default_rng(0),
+        cell_ids,
+        [{"region": "north"}, {"region": "south"}],
+    )
+
+    assert samples.shape == (5,)
+    assert set(samples[cell_ids == 0].tolist()) <= {10.0, 30.0}
+    assert samples[cell_ids == 1].tolist() == [20.0, 20.0, 20.0]
+
+
+def test_sample_batch_uses_vectorized_sampler_or_scalar_fallback():
+    factory = DistributionFactory()
+    seen: list[tuple[int, dict | None]] = []
+
+    def batch_sampler(generator, size, conditions=None):
+        seen.append((size, conditions))
+        return np.full(size, float(conditions["age"]))
+
+    factory.register("age_income", lambda rng, conditions=None: 0.0, batch_sampler)
+    factory.register("scalar", lambda rng, conditions=None: conditions["age"] * 2)
+    cells = [{"age": 30}, {"age": 40}]
+    cell_ids = np.array([1, 0, 1])
+
+    vectorized = factory.sample_batch("age_income", np.random.default_rng(0), cell_ids, cells)
+    fallback = factory.sample_batch("scalar", np.random.default_rng(0), cell_ids, cells)
+
+    assert vectorized.tolist() == [40.0, 30.0, 40.0]
+    assert sorted(seen, key=lambda item: item[0]) == [(1, {"age": 30}), (2, {"age": 40})]
+    assert fallback.tolist() == [80.0, 60.0, 80.0]
+
+
+def test_demographic_cells_from_persons_assigns_shared_cells():
+    persons = [
+        Person(age=30, sex=Sex.MALE, education=EducationLevel.LOW, region=Region.NORTH),
+        Person(age=45, sex=Sex.FEMALE, education=EducationLevel.HIGH, region=Region.SOUTH),
+        Person(age=30, sex=Sex.MALE, education=EducationLevel.LOW, region=Region.NORTH),
+    ]
+
+    cells = DemographicCells.from_persons(persons)
+
+    assert len(cells) == 2
+    assert cells.cell_ids.tolist() == [0, 1, 0]
+    assert cells.conditions[1] == {
+        "age": 45,
+        "sex": "female",
+        "education": "high",
+        "region": "south",
+    }
+
+
+def test_alias_table_draws_follow_weights():
+    weights = np.array([1.0, 0.0, 3.0, 6.0])
+    table = AliasTable.from_weights(weights)
+
+    draws = table.draw_batch(np.random.default_rng(0), 200_000)
+    rng = random.Random(0)
+    scalar_draws = [table.draw(rng) for _ in range(20_000)]
+
+    np.testing.assert_allclose(
+        np.bincount(draws, minlength=4) / len(draws), weights / 10, atol=0.005
+    )
+    np.testing.assert_allclose(
+        np.bincount(scalar_draws, minlength=4) / len(scalar_draws), weights / 10, atol=0.015
+    )
+    with pytest.raises(ValueError):
+        AliasTable.from_weights(np.zeros(3))
+
+
+def test_weighted_empirical_sampling_uses_weights_per_cell():
+    records = [
+        {"value": 10.0, "weight": 1.0, "conditions": {"region": "north"}},
+        {"value": 20.0, "weight": 5.0, "conditions": {"region": "south"}},
+        {"value": 30.0, "weight": 3.0, "conditions": {"region": "north"}},
+        {"value": 40.0, "weight": 0.0, "conditions": {"region": "east"}},
+    ]
+    distribution = EmpiricalDistribution.from_records(records)
+    from_arrays = EmpiricalDistribution.from_arrays(
+        values=[10.0, 20.0, 30.0, 40.0],
+        weights=[1.0, 5.0, 3.0, 0.0],
+        conditions={"region": ["north", "south", "north", "east"]},
+    )
+
+    north = distribution.sample_batch(np.random.default_rng(1), 40_000, {"region": "north"})
+
+    assert np.mean(north == 30.0) == pytest.approx(0.75, abs=0.01)
+    assert (
+        from_arrays.sample_batch(np.random.default_rng(1), 40_000, {"region": "north"}).tolist()
+        == north.tolist()
+    )
+    assert distribution.sample(random.Random(0), {"region": "south"}) == 20.0
+    with pytest.raises(ValueError):
+        distribution.sample(random.Random(0), {"region": "east"})
+
+
+def test_register_empirical_arrays_samples_by_cell():
+    factory = DistributionFactory()
+    factory.register_empirical_arrays(
+        "income",
+        values=np.array([1.0, 2.0, 3.0]),
+        weights=np.array([0.0, 1.0, 1.0]),
+        conditions={"age": np.array([30, 30, 40])},
+    )
+
+    samples = factory.sample_batch(
+        "income", np.random.default_rng(0), np.array([0, 1, 0, 1]), [{"age": 30}, {"age": 40}]
+    )
+
+    assert samples.tolist() == [2.0, 3.0, 2.0, 3.0]
+
+
+def test_enum_condition_values_match_their_string_values():
+    records = [
+        {"value": 1.0, "conditions": {"sex": Sex.MALE}},
+        {"value": 2.0, "conditions": {"sex": Sex.FEMALE}},
+    ]
+    distribution = EmpiricalDistribution(records=records)
+
+    assert distribution.sample(random.Random(0), {"sex": "male"}) == 1.0
+    assert distribution.sample(random.Random(0), {"sex": Sex.FEMALE}) == 2.0
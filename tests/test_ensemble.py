@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from wealth_sim_germany.simulation.engine import SimulationController
+from wealth_sim_germany.simulation.ensemble import control_variate_adjust, seed_replica
+from wealth_sim_germany.utils.rng import CounterStreams
+
+
+@pytest.fixture
+def build_controller(make_scenario, make_controller) -> Callable[..., SimulationController]:
+    scenario = make_scenario("ensemble", synthetic_n=30, spending_shares={})
+    return lambda columnar=False: make_controller(scenario, columnar=columnar)
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_run_ensemble_is_identical_across_worker_counts(build_controller, columnar: bool) -> None:
+    serial = build_controller(columnar).run_ensemble(4, workers=1, seed=7)
+    parallel = build_controller(columnar).run_ensemble(4, workers=2, seed=7)
+
+    assert serial.n_replications == 4
+    for name, values in serial.mean.items():
+        assert values.shape == (3,)
+        assert np.array_equal(values, parallel.mean[name])
+        assert np.array_equal(serial.variance[name], parallel.variance[name])
+    for q, bands in serial.quantiles.items():
+        for name, values in bands.items():
+            assert np.array_equal(values, parallel.quantiles[q][name])
+
+
+def test_replicas_keep_counter_streams(build_controller) -> None:
+    runs = {}
+    for columnar in (False, True):
+        controller = build_controller(columnar)
+        controller.streams = CounterStreams(0)
+        runs[columnar] = controller.run_ensemble(3, seed=5)
+    replica = build_controller()
+    replica.streams = CounterStreams(0)
+    seed_replica(replica, np.random.SeedSequence(5))
+
+    # Counter-based draws are keyed by person, so list and columnar replicas agree.
+    for name, values in runs[False].mean.items():
+        np.testing.assert_allclose(runs[True].mean[name], values, rtol=1e-9)
+    assert isinstance(replica.streams, CounterStreams)
+    with pytest.raises(ValueError):
+        seed_replica(replica, np.random.SeedSequence(5), antithetic=True)
+
+
+def test_run_ensemble_summarises_independent_replications(build_controller) -> None:
+    controller = build_controller()
+
+    result = controller.run_ensemble(5, seed=3, quantiles=(0.0, 1.0))
+
+    assert controller.persons is None
+    assert result.mean["year"].tolist() == [2020.0, 2021.0, 2022.0]
+    assert result.variance["total_gross_income"].min() > 0.0
+    low = result.quantiles[0.0]["total_gross_income"]
+    high = result.quantiles[1.0]["total_gross_income"]
+    assert np.all(low <= result.mean["total_gross_income"])
+    assert np.all(result.mean["total_gross_income"] <= high)
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_antithetic_pairs_cancel_linear_noise(build_controller, columnar: bool) -> None:
+    controller = build_controller(columnar)
+
+    result = controller.run_ensemble(8, seed=5, antithetic=True)
+    parallel = build_controller(columnar).run_ensemble(8, workers=2, seed=5, antithetic=True)
+
+    assert result.n_replications == 8
+    # Uniform incomes mirror exactly, so first-year pairs average incomes plus transfers.
+    assert result.mean["total_gross_income"][0] == pytest.approx(30 * 42_600.0)
+    assert np.all(result.variance_reduction["antithetic"]["total_gross_income"] > 1e6)
+    assert np.array_equal(result.mean["total_taxes"], parallel.mean["total_taxes"])
+    with pytest.raises(ValueError, match="even"):
+        controller.run_ensemble(3, antithetic=True)
+
+
+def test_control_variates_remove_explained_variance(build_controller) -> None:
+    controller = build_controller()
+
+    plain = controller.run_ensemble(20, seed=1)
+    controlled = controller.run_ensemble(20, seed=1, controls={"total_gross_income": 30 * 42_600.0})
+
+    assert controlled.mean["total_gross_income"] == pytest.approx([30 * 42_600.0] * 3)
+    assert np.array_equal(controlled.variance["total_taxes"], plain.variance["total_taxes"])
+    factors = controlled.variance_reduction["control_variates"]
+    assert np.all(factors["total_taxes"] > 100.0)
+    assert np.all(np.isinf(factors["total_gross_income"]))
+
+
+def test_control_variate_adjust_keeps_known_means() -> None:
+    generator = np.random.default_rng(0)
+    control = generator.normal(size=(200, 1, 1))
+    values = np.concatenate(
+        [control, 3.0 * control + 0.1 * generator.normal(size=control.shape)], axis=2
+    )
+
+    adjusted = control_variate_adjust(values, ("control", "target"), {"control": 0.0})
+
+    assert np.allclose(adjusted[:, :, 0], 0.0)
+    assert adjusted[:, 0, 1].var() < values[:, 0, 1].var() / 100
+    assert adjusted[:, 0, 1].mean() == pytest.approx(0.0, abs=0.05)
+    with pytest.raises(KeyError):
+        control_variate_adjust(values, ("control", "target"), {"missing": 0.0})
+
+
+def test_common_random_numbers_shrink_the_variance_of_reform_effects(build_controller) -> None:
+    controller = build_controller(columnar=True)
+    reform = replace(
+        controller.scenario,
+        name="higher-tax",
+        tax=replace(controller.scenario.tax, income_tax_rate=0.25),
+    )
+
+    common = controller.compare_scenarios(reform, 6, seed=2)
+    independent = controller.compare_scenarios(reform, 6, seed=2, common_random_numbers=False)
+
+    assert common.reform == "higher-tax"
+    assert np.all(common.mean_difference["total_taxes"] > 0.0)
+    assert np.all(common.variance_reduction["total_taxes"] > 10.0)
+    assert np.all(common.variance["total_taxes"] < independent.variance["total_taxes"])
+    assert np.array_equal(common.mean_difference["population"], np.zeros(3))
+
+
+def test_adaptive_ensemble_stops_once_tolerances_are_met(build_controller) -> None:
+    controller = build_controller()
+
+    result = controller.run_adaptive_ensemble(
+        {"total_gross_income": 1e5, "gini_net_income": 0.05}, batch_size=4, seed=3
+    )
+    parallel = build_controller().run_adaptive_ensemble(
+        {"total_gross_income": 1e5, "gini_net_income": 0.05}, batch_size=4, workers=2, seed=3
+    )
+    fixed = controller.run_ensemble(result.n_replications, seed=3)
+
+    assert result.converged
+    assert result.n_replications == 4 * result.n_batches
+    assert np.all(result.half_width["total_gross_income"] <= 1e5)
+    assert np.allclose(result.mean["total_taxes"], fixed.mean["total_taxes"])
+    assert np.allclose(result.variance["total_taxes"], fixed.variance["total_taxes"])
+    assert np.array_equal(result.mean["total_taxes"], parallel.mean["total_taxes"])
+
+
+def test_adaptive_ensemble_reports_an_exhausted_budget(build_controller) -> None:
+    result = build_controller().run_adaptive_ensemble(
+        {"total_gross_income": 1.0}, batch_size=4, max_replications=10, seed=1
+    )
+
+    assert not result.converged
+    assert result.n_replications == 10
+    assert result.n_batches == 3
+    assert np.all(result.half_width["total_gross_income"] > 1.0)
+    with pytest.raises(KeyError):
+        build_controller().run_adaptive_ensemble({"unknown": 1.0}, seed=1)
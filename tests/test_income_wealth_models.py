@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import random
 
+import numpy as np
+
 from wealth_sim_germany.config.schemas import MacroParams
 from wealth_sim_germany.data.distributions import DistributionFactory
 from wealth_sim_germany.models.income import IncomeModel
 from wealth_sim_germany.models.person import Person
+from wealth_sim_germany.models.population import Population
 from wealth_sim_germany.models.wealth import WealthModel
 from wealth_sim_germany.utils.types import EducationLevel, Region, Sex
 
@@ -121,3 +124,60 @@ def test_wealth_model_evolves_assets_with_macro_params() -> None:
     assert person.liquid_assets == 2_030.0
     assert person.illiquid_assets == 2_120.0
     assert person.net_wealth == 4_150.0
+
+
+def test_wealth_model_batch_methods_match_scalar_methods() -> None:
+    factory = DistributionFactory()
+    values = {
+        "liquid_assets": 12_000.0,
+        "illiquid_assets": 25_000.0,
+        "debt": 5_000.0,
+        "stocks": 3_000.0,
+        "savings_rate": 0.1,
+        "labor_return": 0.02,
+        "capital_return": 0.03,
+    }
+
+    def sampler_factory(value: float):
+        def _sampler(rng: random.Random, conditions: dict | None = None) -> float:
+            return value
+
+        def _batch_sampler(
+            generator: np.random.Generator,
+            size: int,
+            conditions: dict | None = None,
+        ) -> np.ndarray:
+            return np.full(size, value)
+
+        return _sampler, _batch_sampler
+
+    for name, value in values.items():
+        factory.register(name, *sampler_factory(value))
+    model = WealthModel(factory)
+    persons = [
+        Person(
+            age=50,
+            sex=Sex.MALE,
+            education=EducationLevel.LOW,
+            region=Region.EAST,
+            net_income=10_000.0,
+        ),
+        Person(
+            age=35,
+            sex=Sex.FEMALE,
+            education=EducationLevel.HIGH,
+            region=Region.SOUTH,
+            net_income=40_000.0,
+        ),
+    ]
+    population = Population.from_persons(persons)
+    macro_params = MacroParams(gdp_growth=0.01, inflation=0.02)
+    generator = np.random.default_rng(0)
+
+    model.initialise_wealth_batch(population, generator)
+    model.evolve_wealth_batch(population, generator, macro_params)
+    for person in persons:
+        model.initialise_wealth(person, random.Random(0))
+        model.evolve_wealth(person, random.Random(0), macro_params)
+
+    assert population.to_persons() == persons
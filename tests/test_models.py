@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
 import pytest
 
 from wealth_sim_germany.models.government import Government
 from wealth_sim_germany.models.person import Person
+from wealth_sim_germany.models.population import Population
 from wealth_sim_germany.utils.types import EducationLevel, GovFunction, Region, Sex
 
 
@@ -159,3 +161,63 @@ def test_government_apply_fiscal_rules_caps_deficit_and_updates_debt():
     assert government.expenditure[GovFunction.SOCIAL_PROTECTION] == pytest.approx(
         60.666667, rel=1e-4
     )
+
+
+def test_population_round_trips_persons_as_columns():
+    persons = [
+        Person(
+            age=25,
+            sex=Sex.FEMALE,
+            education=EducationLevel.LOW,
+            region=Region.EAST,
+            labor_income=1_000.0,
+            weight=2.0,
+        ),
+        Person(
+            age=50,
+            sex=Sex.OTHER,
+            education=EducationLevel.HIGH,
+            region=Region.WEST,
+            liquid_assets=5_000.0,
+        ),
+    ]
+
+    population = Population.from_persons(persons)
+
+    assert len(population) == 2
+    assert population.sex.tolist() == [1, 2]
+    assert population.labor_income.tolist() == [1_000.0, 0.0]
+    assert population.to_persons() == persons
+    assert population.nbytes / len(population) < 120
+
+
+def test_population_columns_mirror_person_methods():
+    person = Person(
+        age=30,
+        sex=Sex.MALE,
+        education=EducationLevel.MEDIUM,
+        region=Region.NORTH,
+        labor_income=30_000.0,
+        capital_income=2_000.0,
+        liquid_assets=10_000.0,
+        illiquid_assets=20_000.0,
+        debt=5_000.0,
+    )
+    population = Population.from_persons([person])
+
+    person.compute_total_gross_income()
+    person.apply_tax_result(income_tax=6_000.0, social_contrib=1_000.0, capital_tax=500.0)
+    person.update_wealth(savings_rate=0.1, labor_return_rate=0.02, capital_return_rate=0.03)
+    population.compute_total_gross_income()
+    population.apply_tax_result(
+        income_tax=np.array([6_000.0]),
+        social_contrib=np.array([1_000.0]),
+        capital_tax=np.array([500.0]),
+    )
+    population.update_wealth(
+        savings_rate=np.array([0.1]),
+        labor_return_rate=np.array([0.02]),
+        capital_return_rate=np.array([0.03]),
+    )
+
+    assert population.person(0) == person
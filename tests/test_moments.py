@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from wealth_sim_germany.analysis.moments import RunningMoments
+
+
+def test_running_moments_match_batch_statistics() -> None:
+    values = np.random.default_rng(0).normal(5.0, 2.0, size=(50, 3, 2))
+    moments = RunningMoments((3, 2))
+    for row in values:
+        moments.update(row)
+
+    assert moments.count == 50
+    assert np.allclose(moments.mean, values.mean(axis=0))
+    assert np.allclose(moments.variance, values.var(axis=0, ddof=1))
+    expected = 1.959963984540054 * values.std(axis=0, ddof=1) / np.sqrt(50)
+    assert np.allclose(moments.half_width(0.95), expected)
+
+
+def test_merged_moments_equal_a_single_pass() -> None:
+    values = np.random.default_rng(1).exponential(size=(30, 4))
+    left, right, single = RunningMoments((4,)), RunningMoments((4,)), RunningMoments((4,))
+    for index, row in enumerate(values):
+        (left if index < 11 else right).update(row)
+        single.update(row)
+
+    left.merge(right)
+
+    assert left.count == 30
+    assert np.allclose(left.mean, single.mean)
+    assert np.allclose(left.variance, single.variance)
+
+
+def test_half_width_is_unbounded_before_two_observations() -> None:
+    moments = RunningMoments((2,))
+    moments.update(np.array([1.0, 2.0]))
+
+    assert np.all(np.isinf(moments.half_width()))
+    assert moments.variance.tolist() == [0.0, 0.0]
+    with pytest.raises(ValueError):
+        moments.update(np.zeros(3))
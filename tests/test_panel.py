@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import numpy as np
+import pytest
+
+from wealth_sim_germany.models.population import Population
+from wealth_sim_germany.simulation.engine import SimulationController
+from wealth_sim_germany.simulation.panel import (
+    PanelReader,
+    PanelRecorder,
+    PanelSpec,
+    stratified_sample,
+)
+
+
+@pytest.fixture
+def build_controller(
+    make_scenario, make_controller, small_ranges
+) -> Callable[[bool], SimulationController]:
+    scenario = make_scenario("panel", synthetic_n=192)
+    return lambda columnar: make_controller(
+        scenario, small_ranges, batch=False, transfer=10.0, seed=8, columnar=columnar
+    )
+
+
+def test_stratified_sample_covers_every_stratum_and_ignores_chunking() -> None:
+    rng = np.random.default_rng(0)
+    population = Population.from_demographics(
+        age=np.full(5_000, 40),
+        sex=rng.integers(0, 2, 5_000),
+        education=rng.integers(0, 3, 5_000),
+        region=np.zeros(5_000, dtype=int),
+    )
+
+    index, design_weight = stratified_sample(population, PanelSpec(fraction=0.1))
+    chunked, _ = stratified_sample(population, PanelSpec(fraction=0.1, chunk_size=333))
+
+    assert np.array_equal(index, chunked)
+    assert np.all(np.diff(index) > 0)
+    assert len(index) == pytest.approx(500, abs=6)
+    assert design_weight.sum() == pytest.approx(5_000)
+    strata = population.sex[index] * 3 + population.education[index]
+    assert set(strata.tolist()) == set(range(6))
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_panel_records_sample_trajectories_without_changing_results(
+    build_controller, tmp_path, columnar: bool
+) -> None:
+    controller = build_controller(columnar)
+    result = controller.run(panel=PanelRecorder(tmp_path, PanelSpec(fraction=0.25)))
+
+    assert result.yearly == build_controller(columnar).run().yearly
+    panel = PanelReader(tmp_path)
+    assert panel.years == (2020, 2021, 2022)
+    assert isinstance(panel.year("net_wealth", 2021), np.memmap)
+    wealth = panel.trajectories("net_wealth")
+    assert wealth.shape == (len(panel), 3)
+    assert len(panel) == 48
+    final = controller.persons
+    assert final is not None
+    index = panel.sample("index")
+    if isinstance(final, Population):
+        expected = final.net_wealth[index]
+    else:
+        expected = np.array([final[i].net_wealth for i in index])
+    assert np.array_equal(wealth[:, -1], expected)
+    with pytest.raises(KeyError):
+        panel.year("debt", 2020)
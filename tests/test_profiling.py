@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+
+import pytest
+
+from wealth_sim_germany.simulation.engine import SimulationController
+from wealth_sim_germany.utils.profiling import NULL_PROFILER, Profiler
+
+
+@pytest.fixture
+def build_controller(
+    make_scenario, make_controller, small_ranges
+) -> Callable[[bool], SimulationController]:
+    scenario = make_scenario("profiled", synthetic_n=8, total_population=100)
+    return lambda columnar: make_controller(
+        scenario, small_ranges, batch=False, transfer=10.0, seed=3, columnar=columnar
+    )
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_run_records_phases_and_draws_per_distribution(build_controller, columnar: bool) -> None:
+    result = build_controller(columnar).run(profile=True)
+
+    profile = result.profile
+    assert profile is not None
+    # Person lists run the fused kernel, which times its two passes as a whole.
+    passes = (
+        ("income", "taxes", "transfers", "wealth")
+        if columnar
+        else ("income_and_taxes", "transfers_and_wealth")
+    )
+    for phase in ("year", *passes, "revenue", "aggregation"):
+        assert profile.phases[phase].calls == 3
+        assert profile.phases[phase].wall_time >= 0.0
+    assert profile.counters["persons"] == 24
+    assert profile.draws["labor_income"] == 24
+    assert profile.draws["savings_rate"] == 24
+
+
+def test_profiling_does_not_change_results_and_is_off_by_default(build_controller) -> None:
+    plain = build_controller(columnar=False).run()
+    profiled = build_controller(columnar=False).run(profile=True)
+    controller = build_controller(columnar=False)
+    controller.run(profile=True)
+
+    assert plain.profile is None
+    assert profiled.yearly == plain.yearly
+    assert controller.distribution_factory.profiler is NULL_PROFILER
+
+
+def test_profiler_exports_json_and_chrome_trace(tmp_path) -> None:
+    profiler = Profiler()
+    with profiler.phase("year", year=2020), profiler.phase("taxes"):
+        profiler.count_draws("labor_income", 5)
+
+    summary = json.loads(profiler.write_json(tmp_path / "profile.json").read_text())
+    trace = json.loads(profiler.write_chrome_trace(tmp_path / "trace.json").read_text())
+
+    assert summary["phases"]["taxes"]["calls"] == 1
+    assert summary["draws"] == {"labor_income": 5}
+    events = {event["name"]: event for event in trace["traceEvents"]}
+    assert events["year"]["ph"] == "X"
+    assert events["year"]["args"] == {"year": 2020}
+    assert events["year"]["ts"] <= events["taxes"]["ts"]
+    assert events["taxes"]["dur"] <= events["year"]["dur"]
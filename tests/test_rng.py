@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import copy
+import pickle
+import random
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from wealth_sim_germany.data.distributions import DistributionFactory
+from wealth_sim_germany.utils.rng import (
+    AntitheticGenerator,
+    AntitheticRandom,
+    CounterStreams,
+    NamedStreams,
+    normal_ppf,
+    philox4x32,
+    philox4x32_scalar,
+)
+
+
+def test_antithetic_random_mirrors_a_plain_generator() -> None:
+    plain, mirrored = random.Random(3), AntitheticRandom(3)
+
+    assert mirrored.random() == 1.0 - plain.random()
+    assert mirrored.uniform(2.0, 5.0) + plain.uniform(2.0, 5.0) == 7.0
+    assert np.isclose(mirrored.gauss(1.0, 0.5) + plain.gauss(1.0, 0.5), 2.0)
+    assert np.isclose(mirrored.lognormvariate(1.0, 0.5) * plain.lognormvariate(1.0, 0.5), np.e**2)
+    draws = [(mirrored.choice("abcd"), plain.choice("abcd")) for _ in range(20)]
+    assert all("abcd".index(a) + "abcd".index(b) == 3 for a, b in draws)
+
+
+def test_antithetic_generator_mirrors_a_plain_generator() -> None:
+    plain = np.random.default_rng(4)
+    mirrored = AntitheticGenerator(np.random.PCG64(4))
+
+    assert np.allclose(mirrored.uniform(1.0, 3.0, 5) + plain.uniform(1.0, 3.0, 5), 4.0)
+    assert np.allclose(mirrored.normal(2.0, 1.0, 5) + plain.normal(2.0, 1.0, 5), 4.0)
+    assert np.allclose(mirrored.lognormal(0.5, 1.0, 5) * plain.lognormal(0.5, 1.0, 5), np.e)
+    assert np.array_equal(mirrored.integers(0, 10, 5) + plain.integers(0, 10, 5), np.full(5, 9))
+    assert isinstance(copy.deepcopy(mirrored), AntitheticGenerator)
+    assert isinstance(pickle.loads(pickle.dumps(mirrored)), AntitheticGenerator)
+
+
+def test_named_streams_do_not_depend_on_other_names() -> None:
+    busy, quiet = NamedStreams(8), NamedStreams(8)
+    busy.generator("capital_income").random(1_000)
+    busy.rng("capital_income").random()
+
+    assert busy.generator("labor_income").random() == quiet.generator("labor_income").random()
+    assert busy.rng("labor_income").random() == quiet.rng("labor_income").random()
+    assert NamedStreams(9).rng("labor_income").random() != quiet.rng("labor_income").random()
+
+
+def test_forked_streams_continue_identically() -> None:
+    streams = NamedStreams(2, antithetic=True)
+    streams.generator("wealth").normal(size=3)
+    streams.rng("wealth").gauss()
+
+    fork = streams.fork()
+
+    assert isinstance(fork.rng("wealth"), AntitheticRandom)
+    assert fork.rng("wealth").gauss() == streams.rng("wealth").gauss()
+    assert np.array_equal(fork.generator("wealth").random(4), streams.generator("wealth").random(4))
+
+
+def test_philox_matches_the_reference_vectors() -> None:
+    cases = [
+        ((0, 0, 0, 0), (0, 0), (0x6627E8D5, 0xE169C58D, 0xBC57AC4C, 0x9B00DBD8)),
+        ((0xFFFFFFFF,) * 4, (0xFFFFFFFF,) * 2, (0x408F276D, 0x41C83B0E, 0xA20BC7C6, 0x6D5451FD)),
+        (
+            (0x243F6A88, 0x85A308D3, 0x13198A2E, 0x03707344),
+            (0xA4093822, 0x299F31D0),
+            (0xD16CFE09, 0x94FDCCEB, 0x5001E420, 0x24126EA1),
+        ),
+    ]
+    for counter, key, expected in cases:
+        assert philox4x32_scalar(counter, key) == expected
+        assert tuple(philox4x32(np.array([counter]), key)[0].tolist()) == expected
+
+
+def test_normal_ppf_matches_the_standard_library() -> None:
+    p = np.array([1e-300, 1e-12, 0.01, 0.2, 0.5, 0.74, 0.99, 1 - 1e-12])
+
+    assert np.allclose(normal_ppf(p), [NormalDist().inv_cdf(x) for x in p], rtol=1e-14)
+
+
+def test_counter_draws_do_not_depend_on_slicing() -> None:
+    streams = CounterStreams(7)
+    whole = streams.generator(2021, np.arange(100)).for_draws("labor_income")
+    part = streams.generator(2021, np.arange(40, 60)).for_draws("labor_income")
+
+    first = whole.lognormal(10.0, 0.5, 100)
+    assert np.array_equal(part.lognormal(10.0, 0.5, 20), first[40:60])
+    assert np.array_equal(part.uniform(size=20), whole.uniform(size=100)[40:60])
+    assert not np.array_equal(first, streams.generator(2022, np.arange(100)).lognormal(size=100))
+    scalar = streams.rng(2021, 45).for_draws("labor_income")
+    assert scalar.random() == streams.uniforms("labor_income", 2021, np.array([45]))[0]
+    fresh = streams.rng(2021, 45).for_draws("labor_income")
+    assert fresh.uniform(2.0, 3.0) == part.for_draws("labor_income").uniform(2.0, 3.0, 20)[5]
+
+
+def test_repeated_counter_draws_from_one_name_continue_the_stream() -> None:
+    streams = CounterStreams(7)
+    factory = DistributionFactory()
+    factory.register("shock", lambda rng, conditions: rng.random())
+    rng = streams.rng(2021, 3)
+
+    first, second = factory.sample("shock", rng), factory.sample("shock", rng)
+
+    assert first != second
+    assert [first, second] == [
+        streams.uniforms("shock", 2021, np.array([3]), slot)[0] for slot in (0, 1)
+    ]
+
+
+def test_counter_uniforms_are_uniform() -> None:
+    u = CounterStreams(1).uniforms("x", 2020, np.arange(200_000))
+
+    assert u.min() > 0.0 and u.max() < 1.0
+    assert abs(u.mean() - 0.5) < 0.005
+    assert np.allclose(np.histogram(u, bins=10, range=(0, 1))[0] / len(u), 0.1, atol=0.005)
+    with pytest.raises(ValueError, match="one value per person"):
+        CounterStreams(1).generator(2020, np.arange(3)).normal(size=4)
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 import random
+from collections.abc import Callable
 from dataclasses import dataclass
 
+import numpy as np
+import pytest
+
 from wealth_sim_germany.analysis.aggregations import (
     aggregate_by_group,
+    aggregate_by_groups,
     build_aggregates,
     gini,
     weighted_mean,
@@ -20,10 +25,16 @@ from wealth_sim_germany.data.distributions import DistributionFactory
 from wealth_sim_germany.models.government import Government
 from wealth_sim_germany.models.income import IncomeModel
 from wealth_sim_germany.models.person import Person
+from wealth_sim_germany.models.population import Population
 from wealth_sim_germany.models.tax import TaxCalculator
 from wealth_sim_germany.models.wealth import WealthModel
 from wealth_sim_germany.simulation.engine import SimulationController
-from wealth_sim_germany.simulation.time_step import SimulationContext, run_single_year
+from wealth_sim_germany.simulation.time_step import (
+    SimulationContext,
+    run_single_year,
+    run_single_year_columnar,
+    run_single_year_fused,
+)
 from wealth_sim_germany.utils.types import EducationLevel, GovFunction, Region, Sex
 
 
@@ -215,3 +226,216 @@ def test_simulation_controller_runs_and_returns_results() -> None:
     assert result.years == 1
     assert result.yearly[0]["year"] == 2020
     assert result.yearly[0]["total_gross_income"] == 25.0
+
+
+def test_simulation_controller_columnar_matches_person_list() -> None:
+    scenario = ScenarioConfig(
+        name="columnar",
+        start_year=2020,
+        years=3,
+        tax=TaxConfig(income_tax_rate=0.2, capital_gains_rate=0.25, social_contrib_rate=0.1),
+        government=GovernmentSpendingConfig(
+            spending_shares={GovFunction.SOCIAL_PROTECTION: 1.0},
+            deficit_limit=0.1,
+        ),
+        population=PopulationConfig(total_population=100, synthetic_n=24),
+        macro=MacroParams(gdp_growth=0.01, inflation=0.02),
+    )
+
+    def labor_income_sampler(rng: random.Random, conditions: dict | None = None) -> float:
+        assert conditions is not None
+        return conditions["age"] * 100.0
+
+    def capital_income_sampler(rng: random.Random, conditions: dict | None = None) -> float:
+        assert conditions is not None
+        return 500.0 if conditions["region"] == "south" else 50.0
+
+    def build_factory() -> DistributionFactory:
+        factory = DistributionFactory()
+        factory.register("labor_income", labor_income_sampler)
+        factory.register("capital_income", capital_income_sampler)
+        factory.register("savings_rate", lambda rng, conditions: 0.1)
+        factory.register("labor_return", lambda rng, conditions: 0.01)
+        factory.register("capital_return", lambda rng, conditions: 0.02)
+        return factory
+
+    results = [
+        SimulationController(
+            scenario=scenario,
+            distribution_factory=build_factory(),
+            transfer_rule=FlatTransferRule(amount=25.0),
+            rng=random.Random(0),
+            columnar=columnar,
+        ).run()
+        for columnar in (False, True)
+    ]
+
+    assert len(results[1].yearly) == 3
+    for list_row, columnar_row in zip(results[0].yearly, results[1].yearly, strict=True):
+        assert columnar_row.keys() == list_row.keys()
+        for key, value in list_row.items():
+            assert columnar_row[key] == pytest.approx(value)
+
+
+def test_run_single_year_columnar_matches_run_single_year() -> None:
+    scenario = _build_scenario()
+    factory = DistributionFactory()
+    factory.register("labor_income", lambda rng, conditions: 100.0)
+    factory.register("capital_income", lambda rng, conditions: 50.0)
+    factory.register("savings_rate", lambda rng, conditions: 0.1)
+    factory.register("labor_return", lambda rng, conditions: 0.01)
+    factory.register("capital_return", lambda rng, conditions: 0.02)
+    ctx = SimulationContext(
+        income_model=IncomeModel(factory),
+        wealth_model=WealthModel(factory),
+        tax_calculator=TaxCalculator(scenario.tax),
+        transfer_rule=FlatTransferRule(amount=10.0),
+        rng=random.Random(0),
+    )
+    persons = [
+        Person(
+            age=40,
+            sex=Sex.FEMALE,
+            education=EducationLevel.HIGH,
+            region=Region.SOUTH,
+            liquid_assets=100.0,
+            illiquid_assets=200.0,
+        )
+    ]
+    population = Population.from_persons(persons)
+
+    def build_government() -> Government:
+        return Government(
+            spending_shares=scenario.government.spending_shares,
+            deficit_limit=scenario.government.deficit_limit,
+            gdp=1_000.0,
+        )
+
+    run_single_year(ctx, persons, build_government(), scenario.start_year, scenario)
+    population, government = run_single_year_columnar(
+        ctx, population, build_government(), scenario.start_year, scenario
+    )
+
+    assert population.to_persons() == persons
+    assert government.total_revenue == 27.5
+
+
+def test_run_single_year_fused_matches_run_single_year() -> None:
+    scenario = _build_scenario()
+    factory = DistributionFactory()
+    factory.register("labor_income", lambda rng, conditions: rng.uniform(0.0, 1_000.0))
+    factory.register("capital_income", lambda rng, conditions: rng.uniform(0.0, 100.0))
+    factory.register("savings_rate", lambda rng, conditions: rng.uniform(0.0, 0.2))
+    factory.register("labor_return", lambda rng, conditions: 0.01)
+    factory.register("capital_return", lambda rng, conditions: rng.gauss(0.02, 0.05))
+
+    def run(kernel: Callable[..., tuple[list[Person], Government]]) -> tuple[list, Government]:
+        ctx = SimulationContext(
+            income_model=IncomeModel(factory),
+            wealth_model=WealthModel(factory),
+            tax_calculator=TaxCalculator(scenario.tax),
+            transfer_rule=FlatTransferRule(amount=10.0),
+            rng=random.Random(3),
+        )
+        persons = [
+            Person(
+                age=20 + index,
+                sex=Sex.FEMALE if index % 2 else Sex.MALE,
+                education=EducationLevel.MEDIUM,
+                region=Region.NORTH,
+                liquid_assets=100.0 * index,
+            )
+            for index in range(16)
+        ]
+        government = Government(
+            spending_shares=scenario.government.spending_shares,
+            deficit_limit=scenario.government.deficit_limit,
+            gdp=1_000.0,
+        )
+        for year in (2020, 2021):
+            persons, government = kernel(ctx, persons, government, year, scenario)
+        return persons, government
+
+    reference_persons, reference_government = run(run_single_year)
+    fused_persons, fused_government = run(run_single_year_fused)
+
+    assert fused_persons == reference_persons
+    assert fused_government.total_revenue == pytest.approx(reference_government.total_revenue)
+    assert fused_government.debt == pytest.approx(reference_government.debt)
+
+
+def test_build_aggregates_single_pass_matches_reference_helpers() -> None:
+    rng = random.Random(5)
+    persons = [
+        Person(
+            age=30 + idx,
+            sex=Sex.MALE,
+            education=EducationLevel.MEDIUM,
+            region=Region.WEST,
+            total_income=rng.uniform(0.0, 1_000.0),
+            taxes=rng.uniform(0.0, 100.0),
+            social_contrib=rng.uniform(0.0, 50.0),
+            net_income=rng.uniform(-100.0, 900.0),
+            weight=rng.uniform(0.5, 2.0),
+        )
+        for idx in range(50)
+    ]
+    government = Government(spending_shares={}, deficit_limit=0.1, gdp=0.0)
+    weights = [person.weight for person in persons]
+    net_income = [person.net_income for person in persons]
+
+    result = build_aggregates(persons, government, 2021)
+    columnar = build_aggregates(Population.from_persons(persons), government, 2021)
+
+    assert result["population"] == sum(weights)
+    assert result["total_gross_income"] == sum(p.total_income * p.weight for p in persons)
+    assert result["avg_net_income"] == weighted_mean(net_income, weights)
+    assert result["gini_net_income"] == pytest.approx(gini(net_income, weights), rel=1e-12)
+    for key, value in result.items():
+        assert columnar[key] == pytest.approx(value, rel=1e-12)
+    assert build_aggregates([], government, 2021)["gini_net_income"] == 0.0
+
+
+def test_aggregate_by_groups_reduces_several_keys_and_values() -> None:
+    persons = [
+        Person(
+            age=age,
+            sex=Sex.FEMALE,
+            education=education,
+            region=region,
+            net_income=net_income,
+            taxes=taxes,
+            weight=weight,
+        )
+        for age, education, region, net_income, taxes, weight in [
+            (25, EducationLevel.LOW, Region.NORTH, 100.0, 10.0, 1.0),
+            (28, EducationLevel.LOW, Region.NORTH, 300.0, 30.0, 3.0),
+            (45, EducationLevel.LOW, Region.NORTH, 500.0, 50.0, 1.0),
+            (45, EducationLevel.HIGH, Region.SOUTH, 800.0, 80.0, 2.0),
+        ]
+    ]
+
+    grouped = aggregate_by_groups(
+        persons,
+        ["region", "education", "age"],
+        ["net_income", "taxes"],
+        bins={"age": [30, 65]},
+    )
+
+    young_band = (-np.inf, 30)
+    middle_band = (30, 65)
+    assert grouped.groups == [
+        (Region.NORTH, EducationLevel.LOW, young_band),
+        (Region.NORTH, EducationLevel.LOW, middle_band),
+        (Region.SOUTH, EducationLevel.HIGH, middle_band),
+    ]
+    assert grouped.counts.tolist() == [2, 1, 1]
+    assert grouped.weights.tolist() == [4.0, 1.0, 2.0]
+    assert grouped.sums["taxes"].tolist() == [100.0, 50.0, 160.0]
+    assert grouped.means["net_income"].tolist() == [250.0, 500.0, 800.0]
+    assert grouped.to_dict("taxes")[(Region.SOUTH, EducationLevel.HIGH, middle_band)] == 80.0
+    assert aggregate_by_group(Population.from_persons(persons), "age", "net_income") == {
+        25: 100.0,
+        28: 300.0,
+        45: 700.0,
+    }
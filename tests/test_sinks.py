@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import csv
+from collections.abc import Mapping
+
+import numpy as np
+import pytest
+
+from wealth_sim_germany.simulation.engine import SimulationResult
+from wealth_sim_germany.simulation.sinks import BackgroundSink, CSVSink, NPZSink, open_sink
+
+ROWS = [
+    {"year": 2020, "population": 10.0, "gini_net_income": 0.25},
+    {"year": 2021, "population": 11.0, "gini_net_income": 0.3},
+    {"year": 2022, "population": 12.0, "gini_net_income": 0.35},
+]
+
+
+class FailingSink:
+    def write(self, row: Mapping[str, float]) -> None:
+        raise OSError("disk full")
+
+    def close(self) -> None:
+        pass
+
+
+def test_result_to_arrays_returns_one_column_per_indicator() -> None:
+    result = SimulationResult(scenario_name="s", start_year=2020, years=3, yearly=ROWS)
+
+    arrays = result.to_arrays()
+
+    assert list(arrays) == ["year", "population", "gini_net_income"]
+    assert arrays["year"].tolist() == [2020, 2021, 2022]
+    assert np.allclose(arrays["gini_net_income"], [0.25, 0.3, 0.35])
+
+
+@pytest.mark.parametrize("buffer_rows", [1, 2, 256])
+def test_csv_and_npz_sinks_write_every_row(tmp_path, buffer_rows: int) -> None:
+    sinks = [
+        CSVSink(tmp_path / "result.csv", buffer_rows),
+        NPZSink(tmp_path / "result.npz", buffer_rows),
+    ]
+    for sink in sinks:
+        for row in ROWS:
+            sink.write(row)
+        sink.close()
+
+    with (tmp_path / "result.csv").open() as handle:
+        written = list(csv.DictReader(handle))
+    assert [float(row["population"]) for row in written] == [10.0, 11.0, 12.0]
+    with np.load(tmp_path / "result.npz") as archive:
+        assert archive["year"].tolist() == [2020, 2021, 2022]
+
+
+def test_controller_streams_yearly_rows_through_background_sink(
+    tmp_path, make_scenario, make_controller, small_ranges
+) -> None:
+    controller = make_controller(
+        make_scenario("streamed", years=4, synthetic_n=6, total_population=100),
+        small_ranges,
+        batch=False,
+        transfer=10.0,
+        seed=5,
+        columnar=True,
+    )
+    sink = open_sink(tmp_path / "run.npz")
+    assert isinstance(sink, BackgroundSink)
+
+    result = controller.run(sink=sink)
+
+    with np.load(tmp_path / "run.npz") as archive:
+        for name, values in result.to_arrays().items():
+            assert np.array_equal(archive[name], values)
+
+
+def test_failed_run_reports_its_error_rather_than_the_sink_error(
+    make_scenario, make_controller
+) -> None:
+    class BrokenSink:
+        def write(self, row: Mapping[str, float]) -> None:
+            raise RuntimeError("simulation failed")
+
+        def close(self) -> None:
+            raise OSError("disk full")
+
+    controller = make_controller(make_scenario("failing", synthetic_n=4), seed=1)
+
+    with pytest.raises(RuntimeError, match="simulation failed"):
+        controller.run(sink=BrokenSink())
+
+
+def test_background_sink_reraises_writer_errors() -> None:
+    sink = BackgroundSink(FailingSink())
+    sink.write(ROWS[0])
+
+    with pytest.raises(OSError, match="disk full"):
+        sink.close()
+
+
+def test_open_sink_rejects_unknown_formats(tmp_path) -> None:
+    with pytest.raises(ValueError, match="No result sink"):
+        open_sink(tmp_path / "result.xlsx")
+
+
+def test_parquet_sink_writes_row_groups(tmp_path) -> None:
+    parquet = pytest.importorskip("pyarrow.parquet")
+    sink = open_sink(tmp_path / "result.parquet", background=False)
+    for row in ROWS:
+        sink.write(row)
+    sink.close()
+
+    assert parquet.read_table(tmp_path / "result.parquet").column("year").to_pylist() == [
+        2020,
+        2021,
+        2022,
+    ]
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from wealth_sim_germany.analysis.aggregations import build_aggregates, gini
+from wealth_sim_germany.analysis.sketch import WeightedQuantileSketch, sorted_gini
+from wealth_sim_germany.models.government import Government
+from wealth_sim_germany.models.population import Population
+from wealth_sim_germany.utils.types import GovFunction
+
+
+def _weighted_rank(values: np.ndarray, weights: np.ndarray, threshold: float) -> float:
+    return float(weights[values <= threshold].sum() / weights.sum())
+
+
+def test_sketch_is_exact_before_compaction() -> None:
+    sketch = WeightedQuantileSketch(compression=100)
+    sketch.update([1.0, 2.0, 3.0, 4.0])
+
+    assert sketch.rank_error_bound() == 0.0
+    assert sketch.gini() == pytest.approx(gini([1.0, 2.0, 3.0, 4.0], [1.0] * 4))
+    assert sketch.top_share(0.25) == pytest.approx(0.4)
+    assert sketch.top_share(0.5) == pytest.approx(0.7)
+    assert sketch.mean() == 2.5
+
+
+def test_sketch_quantiles_respect_documented_rank_error() -> None:
+    generator = np.random.default_rng(0)
+    values = generator.lognormal(10.0, 1.0, 200_000)
+    weights = generator.uniform(0.5, 2.0, 200_000)
+    sketch = WeightedQuantileSketch(compression=200, buffer_size=2_000)
+    for start in range(0, len(values), 7_000):
+        sketch.update(values[start : start + 7_000], weights[start : start + 7_000])
+
+    bound = sketch.rank_error_bound()
+    assert 0.0 < bound < 0.05
+    for q in (0.01, 0.1, 0.5, 0.9, 0.99):
+        assert abs(_weighted_rank(values, weights, sketch.quantile(q)) - q) <= bound
+    order = np.argsort(values)
+    exact_gini = sorted_gini(values[order], weights[order])
+    assert sketch.gini() <= exact_gini <= sketch.gini() + sketch.gini_error_bound()
+    assert 0.0 < sketch.gini_error_bound() < 0.1
+    assert sketch.total == pytest.approx(float(np.dot(values, weights)))
+    assert sketch.count == len(values)
+
+
+@pytest.mark.parametrize("compression", [20, 100])
+def test_sketch_gini_error_bound_holds_for_merged_skewed_streams(compression: int) -> None:
+    generator = np.random.default_rng(3)
+    values = np.concatenate([generator.pareto(1.5, 30_000), generator.uniform(0, 5, 30_000)])
+    generator.shuffle(values)
+    weights = generator.uniform(0.1, 3.0, len(values))
+    parts = [WeightedQuantileSketch(compression=compression, buffer_size=500) for _ in range(3)]
+    for part, chunk, chunk_weights in zip(
+        parts, np.array_split(values, 3), np.array_split(weights, 3), strict=True
+    ):
+        part.update(chunk, chunk_weights)
+    merged = parts[0].merge(parts[1]).merge(parts[2])
+
+    order = np.argsort(values)
+    exact = sorted_gini(values[order], weights[order])
+    assert merged.gini() <= exact <= merged.gini() + merged.gini_error_bound()
+
+
+def test_sketch_drops_zero_weight_points_when_compacting() -> None:
+    sketch = WeightedQuantileSketch(compression=10, buffer_size=50)
+    sketch.update([1.0, 2.0], [1.0, 1.0])
+    for _ in range(100):
+        sketch.update(np.arange(50.0), np.zeros(50))
+
+    assert sketch.stored_points <= 2 + sketch.buffer_size
+    assert sketch.top_share(0.5) == pytest.approx(2.0 / 3.0)
+    assert sketch.gini() == pytest.approx(gini([1.0, 2.0], [1.0, 1.0]))
+
+
+def test_merged_sketches_match_single_stream() -> None:
+    generator = np.random.default_rng(1)
+    values = generator.exponential(1_000.0, 50_000)
+    single = WeightedQuantileSketch(compression=100, buffer_size=1_000)
+    single.update(values)
+    parts = [WeightedQuantileSketch(compression=100, buffer_size=1_000) for _ in range(4)]
+    for part, chunk in zip(parts, np.array_split(values, 4), strict=True):
+        part.update(chunk)
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+
+    assert merged.count == single.count
+    assert merged.total == pytest.approx(single.total)
+    bound = merged.rank_error_bound() + single.rank_error_bound()
+    for q in (0.1, 0.5, 0.9):
+        assert abs(_weighted_rank(values, np.ones(len(values)), merged.quantile(q)) - q) <= bound
+    assert merged.gini() == pytest.approx(single.gini(), abs=bound)
+    with pytest.raises(ValueError):
+        merged.merge(WeightedQuantileSketch(compression=50))
+
+
+def test_build_aggregates_can_estimate_gini_with_sketch() -> None:
+    generator = np.random.default_rng(2)
+    size = 30_000
+    population = Population.from_demographics(
+        age=np.full(size, 40),
+        sex=np.zeros(size),
+        education=np.zeros(size),
+        region=np.zeros(size),
+    )
+    population.net_income = generator.lognormal(10.0, 0.8, size)
+    government = Government(
+        spending_shares={GovFunction.EDUCATION: 1.0}, deficit_limit=0.0, gdp=0.0
+    )
+
+    exact = build_aggregates(population, government, 2020)
+    approximate = build_aggregates(
+        population, government, 2020, use_sketch=True, sketch_compression=200
+    )
+
+    assert approximate["avg_net_income"] == exact["avg_net_income"]
+    assert approximate["gini_net_income"] == pytest.approx(exact["gini_net_income"], abs=0.01)
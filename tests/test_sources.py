@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from wealth_sim_germany.data.distributions import DistributionFactory
+from wealth_sim_germany.data.sources import CSVSource, load_columns, register_source
+
+CSV_TEXT = """value,weight,age,region
+100.5,1.0,30,north
+200.0,0.0,30,south
+,2.5,40,north
+400.0,1.5,40,south
+
+500.0,3.0,30,north
+"""
+
+
+def _write_csv(tmp_path: Path, text: str = CSV_TEXT) -> Path:
+    path = tmp_path / "income.csv"
+    path.write_text(text)
+    return path
+
+
+def test_csv_source_streams_typed_columns(tmp_path) -> None:
+    source = CSVSource(_write_csv(tmp_path), dtypes={"age": np.int16}, chunk_rows=2)
+
+    table = source.load()
+
+    assert list(table) == ["value", "weight", "age", "region"]
+    assert table["age"].dtype == np.int16
+    assert table["age"].tolist() == [30, 30, 40, 40, 30]
+    assert table["region"].tolist() == ["north", "south", "north", "south", "north"]
+    np.testing.assert_array_equal(table["value"], [100.5, 200.0, np.nan, 400.0, 500.0])
+
+
+def test_load_columns_reuses_cache_until_file_changes(tmp_path) -> None:
+    class CountingSource(CSVSource):
+        loads = 0
+
+        def load(self) -> dict[str, np.ndarray]:
+            CountingSource.loads += 1
+            return super().load()
+
+    path = _write_csv(tmp_path)
+    cache_dir = tmp_path / "cache"
+
+    first = load_columns(CountingSource(path), cache_dir)
+    second = load_columns(CountingSource(path), cache_dir)
+    assert CountingSource.loads == 1
+    assert list(second) == list(first)
+    for name, column in first.items():
+        np.testing.assert_array_equal(second[name], column)
+
+    _write_csv(tmp_path, CSV_TEXT.replace("500.0", "600.0"))
+    changed = load_columns(CountingSource(path), cache_dir)
+    assert CountingSource.loads == 2
+    assert changed["value"][-1] == 600.0
+    assert len(list(cache_dir.iterdir())) == 2
+
+
+def test_register_source_builds_weighted_conditional_distribution(tmp_path) -> None:
+    factory = DistributionFactory()
+    register_source(
+        factory,
+        "income",
+        CSVSource(_write_csv(tmp_path)),
+        weight="weight",
+        conditions=("age", "region"),
+        cache_dir=tmp_path / "cache",
+    )
+
+    samples = factory.sample_batch(
+        "income",
+        np.random.default_rng(0),
+        np.zeros(2_000, dtype=np.intp),
+        [{"age": 40, "region": "south"}],
+    )
+
+    assert set(samples.tolist()) == {400.0}
+    with pytest.raises(ValueError):
+        factory.sample_batch(
+            "income", np.random.default_rng(0), np.zeros(1, dtype=np.intp), [{"region": "east"}]
+        )
+
+
+def test_cache_writers_stage_privately(tmp_path) -> None:
+    path = _write_csv(tmp_path)
+    cache_dir = tmp_path / "cache"
+
+    class RacingSource(CSVSource):
+        def load(self) -> dict[str, np.ndarray]:
+            # Another process fills the cache while this one is still parsing.
+            load_columns(CSVSource(path), cache_dir)
+            return super().load()
+
+    directory = cache_dir / CSVSource(path).fingerprint()
+    # A writer that has not finished yet must be left alone.
+    foreign = cache_dir / f".{directory.name}.tmp"
+    foreign.mkdir(parents=True)
+
+    table = load_columns(RacingSource(path), cache_dir)
+
+    assert sorted(entry.name for entry in cache_dir.iterdir()) == sorted(
+        [directory.name, foreign.name]
+    )
+    np.testing.assert_array_equal(load_columns(CSVSource(path), cache_dir)["age"], table["age"])
+
+
+def test_csv_source_inference_does_not_depend_on_chunk_size(tmp_path) -> None:
+    path = _write_csv(tmp_path, "value,code\n1.0,7\n2.0,08\n3.0,B9\n")
+
+    tables = [CSVSource(path, chunk_rows=chunk_rows).load() for chunk_rows in (1, 100)]
+
+    for table in tables:
+        assert table["code"].tolist() == ["7", "08", "B9"]
+        assert table["value"].tolist() == [1.0, 2.0, 3.0]
+    with pytest.raises(ValueError, match="'code' cannot parse data row 3"):
+        CSVSource(path, dtypes={"code": np.int32}, chunk_rows=1).load()
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+
+import numpy as np
+import pytest
+
+from wealth_sim_germany.config.schemas import ConfigError, ScenarioConfig
+from wealth_sim_germany.config.sweep import SweepSpec, load_sweep_spec
+from wealth_sim_germany.models.population import Population
+from wealth_sim_germany.simulation.engine import SimulationController
+from wealth_sim_germany.utils.rng import NamedStreams
+from wealth_sim_germany.utils.types import GovFunction
+
+BASE = {
+    "name": "sweep",
+    "start_year": 2020,
+    "years": 3,
+    "tax": {"income_tax_rate": 0.2, "capital_gains_rate": 0.25, "social_contrib_rate": 0.1},
+    "government": {"deficit_limit": 0.03, "spending_shares": {"education": 0.5, "health": 0.5}},
+    "population": {"total_population": 1000, "synthetic_n": 20},
+    "macro": {"gdp_growth": 0.01, "inflation": 0.02},
+}
+
+
+@pytest.fixture
+def build_controller(make_controller) -> Callable[..., SimulationController]:
+    scenario = ScenarioConfig.from_dict(BASE)
+    return lambda columnar=True: make_controller(scenario, batch=False, seed=4, columnar=columnar)
+
+
+def test_grid_design_expands_every_combination() -> None:
+    spec = SweepSpec.from_dict(
+        {
+            "base": BASE,
+            "parameters": {
+                "tax.income_tax_rate": {"low": 0.1, "high": 0.3, "num": 3},
+                "government.spending_shares.education": [0.2, 0.8],
+            },
+        }
+    )
+
+    points = spec.expand()
+
+    assert len(points) == 6
+    assert points[0].values == {
+        "tax.income_tax_rate": 0.1,
+        "government.spending_shares.education": 0.2,
+    }
+    assert points[-1].scenario.tax.income_tax_rate == pytest.approx(0.3)
+    assert points[-1].scenario.government.spending_shares[GovFunction.EDUCATION] == 0.8
+
+
+def test_latin_hypercube_puts_one_sample_in_every_stratum() -> None:
+    spec = SweepSpec.from_dict(
+        {
+            "base": BASE,
+            "design": "latin_hypercube",
+            "samples": 8,
+            "seed": 3,
+            "parameters": {
+                "tax.income_tax_rate": {"low": 0.0, "high": 0.4},
+                "macro.gdp_growth": {"low": -0.02, "high": 0.06},
+            },
+        }
+    )
+
+    points = spec.expand()
+
+    rates = np.array([point.scenario.tax.income_tax_rate for point in points])
+    growth = np.array([point.scenario.macro.gdp_growth for point in points])
+    assert sorted(np.floor(rates / 0.05).astype(int).tolist()) == list(range(8))
+    assert sorted(np.floor((growth + 0.02) / 0.01).astype(int).tolist()) == list(range(8))
+
+
+def test_invalid_points_are_reported_with_their_values(tmp_path) -> None:
+    (tmp_path / "base.json").write_text(json.dumps(BASE))
+    sweep_path = tmp_path / "sweep.yaml"
+    sweep_path.write_text(
+        json.dumps({"base": "base.json", "parameters": {"government.deficit_limit": [0.0, -1.0]}})
+    )
+
+    spec = load_sweep_spec(sweep_path)
+
+    with pytest.raises(ConfigError, match="Sweep point 1"):
+        spec.expand()
+    with pytest.raises(ConfigError, match="Unexpected keys"):
+        SweepSpec.from_dict({"base": BASE, "parameters": {"tax.vat_rate": [0.19]}}).expand()
+
+
+def test_sweep_reuses_one_population_and_matches_single_runs(build_controller) -> None:
+    controller = build_controller()
+    spec = SweepSpec.from_dict({"base": BASE, "parameters": {"tax.income_tax_rate": [0.2, 0.4]}})
+
+    result = controller.run_sweep(spec, seed=9)
+    parallel = controller.run_sweep(spec, workers=2, seed=9)
+
+    assert result.values.shape == (2, 3, len(result.indicators))
+    assert result.years.tolist() == [2020, 2021, 2022]
+    assert np.array_equal(result.values, parallel.values)
+    taxes = result.indicator("total_taxes")
+    assert np.all(taxes[1] > taxes[0])
+    single = build_controller()
+    single.streams = NamedStreams(9)
+    expected = single.run().yearly
+    assert result.indicator("total_net_income")[0].tolist() == [
+        row["total_net_income"] for row in expected
+    ]
+
+
+def test_sweep_leaves_the_shared_population_untouched(build_controller) -> None:
+    controller = build_controller()
+    population, _ = controller.initialise()
+    assert isinstance(population, Population)
+    before = population.net_wealth
+
+    controller.run_sweep(
+        SweepSpec.from_dict({"base": BASE, "parameters": {"macro.gdp_growth": [0.0, 0.02]}})
+    )
+
+    assert controller.persons is population
+    assert population.net_wealth is before
+    assert not population.net_wealth.any()
@@ -1,8 +1,14 @@
+import numpy as np
 import pytest
 
-from wealth_sim_germany.config.schemas import TaxConfig
+from wealth_sim_germany.config.schemas import ConfigError, IncomeTaxTariffConfig, TaxConfig
 from wealth_sim_germany.models.person import Person
-from wealth_sim_germany.models.tax import TaxCalculator
+from wealth_sim_germany.models.tax import (
+    TaxCalculator,
+    compute_tariff_tax,
+    compute_tariff_tax_scalar,
+    tariff_table,
+)
 from wealth_sim_germany.utils.types import EducationLevel, Region, Sex
 
 
@@ -43,3 +49,117 @@ def test_tax_calculator_computes_all_taxes_for_person():
     assert tax_result.capital_tax == pytest.approx(1_250.0)
     assert tax_result.social_contrib == pytest.approx(5_600.0)
     assert tax_result.total == pytest.approx(17_050.0)
+
+
+def test_tax_calculator_batch_matches_scalar_rules():
+    calculator = TaxCalculator(
+        TaxConfig(income_tax_rate=0.2, capital_gains_rate=0.25, social_contrib_rate=0.1)
+    )
+    labor_income = np.array([50_000.0, -8_000.0, 0.0])
+    capital_income = np.array([5_000.0, 1_000.0, -2_000.0])
+    transfers = np.array([1_000.0, 500.0, 0.0])
+
+    result = calculator.compute_all_taxes_batch(labor_income, capital_income, transfers)
+
+    for index in range(len(labor_income)):
+        person = Person(
+            age=42,
+            sex=Sex.FEMALE,
+            education=EducationLevel.HIGH,
+            region=Region.WEST,
+            labor_income=float(labor_income[index]),
+            capital_income=float(capital_income[index]),
+            transfers=float(transfers[index]),
+        )
+        expected = calculator.compute_all_taxes(person)
+        assert result.gross_income[index] == person.total_income
+        assert result.income_tax[index] == expected.income_tax
+        assert result.social_contrib[index] == expected.social_contrib
+        assert result.capital_tax[index] == expected.capital_tax
+        assert result.total[index] == pytest.approx(expected.total)
+
+
+TARIFF_2024 = {
+    "basic_allowance": 11_604,
+    "zone2_limit": 17_005,
+    "zone2_coefficients": [922.98, 1_400],
+    "zone3_limit": 66_760,
+    "zone3_coefficients": [181.19, 2_397, 1_025.38],
+    "zone4_limit": 277_825,
+    "zone4_rate": 0.42,
+    "zone4_offset": 10_602.13,
+    "top_rate": 0.45,
+    "top_offset": 18_936.88,
+}
+
+
+def test_progressive_tariff_evaluates_all_zones():
+    tariff = IncomeTaxTariffConfig.from_dict(TARIFF_2024)
+    incomes = np.array([-1_000.0, 11_604.0, 17_005.0, 50_000.0, 100_000.0, 300_000.0])
+
+    taxes = compute_tariff_tax(tariff, incomes)
+
+    assert taxes.tolist() == [0.0, 0.0, 1_025.0, 10_906.0, 31_397.0, 116_063.0]
+    assert compute_tariff_tax(tariff, np.array([100_000.0]), joint=True).tolist() == [21_812.0]
+    assert tariff_table(tariff) is tariff_table(IncomeTaxTariffConfig.from_dict(TARIFF_2024))
+
+
+def test_progressive_tariff_adds_solidarity_surcharge_above_exemption():
+    tariff = IncomeTaxTariffConfig.from_dict(
+        {
+            **TARIFF_2024,
+            "solidarity_rate": 0.055,
+            "solidarity_exemption": 18_130,
+            "solidarity_phase_in_rate": 0.119,
+        }
+    )
+
+    taxes = compute_tariff_tax(tariff, np.array([50_000.0, 100_000.0, 300_000.0]))
+
+    assert taxes[0] == 10_906.0
+    assert taxes[1] == pytest.approx(31_397.0 + 1_578.77)
+    assert taxes[2] == pytest.approx(116_063.0 + 6_383.46)
+
+
+@pytest.mark.parametrize("joint", [False, True])
+def test_scalar_tariff_matches_array_tariff(joint: bool):
+    tariff = IncomeTaxTariffConfig.from_dict(
+        {
+            **TARIFF_2024,
+            "solidarity_rate": 0.055,
+            "solidarity_exemption": 18_130,
+            "solidarity_phase_in_rate": 0.119,
+        }
+    )
+    incomes = np.concatenate([[-100.0, 0.0], np.random.default_rng(0).uniform(0, 600_000, 2_000)])
+
+    expected = compute_tariff_tax(tariff, incomes, joint=joint)
+
+    scalar = [compute_tariff_tax_scalar(tariff, income, joint=joint) for income in incomes]
+    assert scalar == expected.tolist()
+
+
+def test_tax_calculator_uses_tariff_in_force_for_year():
+    tax_config = TaxConfig.from_dict(
+        {
+            "income_tax_rate": 0.2,
+            "capital_gains_rate": 0.25,
+            "social_contrib_rate": 0.1,
+            "income_tax_tariffs": {2024: TARIFF_2024},
+        }
+    )
+    calculator = TaxCalculator(tax_config)
+
+    assert calculator.compute_income_tax(50_000.0) == pytest.approx(10_000.0)
+    assert calculator.compute_income_tax(50_000.0, year=2023) == pytest.approx(10_000.0)
+    assert calculator.compute_income_tax(50_000.0, year=2030) == 10_906.0
+    batch = calculator.compute_all_taxes_batch(
+        np.array([50_000.0]), np.array([5_000.0]), np.array([0.0]), year=2025
+    )
+    assert batch.income_tax.tolist() == [10_906.0]
+    assert batch.capital_tax.tolist() == [1_250.0]
+
+
+def test_tariff_config_rejects_decreasing_zone_limits():
+    with pytest.raises(ConfigError):
+        IncomeTaxTariffConfig.from_dict({**TARIFF_2024, "zone3_limit": 10_000})
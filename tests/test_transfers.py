@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from wealth_sim_germany.models.government import BatchTransferRule, Government
+from wealth_sim_germany.models.person import Person
+from wealth_sim_germany.models.population import Population
+from wealth_sim_germany.models.transfers import (
+    BasicIncomeSupport,
+    ChildBenefit,
+    FlatTransfer,
+    MeansTestedTransfer,
+)
+from wealth_sim_germany.utils.types import EducationLevel, GovFunction, Region, Sex
+
+RULES = (
+    FlatTransfer(amount=500.0),
+    MeansTestedTransfer(max_benefit=6_000.0, threshold=10_000.0, phase_out_rate=0.5),
+    BasicIncomeSupport(),
+    ChildBenefit(),
+)
+
+
+def _government() -> Government:
+    return Government(
+        spending_shares={GovFunction.SOCIAL_PROTECTION: 1.0},
+        deficit_limit=0.03,
+        gdp=0.0,
+    )
+
+
+def _population(size: int = 200) -> Population:
+    generator = np.random.default_rng(0)
+    persons = [
+        Person(
+            age=int(generator.integers(0, 90)),
+            sex=Sex.FEMALE,
+            education=EducationLevel.MEDIUM,
+            region=Region.WEST,
+            labor_income=float(generator.choice([0.0, generator.uniform(0.0, 30_000.0)])),
+            capital_income=float(generator.uniform(0.0, 2_000.0)),
+            liquid_assets=float(generator.uniform(0.0, 50_000.0)),
+            stocks=float(generator.uniform(0.0, 10_000.0)),
+        )
+        for _ in range(size)
+    ]
+    return Population.from_persons(persons)
+
+
+@pytest.mark.parametrize("rule", RULES, ids=lambda rule: type(rule).__name__)
+def test_batch_transfers_match_per_person_rule(rule: BatchTransferRule) -> None:
+    population = _population()
+    government = _government()
+
+    expected = [
+        rule.compute_transfer(population.person(index), government)
+        for index in range(len(population))
+    ]
+
+    assert isinstance(rule, BatchTransferRule)
+    np.testing.assert_allclose(rule.compute_transfers_batch(population, government), expected)
+
+
+def test_pay_transfers_uses_batch_rule_for_populations() -> None:
+    class CountingRule(MeansTestedTransfer):
+        def compute_transfer(self, person: Person, government: Government) -> float:
+            raise AssertionError("per-person rule called for a population")
+
+    population = _population(10)
+    population.transfers = np.full(10, 100.0)
+    rule = CountingRule(max_benefit=1_000.0, threshold=0.0, phase_out_rate=0.1)
+
+    _government().pay_transfers(population, rule)
+
+    income = population.labor_income + population.capital_income
+    np.testing.assert_allclose(
+        population.transfers, 100.0 + np.maximum(1_000.0 - 0.1 * income, 0.0)
+    )
+
+
+def test_pay_transfer_credits_one_person_and_returns_the_amount() -> None:
+    person = Person(age=30, sex=Sex.MALE, education=EducationLevel.LOW, region=Region.EAST)
+    person.transfers = 100.0
+
+    assert _government().pay_transfer(person, FlatTransfer(amount=500.0)) == 500.0
+    assert person.transfers == 600.0
+
+
+def test_basic_income_support_applies_asset_test_and_earnings_allowance() -> None:
+    rule = BasicIncomeSupport(
+        standard_rate=6_000.0, asset_allowance=10_000.0, earnings_allowance=1_000.0
+    )
+    government = _government()
+
+    def person(**values: float) -> Person:
+        return Person(
+            age=40, sex=Sex.MALE, education=EducationLevel.LOW, region=Region.EAST, **values
+        )
+
+    assert rule.compute_transfer(person(labor_income=900.0), government) == 6_000.0
+    assert rule.compute_transfer(person(labor_income=3_000.0), government) == 4_400.0
+    assert rule.compute_transfer(person(liquid_assets=8_000.0, stocks=3_000.0), government) == 0.0
+    assert ChildBenefit().compute_transfer(person(), government) == 0.0
@@ -1,12 +1,22 @@
 from wealth_sim_germany.analysis.aggregations import (
+    AggregateAccumulator,
+    GroupedAggregates,
     aggregate_by_group,
+    aggregate_by_groups,
     build_aggregates,
     gini,
     weighted_mean,
 )
+from wealth_sim_germany.analysis.moments import RunningMoments
+from wealth_sim_germany.analysis.sketch import WeightedQuantileSketch
 
 __all__ = [
+    "AggregateAccumulator",
+    "GroupedAggregates",
+    "RunningMoments",
+    "WeightedQuantileSketch",
     "aggregate_by_group",
+    "aggregate_by_groups",
     "build_aggregates",
     "gini",
     "weighted_mean",
@@ -1,10 +1,26 @@
 from __future__ import annotations
 
-from collections import defaultdict
-from collections.abc import Iterable
+from array import array
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
 
+import numpy as np
+
+from wealth_sim_germany.analysis.sketch import (
+    DEFAULT_COMPRESSION,
+    WeightedQuantileSketch,
+    sorted_gini,
+)
+from wealth_sim_germany.data.cells import EDUCATION_LEVELS, REGIONS, SEXES
 from wealth_sim_germany.models.government import Government
 from wealth_sim_germany.models.person import Person
+from wealth_sim_germany.models.population import Population
+
+ENUM_LEVELS: dict[str, tuple] = {
+    "sex": SEXES,
+    "education": EDUCATION_LEVELS,
+    "region": REGIONS,
+}
 
 
 def weighted_mean(values: Iterable[float], weights: Iterable[float]) -> float:
@@ -37,44 +53,250 @@ def gini(values: Iterable[float], weights: Iterable[float]) -> float:
     return numerator / (total_weight**2 * mean)
 
 
+def _gini_arrays(values: np.ndarray, weights: np.ndarray) -> float:
+    order = np.argsort(values, kind="stable")
+    return sorted_gini(values[order], weights[order])
+
+
+def _sketch_gini(values: np.ndarray, weights: np.ndarray, compression: int) -> float:
+    sketch = WeightedQuantileSketch(compression=compression)
+    sketch.update(values, weights)
+    return sketch.gini()
+
+
+@dataclass(frozen=True)
+class GroupedAggregates:
+    """Weighted sums, means and counts per combination of group keys.
+
+    ``groups[i]`` is the key tuple of cell ``i``; every array is indexed by cell.
+    """
+
+    group_fields: tuple[str, ...]
+    groups: list[tuple]
+    counts: np.ndarray
+    weights: np.ndarray
+    sums: dict[str, np.ndarray]
+
+    @property
+    def means(self) -> dict[str, np.ndarray]:
+        safe_weights = np.where(self.weights == 0, 1.0, self.weights)
+        return {
+            field: np.where(self.weights == 0, 0.0, sums / safe_weights)
+            for field, sums in self.sums.items()
+        }
+
+    def to_dict(self, value_field: str) -> dict[tuple, float]:
+        means = self.means[value_field]
+        return {group: float(mean) for group, mean in zip(self.groups, means, strict=True)}
+
+
+def _group_codes(
+    population: Population,
+    field: str,
+    edges: Sequence[float] | None,
+) -> tuple[np.ndarray, list[object]]:
+    column = getattr(population, field)
+    if edges is not None:
+        bounds = [-np.inf, *edges, np.inf]
+        labels: list[object] = [(bounds[idx], bounds[idx + 1]) for idx in range(len(bounds) - 1)]
+        return np.digitize(column, edges), labels
+    if field in ENUM_LEVELS:
+        return column.astype(np.intp), list(ENUM_LEVELS[field])
+    values, codes = np.unique(column, return_inverse=True)
+    return codes.ravel(), values.tolist()
+
+
+def aggregate_by_groups(
+    persons: Iterable[Person] | Population,
+    group_fields: Sequence[str],
+    value_fields: Sequence[str],
+    bins: dict[str, Sequence[float]] | None = None,
+) -> GroupedAggregates:
+    """Group by several keys at once and reduce several value fields per cell.
+
+    Each key combination is encoded as one integer cell code and all statistics are
+    computed with ``bincount`` reductions. ``bins`` maps a field to ascending band edges,
+    for example ``{"age": [30, 50, 65]}``; banded keys are labelled ``(lower, upper)``.
+    """
+    population = persons if isinstance(persons, Population) else Population.from_persons(persons)
+    bins = bins or {}
+    codes: list[np.ndarray] = []
+    labels: list[list[object]] = []
+    for field in group_fields:
+        field_codes, field_labels = _group_codes(population, field, bins.get(field))
+        codes.append(field_codes)
+        labels.append(field_labels)
+    shape = tuple(len(field_labels) for field_labels in labels)
+    cell_codes = np.ravel_multi_index(codes, shape) if codes else np.zeros(len(population), int)
+    occupied, cells = np.unique(cell_codes, return_inverse=True)
+    cells = cells.ravel()
+    weights = population.weight
+    groups = [
+        tuple(
+            field_labels[code]
+            for field_labels, code in zip(labels, np.unravel_index(cell, shape), strict=True)
+        )
+        for cell in occupied.tolist()
+    ]
+    return GroupedAggregates(
+        group_fields=tuple(group_fields),
+        groups=groups,
+        counts=np.bincount(cells, minlength=len(occupied)),
+        weights=np.bincount(cells, weights=weights, minlength=len(occupied)),
+        sums={
+            field: np.bincount(
+                cells, weights=getattr(population, field) * weights, minlength=len(occupied)
+            )
+            for field in value_fields
+        },
+    )
+
+
 def aggregate_by_group(
-    persons: Iterable[Person],
+    persons: Iterable[Person] | Population,
     group_field: str,
     value_field: str,
 ) -> dict[object, float]:
-    grouped_values: dict[object, list[float]] = defaultdict(list)
-    grouped_weights: dict[object, list[float]] = defaultdict(list)
-    for person in persons:
-        group_value = getattr(person, group_field)
-        grouped_values[group_value].append(getattr(person, value_field))
-        grouped_weights[group_value].append(person.weight)
-    return {
-        group: weighted_mean(values, grouped_weights[group])
-        for group, values in grouped_values.items()
-    }
+    grouped = aggregate_by_groups(persons, [group_field], [value_field])
+    return {group: mean for (group,), mean in grouped.to_dict(value_field).items()}
 
 
-def build_aggregates(
-    persons: Iterable[Person],
-    government: Government,
+def _indicators(
     year: int,
+    population: float,
+    total_gross_income: float,
+    total_net_income: float,
+    total_taxes: float,
+    gini_net_income: float,
+    government: Government,
 ) -> dict[str, float]:
-    persons_list = list(persons)
-    weights = [person.weight for person in persons_list]
-    total_income = sum(person.total_income * person.weight for person in persons_list)
-    total_net_income = sum(person.net_income * person.weight for person in persons_list)
-    total_taxes = sum(
-        (person.taxes + person.social_contrib) * person.weight for person in persons_list
-    )
     return {
         "year": year,
-        "population": sum(weights),
-        "total_gross_income": total_income,
+        "population": population,
+        "total_gross_income": total_gross_income,
         "total_net_income": total_net_income,
         "total_taxes": total_taxes,
-        "avg_net_income": weighted_mean([person.net_income for person in persons_list], weights),
-        "gini_net_income": gini([person.net_income for person in persons_list], weights),
+        "avg_net_income": total_net_income / population if population else 0.0,
+        "gini_net_income": gini_net_income,
         "government_revenue": government.total_revenue,
         "government_deficit": government.deficit,
         "government_debt": government.debt,
     }
+
+
+def _gini(values: np.ndarray, weights: np.ndarray, sketch_compression: int | None) -> float:
+    if sketch_compression is None:
+        return _gini_arrays(values, weights)
+    return _sketch_gini(values, weights, sketch_compression)
+
+
+def _build_population_aggregates(
+    population: Population,
+    government: Government,
+    year: int,
+    sketch_compression: int | None,
+) -> dict[str, float]:
+    weights = population.weight
+    return _indicators(
+        year=year,
+        population=float(weights.sum()),
+        total_gross_income=float(np.dot(population.total_income, weights)),
+        total_net_income=float(np.dot(population.net_income, weights)),
+        total_taxes=float(np.dot(population.taxes, weights))
+        + float(np.dot(population.social_contrib, weights)),
+        gini_net_income=_gini(population.net_income, weights, sketch_compression),
+        government=government,
+    )
+
+
+def _build_person_aggregates(
+    persons: Iterable[Person],
+    government: Government,
+    year: int,
+    sketch_compression: int | None,
+) -> dict[str, float]:
+    population = 0.0
+    total_gross_income = 0.0
+    total_net_income = 0.0
+    total_taxes = 0.0
+    net_income = array("d")
+    weights = array("d")
+    for person in persons:
+        weight = person.weight
+        population += weight
+        total_gross_income += person.total_income * weight
+        total_net_income += person.net_income * weight
+        total_taxes += (person.taxes + person.social_contrib) * weight
+        net_income.append(person.net_income)
+        weights.append(weight)
+    return _indicators(
+        year=year,
+        population=population,
+        total_gross_income=total_gross_income,
+        total_net_income=total_net_income,
+        total_taxes=total_taxes,
+        gini_net_income=_gini(
+            np.frombuffer(net_income, dtype=float),
+            np.frombuffer(weights, dtype=float),
+            sketch_compression,
+        ),
+        government=government,
+    )
+
+
+def build_aggregates(
+    persons: Iterable[Person] | Population,
+    government: Government,
+    year: int,
+    use_sketch: bool = False,
+    sketch_compression: int = DEFAULT_COMPRESSION,
+) -> dict[str, float]:
+    """Yearly indicators computed in a single pass over the population.
+
+    ``use_sketch`` estimates the Gini from a ``WeightedQuantileSketch`` instead of a full sort;
+    the estimate errs low by at most the sketch's ``gini_error_bound()``.
+    """
+    compression = sketch_compression if use_sketch else None
+    if isinstance(persons, Population):
+        return _build_population_aggregates(persons, government, year, compression)
+    return _build_person_aggregates(persons, government, year, compression)
+
+
+class AggregateAccumulator:
+    """``build_aggregates`` reduced over population chunks.
+
+    Totals are summed exactly; the Gini coefficient comes from a mergeable
+    ``WeightedQuantileSketch``, so memory does not grow with the population. That Gini is
+    a lower estimate; ``gini_error_bound()`` gives how far below the exact value it may be.
+    """
+
+    def __init__(self, sketch_compression: int = DEFAULT_COMPRESSION) -> None:
+        self.population = 0.0
+        self.total_gross_income = 0.0
+        self.total_net_income = 0.0
+        self.total_taxes = 0.0
+        self.net_income = WeightedQuantileSketch(compression=sketch_compression)
+
+    def update(self, chunk: Population) -> None:
+        weights = chunk.weight
+        self.population += float(weights.sum())
+        self.total_gross_income += float(np.dot(chunk.total_income, weights))
+        self.total_net_income += float(np.dot(chunk.net_income, weights))
+        self.total_taxes += float(np.dot(chunk.taxes, weights)) + float(
+            np.dot(chunk.social_contrib, weights)
+        )
+        self.net_income.update(chunk.net_income, weights)
+
+    def gini_error_bound(self) -> float:
+        return self.net_income.gini_error_bound()
+
+    def result(self, government: Government, year: int) -> dict[str, float]:
+        return _indicators(
+            year=year,
+            population=self.population,
+            total_gross_income=self.total_gross_income,
+            total_net_income=self.total_net_income,
+            total_taxes=self.total_taxes,
+            gini_net_income=self.net_income.gini(),
+            government=government,
+        )
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from statistics import NormalDist
+
+import numpy as np
+
+
+@dataclass
+class RunningMoments:
+    """Online mean and variance of equally shaped arrays (Welford's algorithm).
+
+    Only the count, mean and sum of squared deviations are kept, so memory does not grow
+    with the number of observations. Accumulators of the same shape can be merged.
+    """
+
+    shape: tuple[int, ...]
+    count: int = 0
+    mean: np.ndarray = field(init=False)
+    _m2: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.mean = np.zeros(self.shape)
+        self._m2 = np.zeros(self.shape)
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=float)
+        self.count += 1
+        delta = values - self.mean
+        self.mean = self.mean + delta / self.count
+        self._m2 = self._m2 + delta * (values - self.mean)
+
+    def merge(self, other: RunningMoments) -> None:
+        """Absorb ``other``'s observations (Chan et al.'s pairwise update)."""
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 = self._m2 + other._m2 + delta**2 * self.count * other.count / total
+        self.mean = self.mean + delta * other.count / total
+        self.count = total
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Sample variance (``ddof=1``); zero before the second observation."""
+        if self.count < 2:
+            return np.zeros(self.shape)
+        return self._m2 / (self.count - 1)
+
+    def half_width(self, confidence: float = 0.95) -> np.ndarray:
+        """Half-width of the normal-approximation confidence interval of the mean."""
+        if self.count < 2:
+            return np.full(self.shape, np.inf)
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        return z * np.sqrt(self.variance / self.count)
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+DEFAULT_COMPRESSION = 1_000
+
+
+def _compact(
+    values: np.ndarray,
+    weights: np.ndarray,
+    compression: int,
+) -> tuple[np.ndarray, np.ndarray, float]:
+    """Collapse sorted runs of points into at most ``compression`` equal-weight centroids.
+
+    Points without positive weight carry no mass and are dropped. The third result is the
+    weighted absolute deviation of the points from their centroids.
+    """
+    positive = weights > 0
+    if not positive.all():
+        values = values[positive]
+        weights = weights[positive]
+    order = np.argsort(values, kind="stable")
+    values = values[order]
+    weights = weights[order]
+    if len(values) <= compression:
+        return values, weights, 0.0
+    total_weight = weights.sum()
+    midpoints = np.cumsum(weights) - 0.5 * weights
+    bins = np.minimum((midpoints / total_weight * compression).astype(np.intp), compression - 1)
+    bin_weights = np.bincount(bins, weights=weights, minlength=compression)
+    bin_totals = np.bincount(bins, weights=weights * values, minlength=compression)
+    occupied = bin_weights > 0
+    centroids = bin_totals / np.where(occupied, bin_weights, 1.0)
+    deviation = np.abs(values - centroids[bins])
+    slack = float(np.dot(weights, deviation))
+    return centroids[occupied], bin_weights[occupied], slack
+
+
+def sorted_gini(values: np.ndarray, weights: np.ndarray) -> float:
+    """Weighted Gini coefficient of values that are already sorted in ascending order."""
+    total_weight = float(weights.sum())
+    if not len(values) or total_weight == 0:
+        return 0.0
+    mean = float(np.dot(values, weights)) / total_weight
+    if mean == 0:
+        return 0.0
+    cumulative_weights = np.cumsum(weights)
+    numerator = float(np.sum(weights * (2 * cumulative_weights - total_weight - weights) * values))
+    return numerator / (total_weight**2 * mean)
+
+
+class WeightedQuantileSketch:
+    """Streaming, mergeable summary of a weighted value distribution.
+
+    Points are buffered until ``buffer_size`` of them arrive; a full buffer is compacted into
+    at most ``compression`` centroids of roughly equal weight and carried up a binary
+    hierarchy of summaries (merge and reduce), so memory stays at
+    ``O(buffer_size + compression * log2(n / buffer_size))`` and updates cost
+    ``O(n log buffer_size)``.
+
+    Error bound: a compaction moves at most one centroid's weight, ``W_level / compression``,
+    across any threshold. Each point passes through at most ``levels + 1`` compactions, so
+    ``quantile`` has a normalised rank error of at most ``rank_error_bound()``, that is
+    ``(levels + 1) / compression``. Top shares are evaluated on the centroids and inherit
+    the same rank error.
+
+    Gini: replacing the points of a bin by their mean ``m`` never increases the sum of
+    weighted absolute differences, and by the triangle inequality it lowers that sum by
+    at most ``2 * W * D`` for the whole stream, where ``W`` is the final total weight and
+    ``D`` the bin's weighted absolute deviation from ``m``. Summing ``D`` over every
+    compaction, the exact Gini lies in ``[gini(), gini() + gini_error_bound()]``. The bound
+    is guaranteed for any stream and usually far from tight. The weighted sum, count and
+    extremes are tracked exactly, and all results are exact while nothing has been
+    compacted.
+    """
+
+    def __init__(
+        self,
+        compression: int = DEFAULT_COMPRESSION,
+        buffer_size: int | None = None,
+    ) -> None:
+        if compression <= 0:
+            raise ValueError("compression must be positive")
+        self.compression = compression
+        self.buffer_size = buffer_size or 10 * compression
+        self.count = 0
+        self.total_weight = 0.0
+        self.total = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self._buffer_values: list[np.ndarray] = []
+        self._buffer_weights: list[np.ndarray] = []
+        self._buffered = 0
+        self._levels: list[tuple[np.ndarray, np.ndarray] | None] = []
+        self._gini_slack = 0.0
+
+    def update(self, values: Iterable[float], weights: Iterable[float] | None = None) -> None:
+        values = np.asarray(values if isinstance(values, np.ndarray) else list(values), dtype=float)
+        if weights is None:
+            weights = np.ones(len(values))
+        else:
+            weights = np.asarray(
+                weights if isinstance(weights, np.ndarray) else list(weights), dtype=float
+            )
+        if not len(values):
+            return
+        self.count += len(values)
+        self.total_weight += float(weights.sum())
+        self.total += float(np.dot(values, weights))
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        start = 0
+        while start < len(values):
+            stop = min(len(values), start + self.buffer_size - self._buffered)
+            self._buffer_values.append(values[start:stop])
+            self._buffer_weights.append(weights[start:stop])
+            self._buffered += stop - start
+            start = stop
+            if self._buffered >= self.buffer_size:
+                self._flush()
+
+    def merge(self, other: WeightedQuantileSketch) -> WeightedQuantileSketch:
+        """Fold ``other`` into this sketch; both must share the same ``compression``."""
+        if other.compression != self.compression:
+            raise ValueError("Only sketches with equal compression can be merged")
+        self.count += other.count
+        self.total_weight += other.total_weight
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._gini_slack += other._gini_slack
+        for level, summary in enumerate(other._levels):
+            if summary is not None:
+                self._carry(level, *summary)
+        for values, weights in zip(other._buffer_values, other._buffer_weights, strict=True):
+            self._buffer_values.append(values)
+            self._buffer_weights.append(weights)
+            self._buffered += len(values)
+        if self._buffered >= self.buffer_size:
+            self._flush()
+        return self
+
+    @property
+    def levels(self) -> int:
+        return len(self._levels)
+
+    @property
+    def stored_points(self) -> int:
+        """Centroids and buffered points currently held in memory."""
+        summaries = sum(len(summary[0]) for summary in self._levels if summary is not None)
+        return summaries + self._buffered
+
+    def rank_error_bound(self) -> float:
+        if not self._levels:
+            return 0.0
+        return (self.levels + 1) / self.compression
+
+    def gini_error_bound(self) -> float:
+        """Largest amount by which ``gini()`` can fall short of the exact Gini."""
+        if self._gini_slack == 0:
+            return 0.0
+        if self.total <= 0:
+            return np.inf
+        return self._gini_slack / self.total
+
+    def mean(self) -> float:
+        if self.total_weight == 0:
+            return 0.0
+        return self.total / self.total_weight
+
+    def quantiles(self, quantiles: Sequence[float]) -> np.ndarray:
+        values, weights = self._centroids()
+        if not len(values):
+            return np.zeros(len(quantiles))
+        midpoints = np.cumsum(weights) - 0.5 * weights
+        targets = np.asarray(quantiles, dtype=float) * self.total_weight
+        return np.clip(np.interp(targets, midpoints, values), self.min, self.max)
+
+    def quantile(self, q: float) -> float:
+        return float(self.quantiles([q])[0])
+
+    def gini(self) -> float:
+        return sorted_gini(*self._centroids())
+
+    def top_share(self, fraction: float) -> float:
+        """Share of the weighted total held by the top ``fraction`` of the weight."""
+        values, weights = self._centroids()
+        if not len(values) or self.total == 0:
+            return 0.0
+        threshold = (1.0 - fraction) * weights.sum()
+        below = np.cumsum(weights) - weights
+        top_weights = np.clip(weights - np.maximum(threshold - below, 0.0), 0.0, None)
+        return float(np.dot(top_weights, values)) / self.total
+
+    def _centroids(self) -> tuple[np.ndarray, np.ndarray]:
+        parts = [summary for summary in self._levels if summary is not None]
+        values = np.concatenate([values for values, _ in parts] + self._buffer_values + [[]])
+        weights = np.concatenate([weights for _, weights in parts] + self._buffer_weights + [[]])
+        order = np.argsort(values, kind="stable")
+        return values[order], weights[order]
+
+    def _flush(self) -> None:
+        values = np.concatenate(self._buffer_values)
+        weights = np.concatenate(self._buffer_weights)
+        self._buffer_values = []
+        self._buffer_weights = []
+        self._buffered = 0
+        self._carry(0, *self._compact(values, weights))
+
+    def _carry(self, level: int, values: np.ndarray, weights: np.ndarray) -> None:
+        while level < len(self._levels):
+            summary = self._levels[level]
+            if summary is None:
+                break
+            level_values, level_weights = summary
+            self._levels[level] = None
+            values, weights = self._compact(
+                np.concatenate([level_values, values]),
+                np.concatenate([level_weights, weights]),
+            )
+            level += 1
+        if level == len(self._levels):
+            self._levels.append(None)
+        self._levels[level] = (values, weights)
+
+    def _compact(self, values: np.ndarray, weights: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        values, weights, slack = _compact(values, weights, self.compression)
+        self._gini_slack += slack
+        return values, weights
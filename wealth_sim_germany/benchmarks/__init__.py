@@ -0,0 +1,21 @@
+from wealth_sim_germany.benchmarks.suite import (
+    BENCHMARK_CASES,
+    BenchmarkCase,
+    BenchmarkReport,
+    BenchmarkResult,
+    Regression,
+    measure,
+    run_benchmarks,
+    synthetic_population,
+)
+
+__all__ = [
+    "BENCHMARK_CASES",
+    "BenchmarkCase",
+    "BenchmarkReport",
+    "BenchmarkResult",
+    "Regression",
+    "measure",
+    "run_benchmarks",
+    "synthetic_population",
+]
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from collections.abc import Sequence
+
+from wealth_sim_germany.benchmarks.suite import (
+    BENCHMARK_CASES,
+    DEFAULT_SIZES,
+    DEFAULT_TOLERANCE,
+    BenchmarkReport,
+    BenchmarkResult,
+    run_benchmarks,
+)
+
+
+def _print_result(result: BenchmarkResult) -> None:
+    print(
+        f"{result.case:<26} n={result.size:>10,}  {result.seconds:>10.4f}s  "
+        f"{result.throughput:>14,.0f}/s  peak {result.peak_bytes / 2**20:>9.1f} MiB",
+        flush=True,
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m wealth_sim_germany.benchmarks",
+        description="Time the simulation hot paths at increasing population sizes.",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: int(float(value)),
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="agent counts to benchmark, e.g. 1e3 1e5",
+    )
+    parser.add_argument(
+        "--cases",
+        nargs="+",
+        choices=[case.name for case in BENCHMARK_CASES],
+        help="subset of cases to run (default: all)",
+    )
+    parser.add_argument("--repeats", type=int, default=3, help="timed calls per measurement")
+    parser.add_argument("--output", help="write the results as a JSON baseline to this path")
+    parser.add_argument("--baseline", help="JSON baseline to check for regressions")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="relative slowdown or memory growth reported as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.cases, args.repeats, progress=_print_result)
+    for case, exponent in report.scaling_exponents().items():
+        print(f"scaling {case:<26} time ~ n^{exponent:.2f}")
+    if args.output:
+        report.write(args.output)
+    if args.baseline:
+        regressions = report.compare(BenchmarkReport.load(args.baseline), args.tolerance)
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression.case} n={regression.size:,} {regression.metric}: "
+                f"{regression.baseline:,.0f} -> {regression.current:,.0f} "
+                f"({regression.ratio:.2f}x)",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,451 @@
+from __future__ import annotations
+
+import json
+import random
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from wealth_sim_germany.analysis.aggregations import build_aggregates, gini
+from wealth_sim_germany.config.schemas import (
+    GovernmentSpendingConfig,
+    MacroParams,
+    PopulationConfig,
+    ScenarioConfig,
+    TaxConfig,
+)
+from wealth_sim_germany.data.cells import EDUCATION_LEVELS, REGIONS, SEXES
+from wealth_sim_germany.data.distributions import DistributionFactory
+from wealth_sim_germany.models.government import Government
+from wealth_sim_germany.models.person import Person
+from wealth_sim_germany.models.population import Population
+from wealth_sim_germany.models.tax import TaxCalculator
+from wealth_sim_germany.models.transfers import BasicIncomeSupport
+from wealth_sim_germany.simulation.engine import SimulationController
+from wealth_sim_germany.utils.types import GovFunction
+
+BASELINE_VERSION = 1
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+DEFAULT_TOLERANCE = 0.25
+AGES = range(30, 70)
+
+Workload = Callable[[], object]
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """A workload built for ``size`` agents by ``setup``; only the returned callable is timed.
+
+    Cases that loop over agents in Python set ``max_size`` so the default sweep stays
+    practical; larger sizes are skipped for them.
+    """
+
+    name: str
+    setup: Callable[[int], Workload]
+    max_size: int | None = None
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    case: str
+    size: int
+    seconds: float
+    throughput: float
+    peak_bytes: int
+
+
+@dataclass(frozen=True)
+class Regression:
+    case: str
+    size: int
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+
+@dataclass
+class BenchmarkReport:
+    results: list[BenchmarkResult] = field(default_factory=list)
+
+    def scaling_exponents(self) -> dict[str, float]:
+        """Slope of log(seconds) over log(size) per case; 1.0 means linear scaling."""
+        exponents: dict[str, float] = {}
+        for case in dict.fromkeys(result.case for result in self.results):
+            points = [result for result in self.results if result.case == case]
+            if len(points) >= 2:
+                sizes = np.log([point.size for point in points])
+                seconds = np.log([max(point.seconds, 1e-9) for point in points])
+                exponents[case] = float(np.polyfit(sizes, seconds, 1)[0])
+        return exponents
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": BASELINE_VERSION,
+            "results": [asdict(result) for result in self.results],
+            "scaling": self.scaling_exponents(),
+        }
+
+    def write(self, path: str | Path) -> Path:
+        target = Path(path)
+        target.write_text(json.dumps(self.to_dict(), indent=2))
+        return target
+
+    @classmethod
+    def load(cls, path: str | Path) -> BenchmarkReport:
+        data = json.loads(Path(path).read_text())
+        if data.get("version") != BASELINE_VERSION:
+            raise ValueError(f"Unsupported benchmark baseline version: {data.get('version')}")
+        return cls(results=[BenchmarkResult(**result) for result in data["results"]])
+
+    def compare(
+        self,
+        baseline: BenchmarkReport,
+        tolerance: float = DEFAULT_TOLERANCE,
+    ) -> list[Regression]:
+        """Cases whose throughput fell, or whose peak memory grew, by more than ``tolerance``."""
+        reference = {(result.case, result.size): result for result in baseline.results}
+        regressions: list[Regression] = []
+        for result in self.results:
+            before = reference.get((result.case, result.size))
+            if before is None:
+                continue
+            if result.throughput < before.throughput * (1.0 - tolerance):
+                regressions.append(
+                    Regression(
+                        result.case, result.size, "throughput", before.throughput, result.throughput
+                    )
+                )
+            if result.peak_bytes > before.peak_bytes * (1.0 + tolerance):
+                regressions.append(
+                    Regression(
+                        result.case,
+                        result.size,
+                        "peak_bytes",
+                        before.peak_bytes,
+                        result.peak_bytes,
+                    )
+                )
+        return regressions
+
+
+@dataclass(frozen=True)
+class LognormalSampler:
+    mean: float
+    sigma: float
+
+    def __call__(self, rng: random.Random, conditions: dict | None = None) -> float:
+        return rng.lognormvariate(self.mean, self.sigma)
+
+    def batch(
+        self,
+        generator: np.random.Generator,
+        size: int,
+        conditions: dict | None = None,
+    ) -> np.ndarray:
+        return generator.lognormal(self.mean, self.sigma, size)
+
+
+@dataclass(frozen=True)
+class UniformSampler:
+    low: float
+    high: float
+
+    def __call__(self, rng: random.Random, conditions: dict | None = None) -> float:
+        return rng.uniform(self.low, self.high)
+
+    def batch(
+        self,
+        generator: np.random.Generator,
+        size: int,
+        conditions: dict | None = None,
+    ) -> np.ndarray:
+        return generator.uniform(self.low, self.high, size)
+
+
+@dataclass(frozen=True)
+class FlatTransferRule:
+    amount: float
+
+    def compute_transfer(self, person: Person, government: Government) -> float:
+        return self.amount
+
+
+BENCHMARK_SAMPLERS: dict[str, LognormalSampler | UniformSampler] = {
+    "labor_income": LognormalSampler(10.3, 0.6),
+    "capital_income": LognormalSampler(6.0, 1.5),
+    "savings_rate": UniformSampler(0.0, 0.2),
+    "labor_return": UniformSampler(0.0, 0.02),
+    "capital_return": UniformSampler(-0.05, 0.08),
+}
+
+
+def synthetic_population(size: int, seed: int = 0) -> Population:
+    """Random demographics with lognormal incomes, taxes and wealth filled in."""
+    generator = np.random.default_rng(seed)
+    population = Population.from_demographics(
+        age=generator.integers(AGES.start, AGES.stop, size),
+        sex=generator.integers(0, len(SEXES), size),
+        education=generator.integers(0, len(EDUCATION_LEVELS), size),
+        region=generator.integers(0, len(REGIONS), size),
+    )
+    population.labor_income = generator.lognormal(10.3, 0.6, size)
+    population.capital_income = generator.lognormal(6.0, 1.5, size)
+    population.compute_total_gross_income()
+    population.apply_tax_result(
+        income_tax=0.25 * population.labor_income,
+        social_contrib=0.2 * population.labor_income,
+        capital_tax=0.25 * population.capital_income,
+    )
+    population.liquid_assets = generator.lognormal(9.0, 1.2, size)
+    population.net_wealth = population.liquid_assets
+    return population
+
+
+def _empirical_records(values_per_cell: int = 5, seed: int = 0) -> list[dict]:
+    generator = np.random.default_rng(seed)
+    return [
+        {
+            "value": float(value),
+            "conditions": {
+                "age": age,
+                "sex": sex.value,
+                "education": education.value,
+                "region": region.value,
+            },
+        }
+        for age in AGES
+        for sex in SEXES
+        for education in EDUCATION_LEVELS
+        for region in REGIONS
+        for value in generator.lognormal(10.3, 0.6, values_per_cell)
+    ]
+
+
+def benchmark_factory(empirical: bool = False) -> DistributionFactory:
+    factory = DistributionFactory()
+    for name, sampler in BENCHMARK_SAMPLERS.items():
+        factory.register(name, sampler, sampler.batch)
+    if empirical:
+        records = _empirical_records()
+        factory.register_empirical("labor_income_empirical", records)
+        factory.register_empirical_arrays(
+            "labor_income_weighted",
+            values=[record["value"] for record in records],
+            weights=np.random.default_rng(1).uniform(0.5, 2.0, len(records)),
+            conditions={
+                key: [record["conditions"][key] for record in records]
+                for key in ("age", "sex", "education", "region")
+            },
+        )
+    return factory
+
+
+def _sample_parametric(size: int) -> Workload:
+    factory = benchmark_factory()
+    rng = random.Random(0)
+    return lambda: [factory.sample("labor_income", rng) for _ in range(size)]
+
+
+def _sample_parametric_batch(size: int) -> Workload:
+    factory = benchmark_factory()
+    generator = np.random.default_rng(0)
+    cell_ids = np.zeros(size, dtype=np.intp)
+    return lambda: factory.sample_batch("labor_income", generator, cell_ids)
+
+
+def _sample_empirical(size: int) -> Workload:
+    factory = benchmark_factory(empirical=True)
+    cells = synthetic_population(size).cells()
+    conditions = [cells.conditions[cell] for cell in cells.cell_ids.tolist()]
+    rng = random.Random(0)
+    return lambda: [factory.sample("labor_income_empirical", rng, row) for row in conditions]
+
+
+def _sample_empirical_batch(size: int) -> Workload:
+    factory = benchmark_factory(empirical=True)
+    cells = synthetic_population(size).cells()
+    generator = np.random.default_rng(0)
+    return lambda: factory.sample_batch(
+        "labor_income_empirical", generator, cells.cell_ids, cells.conditions
+    )
+
+
+def _sample_empirical_weighted_batch(size: int) -> Workload:
+    factory = benchmark_factory(empirical=True)
+    cells = synthetic_population(size).cells()
+    generator = np.random.default_rng(0)
+    return lambda: factory.sample_batch(
+        "labor_income_weighted", generator, cells.cell_ids, cells.conditions
+    )
+
+
+def _benchmark_tax_calculator() -> TaxCalculator:
+    return TaxCalculator(
+        TaxConfig(income_tax_rate=0.25, capital_gains_rate=0.25, social_contrib_rate=0.2)
+    )
+
+
+def _tax_scalar(size: int) -> Workload:
+    calculator = _benchmark_tax_calculator()
+    persons = synthetic_population(size).to_persons()
+    return lambda: [calculator.compute_all_taxes(person) for person in persons]
+
+
+def _tax_batch(size: int) -> Workload:
+    calculator = _benchmark_tax_calculator()
+    population = synthetic_population(size)
+    return lambda: calculator.compute_all_taxes_batch(
+        population.labor_income, population.capital_income, population.transfers
+    )
+
+
+def _benchmark_government() -> Government:
+    return Government(spending_shares={GovFunction.EDUCATION: 1.0}, deficit_limit=0.03, gdp=0.0)
+
+
+def _collect_taxes(size: int) -> Workload:
+    government = _benchmark_government()
+    population = synthetic_population(size)
+    return lambda: government.collect_taxes_from_population(population)
+
+
+def _pay_transfers(size: int) -> Workload:
+    government = _benchmark_government()
+    population = synthetic_population(size)
+    rule = FlatTransferRule(100.0)
+    return lambda: government.pay_transfers(population.fork(), rule)
+
+
+def _pay_transfers_batch(size: int) -> Workload:
+    government = _benchmark_government()
+    population = synthetic_population(size)
+    rule = BasicIncomeSupport()
+    return lambda: government.pay_transfers(population.fork(), rule)
+
+
+def _gini_legacy(size: int) -> Workload:
+    population = synthetic_population(size)
+    values = population.net_income.tolist()
+    weights = population.weight.tolist()
+    return lambda: gini(values, weights)
+
+
+def _build_aggregates(size: int) -> Workload:
+    government = _benchmark_government()
+    population = synthetic_population(size)
+    return lambda: build_aggregates(population, government, 2024)
+
+
+def _build_aggregates_sketch(size: int) -> Workload:
+    government = _benchmark_government()
+    population = synthetic_population(size)
+    return lambda: build_aggregates(population, government, 2024, use_sketch=True)
+
+
+def _benchmark_scenario(size: int) -> ScenarioConfig:
+    return ScenarioConfig(
+        name="benchmark",
+        start_year=2024,
+        years=1,
+        tax=_benchmark_tax_calculator().config,
+        government=GovernmentSpendingConfig(
+            spending_shares={GovFunction.EDUCATION: 0.5, GovFunction.HEALTH: 0.5},
+            deficit_limit=0.03,
+        ),
+        population=PopulationConfig(total_population=size, synthetic_n=size),
+        macro=MacroParams(gdp_growth=0.01, inflation=0.02),
+    )
+
+
+def _run(size: int, columnar: bool) -> Workload:
+    scenario = _benchmark_scenario(size)
+    factory = benchmark_factory()
+
+    def run() -> object:
+        controller = SimulationController(
+            scenario=scenario,
+            distribution_factory=factory,
+            transfer_rule=FlatTransferRule(100.0),
+            rng=random.Random(0),
+            columnar=columnar,
+        )
+        return controller.run()
+
+    return run
+
+
+BENCHMARK_CASES: tuple[BenchmarkCase, ...] = (
+    BenchmarkCase("sample_parametric", _sample_parametric, max_size=1_000_000),
+    BenchmarkCase("sample_parametric_batch", _sample_parametric_batch),
+    BenchmarkCase("sample_empirical", _sample_empirical, max_size=1_000_000),
+    BenchmarkCase("sample_empirical_batch", _sample_empirical_batch),
+    BenchmarkCase("sample_empirical_weighted_batch", _sample_empirical_weighted_batch),
+    BenchmarkCase("tax_scalar", _tax_scalar, max_size=1_000_000),
+    BenchmarkCase("tax_batch", _tax_batch),
+    BenchmarkCase("collect_taxes", _collect_taxes),
+    BenchmarkCase("pay_transfers", _pay_transfers, max_size=1_000_000),
+    BenchmarkCase("pay_transfers_batch", _pay_transfers_batch),
+    BenchmarkCase("gini", _gini_legacy, max_size=1_000_000),
+    BenchmarkCase("build_aggregates", _build_aggregates),
+    BenchmarkCase("build_aggregates_sketch", _build_aggregates_sketch),
+    BenchmarkCase("run_persons", lambda size: _run(size, columnar=False), max_size=100_000),
+    BenchmarkCase("run_columnar", lambda size: _run(size, columnar=True), max_size=1_000_000),
+)
+
+
+def measure(case: BenchmarkCase, size: int, repeats: int = 3) -> BenchmarkResult:
+    """Best-of-``repeats`` wall time, then one traced call for the peak memory."""
+    workload = case.setup(size)
+    seconds = float("inf")
+    for _ in range(max(repeats, 1)):
+        start = time.perf_counter()
+        workload()
+        seconds = min(seconds, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        workload()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return BenchmarkResult(
+        case=case.name,
+        size=size,
+        seconds=seconds,
+        throughput=size / seconds if seconds > 0 else float("inf"),
+        peak_bytes=peak_bytes,
+    )
+
+
+def run_benchmarks(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    cases: Iterable[str] | None = None,
+    repeats: int = 3,
+    progress: Callable[[BenchmarkResult], None] | None = None,
+) -> BenchmarkReport:
+    """Measure every selected case at every size it supports."""
+    selected = BENCHMARK_CASES
+    if cases is not None:
+        names = set(cases)
+        unknown = names - {case.name for case in BENCHMARK_CASES}
+        if unknown:
+            raise KeyError(f"Unknown benchmark cases: {sorted(unknown)}")
+        selected = tuple(case for case in BENCHMARK_CASES if case.name in names)
+    report = BenchmarkReport()
+    for case in selected:
+        for size in sizes:
+            if case.max_size is not None and size > case.max_size:
+                continue
+            result = measure(case, size, repeats)
+            report.results.append(result)
+            if progress is not None:
+                progress(result)
+    return report
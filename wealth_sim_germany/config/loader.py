@@ -24,8 +24,11 @@ def _validate_model(model_cls: type[ScenarioConfig], payload: Any) -> ScenarioCo
     return model_cls.from_dict(payload)
 
 
+def load_mapping(path: str | Path) -> Any:
+    """Parse a YAML file, or JSON when PyYAML is not installed."""
+    raw_text = Path(path).read_text()
+    return yaml_module.safe_load(raw_text) if yaml_module is not None else json.loads(raw_text)
+
+
 def load_scenario_config(path: str | Path) -> ScenarioConfig:
-    config_path = Path(path)
-    raw_text = config_path.read_text()
-    raw = yaml_module.safe_load(raw_text) if yaml_module is not None else json.loads(raw_text)
-    return _validate_model(ScenarioConfig, raw)
+    return _validate_model(ScenarioConfig, load_mapping(path))
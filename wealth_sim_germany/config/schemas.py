@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from wealth_sim_germany.utils.types import GovFunction
 
@@ -19,15 +19,107 @@ def _ensure_keys(data: dict, required: set[str], optional: set[str] | None = Non
         raise ConfigError(f"Unexpected keys: {sorted(extra)}")
 
 
+@dataclass(frozen=True)
+class IncomeTaxTariffConfig:
+    """Progressive §32a EStG income tax tariff; see PROJECT_SPECIFICATION.md §2.6."""
+
+    basic_allowance: float
+    zone2_limit: float
+    zone2_coefficients: tuple[float, float]
+    zone3_limit: float
+    zone3_coefficients: tuple[float, float, float]
+    zone4_limit: float
+    zone4_rate: float
+    zone4_offset: float
+    top_rate: float
+    top_offset: float
+    solidarity_rate: float = 0.0
+    solidarity_exemption: float = 0.0
+    solidarity_phase_in_rate: float = 0.0
+    splitting: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict) -> IncomeTaxTariffConfig:
+        _ensure_keys(
+            data,
+            {
+                "basic_allowance",
+                "zone2_limit",
+                "zone2_coefficients",
+                "zone3_limit",
+                "zone3_coefficients",
+                "zone4_limit",
+                "zone4_rate",
+                "zone4_offset",
+                "top_rate",
+                "top_offset",
+            },
+            optional={
+                "solidarity_rate",
+                "solidarity_exemption",
+                "solidarity_phase_in_rate",
+                "splitting",
+            },
+        )
+        zone2_coefficients = tuple(float(value) for value in data["zone2_coefficients"])
+        zone3_coefficients = tuple(float(value) for value in data["zone3_coefficients"])
+        if len(zone2_coefficients) != 2:
+            raise ConfigError("zone2_coefficients must hold two values")
+        if len(zone3_coefficients) != 3:
+            raise ConfigError("zone3_coefficients must hold three values")
+        tariff = cls(
+            basic_allowance=float(data["basic_allowance"]),
+            zone2_limit=float(data["zone2_limit"]),
+            zone2_coefficients=(zone2_coefficients[0], zone2_coefficients[1]),
+            zone3_limit=float(data["zone3_limit"]),
+            zone3_coefficients=(
+                zone3_coefficients[0],
+                zone3_coefficients[1],
+                zone3_coefficients[2],
+            ),
+            zone4_limit=float(data["zone4_limit"]),
+            zone4_rate=float(data["zone4_rate"]),
+            zone4_offset=float(data["zone4_offset"]),
+            top_rate=float(data["top_rate"]),
+            top_offset=float(data["top_offset"]),
+            solidarity_rate=float(data.get("solidarity_rate", 0.0)),
+            solidarity_exemption=float(data.get("solidarity_exemption", 0.0)),
+            solidarity_phase_in_rate=float(data.get("solidarity_phase_in_rate", 0.0)),
+            splitting=bool(data.get("splitting", False)),
+        )
+        if not (
+            0.0
+            <= tariff.basic_allowance
+            <= tariff.zone2_limit
+            <= tariff.zone3_limit
+            <= tariff.zone4_limit
+        ):
+            raise ConfigError("tariff zone limits must be non-negative and increasing")
+        for value, name in (
+            (tariff.zone4_rate, "zone4_rate"),
+            (tariff.top_rate, "top_rate"),
+            (tariff.solidarity_rate, "solidarity_rate"),
+            (tariff.solidarity_phase_in_rate, "solidarity_phase_in_rate"),
+        ):
+            if not 0.0 <= value <= 1.0:
+                raise ConfigError(f"{name} must be between 0 and 1")
+        return tariff
+
+
 @dataclass(frozen=True)
 class TaxConfig:
     income_tax_rate: float
     capital_gains_rate: float
     social_contrib_rate: float
+    income_tax_tariffs: dict[int, IncomeTaxTariffConfig] = field(default_factory=dict)
 
     @classmethod
     def from_dict(cls, data: dict) -> TaxConfig:
-        _ensure_keys(data, {"income_tax_rate", "capital_gains_rate", "social_contrib_rate"})
+        _ensure_keys(
+            data,
+            {"income_tax_rate", "capital_gains_rate", "social_contrib_rate"},
+            optional={"income_tax_tariffs"},
+        )
         income_tax_rate = float(data["income_tax_rate"])
         capital_gains_rate = float(data["capital_gains_rate"])
         social_contrib_rate = float(data["social_contrib_rate"])
@@ -38,10 +130,18 @@ class TaxConfig:
         ):
             if not 0.0 <= value <= 1.0:
                 raise ConfigError(f"{name} must be between 0 and 1")
+        tariffs_raw = data.get("income_tax_tariffs") or {}
+        if not isinstance(tariffs_raw, dict):
+            raise ConfigError("income_tax_tariffs must be a mapping of year to tariff")
+        income_tax_tariffs = {
+            int(year): IncomeTaxTariffConfig.from_dict(tariff)
+            for year, tariff in tariffs_raw.items()
+        }
         return cls(
             income_tax_rate=income_tax_rate,
             capital_gains_rate=capital_gains_rate,
             social_contrib_rate=social_contrib_rate,
+            income_tax_tariffs=income_tax_tariffs,
         )
 
 
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import copy
+import itertools
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from wealth_sim_germany.config.loader import load_mapping
+from wealth_sim_germany.config.schemas import ConfigError, ScenarioConfig, _ensure_keys
+
+DESIGNS = ("grid", "latin_hypercube")
+
+
+@dataclass(frozen=True)
+class SweepParameter:
+    """Values of one scenario field, addressed by a dotted path such as ``tax.income_tax_rate``.
+
+    A parameter is either a list of ``values`` or a range ``low``..``high``; a grid
+    takes ``num`` evenly spaced points from a range, a Latin hypercube samples it.
+    """
+
+    path: str
+    values: tuple[Any, ...] | None = None
+    low: float | None = None
+    high: float | None = None
+    num: int | None = None
+
+    @classmethod
+    def from_dict(cls, path: str, data: Any) -> SweepParameter:
+        if isinstance(data, list):
+            if not data:
+                raise ConfigError(f"Sweep parameter '{path}' has no values")
+            return cls(path=path, values=tuple(data))
+        if not isinstance(data, dict):
+            raise ConfigError(f"Sweep parameter '{path}' must be a list or a range")
+        _ensure_keys(data, {"low", "high"}, optional={"num"})
+        low, high = float(data["low"]), float(data["high"])
+        if high < low:
+            raise ConfigError(f"Sweep parameter '{path}' has high < low")
+        num = data.get("num")
+        if num is not None and int(num) <= 0:
+            raise ConfigError(f"Sweep parameter '{path}' needs a positive num")
+        return cls(path=path, low=low, high=high, num=None if num is None else int(num))
+
+    def grid_values(self) -> tuple[Any, ...]:
+        if self.values is not None:
+            return self.values
+        if self.num is None:
+            raise ConfigError(f"Grid parameter '{self.path}' needs num or a list of values")
+        assert self.low is not None and self.high is not None
+        return tuple(np.linspace(self.low, self.high, self.num).tolist())
+
+    def at(self, quantile: float) -> Any:
+        """Value at ``quantile`` in [0, 1) of the parameter's range or list."""
+        if self.values is not None:
+            return self.values[min(int(quantile * len(self.values)), len(self.values) - 1)]
+        assert self.low is not None and self.high is not None
+        return self.low + quantile * (self.high - self.low)
+
+
+@dataclass(frozen=True)
+class SweepPoint:
+    values: dict[str, Any]
+    scenario: ScenarioConfig
+
+
+def _set_path(data: dict, path: str, value: Any) -> None:
+    keys = path.split(".")
+    target = data
+    for key in keys[:-1]:
+        if not isinstance(target.get(key), dict):
+            raise ConfigError(f"Sweep path '{path}' does not name a scenario field")
+        target = target[key]
+    target[keys[-1]] = value
+
+
+@dataclass(frozen=True)
+class SweepSpec:
+    """A base scenario plus the parameters to vary and how to combine them."""
+
+    base: dict
+    parameters: tuple[SweepParameter, ...]
+    design: str = "grid"
+    samples: int | None = None
+    seed: int = 0
+
+    @classmethod
+    def from_dict(cls, data: dict, base_dir: str | Path | None = None) -> SweepSpec:
+        _ensure_keys(data, {"base", "parameters"}, optional={"design", "samples", "seed"})
+        base = data["base"]
+        if isinstance(base, str):
+            base_path = Path(base)
+            if base_dir is not None and not base_path.is_absolute():
+                base_path = Path(base_dir) / base_path
+            base = load_mapping(base_path)
+        if not isinstance(base, dict):
+            raise ConfigError("base must be a scenario mapping or a path to one")
+        raw_parameters = data["parameters"]
+        if not isinstance(raw_parameters, dict) or not raw_parameters:
+            raise ConfigError("parameters must be a non-empty mapping")
+        design = str(data.get("design", "grid"))
+        if design not in DESIGNS:
+            raise ConfigError(f"Unknown sweep design: {design}")
+        samples = data.get("samples")
+        if design == "latin_hypercube" and (samples is None or int(samples) <= 0):
+            raise ConfigError("latin_hypercube designs need a positive number of samples")
+        return cls(
+            base=base,
+            parameters=tuple(
+                SweepParameter.from_dict(path, value) for path, value in raw_parameters.items()
+            ),
+            design=design,
+            samples=None if samples is None else int(samples),
+            seed=int(data.get("seed", 0)),
+        )
+
+    def design_values(self) -> list[dict[str, Any]]:
+        paths = [parameter.path for parameter in self.parameters]
+        if self.design == "grid":
+            grids = [parameter.grid_values() for parameter in self.parameters]
+            return [
+                dict(zip(paths, combination, strict=True))
+                for combination in itertools.product(*grids)
+            ]
+        assert self.samples is not None
+        generator = np.random.default_rng(self.seed)
+        strata = np.stack([generator.permutation(self.samples) for _ in self.parameters], axis=1)
+        quantiles = (strata + generator.random(strata.shape)) / self.samples
+        return [
+            {
+                parameter.path: parameter.at(float(quantile))
+                for parameter, quantile in zip(self.parameters, row, strict=True)
+            }
+            for row in quantiles
+        ]
+
+    def expand(self) -> list[SweepPoint]:
+        """Every design point applied to ``base`` and validated as a ``ScenarioConfig``."""
+        points: list[SweepPoint] = []
+        for number, values in enumerate(self.design_values()):
+            data = copy.deepcopy(self.base)
+            for path, value in values.items():
+                _set_path(data, path, value)
+            try:
+                scenario = ScenarioConfig.from_dict(data)
+            except (ConfigError, TypeError, ValueError) as exc:
+                raise ConfigError(f"Sweep point {number} {values} is invalid: {exc}") from exc
+            points.append(SweepPoint(values=values, scenario=scenario))
+        return points
+
+
+def load_sweep_spec(path: str | Path) -> SweepSpec:
+    """Load a sweep file; a ``base`` path is resolved relative to the sweep file."""
+    sweep_path = Path(path)
+    return SweepSpec.from_dict(load_mapping(sweep_path), base_dir=sweep_path.parent)
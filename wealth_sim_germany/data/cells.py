@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import numpy as np
+
+from wealth_sim_germany.models.person import Person
+from wealth_sim_germany.utils.types import EducationLevel, Region, Sex
+
+SEXES = tuple(Sex)
+EDUCATION_LEVELS = tuple(EducationLevel)
+REGIONS = tuple(Region)
+
+
+def person_conditions(person: Person) -> dict:
+    return {
+        "age": person.age,
+        "sex": person.sex.value,
+        "education": person.education.value,
+        "region": person.region.value,
+    }
+
+
+@dataclass(frozen=True)
+class DemographicCells:
+    """Distinct demographic cells of a population and the cell id of every person."""
+
+    conditions: tuple[dict, ...]
+    cell_ids: np.ndarray
+
+    @classmethod
+    def from_persons(cls, persons: Iterable[Person]) -> DemographicCells:
+        lookup: dict[tuple, int] = {}
+        conditions: list[dict] = []
+        cell_ids: list[int] = []
+        for person in persons:
+            person_cell = person_conditions(person)
+            key = tuple(person_cell.values())
+            if key not in lookup:
+                lookup[key] = len(conditions)
+                conditions.append(person_cell)
+            cell_ids.append(lookup[key])
+        return cls(conditions=tuple(conditions), cell_ids=np.asarray(cell_ids, dtype=np.intp))
+
+    @classmethod
+    def from_codes(
+        cls,
+        age: np.ndarray,
+        sex: np.ndarray,
+        education: np.ndarray,
+        region: np.ndarray,
+    ) -> DemographicCells:
+        """Build cells from demographic columns with enums stored as integer codes."""
+        keys, cell_ids = np.unique(
+            encode_cell_keys(age, sex, education, region),
+            return_inverse=True,
+        )
+        conditions = []
+        for key in keys.tolist():
+            key, region_code = divmod(key, len(REGIONS))
+            key, education_code = divmod(key, len(EDUCATION_LEVELS))
+            cell_age, sex_code = divmod(key, len(SEXES))
+            conditions.append(
+                {
+                    "age": cell_age,
+                    "sex": SEXES[sex_code].value,
+                    "education": EDUCATION_LEVELS[education_code].value,
+                    "region": REGIONS[region_code].value,
+                }
+            )
+        return cls(conditions=tuple(conditions), cell_ids=cell_ids.astype(np.intp).ravel())
+
+    def __len__(self) -> int:
+        return len(self.conditions)
+
+
+def encode_cell_keys(
+    age: np.ndarray,
+    sex: np.ndarray,
+    education: np.ndarray,
+    region: np.ndarray,
+) -> np.ndarray:
+    key = age.astype(np.int64)
+    for codes, levels in (
+        (sex, len(SEXES)),
+        (education, len(EDUCATION_LEVELS)),
+        (region, len(REGIONS)),
+    ):
+        key = key * levels + codes
+    return key
@@ -1,47 +1,399 @@
 from __future__ import annotations
 
 import random
-from collections.abc import Callable
-from dataclasses import dataclass, field
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import InitVar, dataclass, field
+from itertools import combinations
+
+import numpy as np
+
+from wealth_sim_germany.utils.profiling import NULL_PROFILER, NullProfiler, Profiler
+from wealth_sim_germany.utils.rng import CounterGenerator, CounterRandom, NamedStreams
 
 DistributionCallable = Callable[[random.Random, dict | None], float]
+BatchDistributionCallable = Callable[[np.random.Generator, int, dict | None], np.ndarray]
+
+ConditionKey = tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class AliasTable:
+    """Walker/Vose alias table for O(1) draws from a discrete weighted distribution.
+
+    Outcome ``i`` is kept with ``probability[i]`` when column ``i`` is drawn and replaced
+    by ``alias[i]`` otherwise. One uniform picks both the column and the coin.
+    """
+
+    probability: np.ndarray
+    alias: np.ndarray
+
+    @classmethod
+    def from_weights(cls, weights: np.ndarray) -> AliasTable:
+        """Vose's O(n) construction; ``weights`` must be non-negative with a positive sum."""
+        weights = np.asarray(weights, dtype=float)
+        total = float(weights.sum())
+        if not len(weights) or not np.isfinite(total) or total <= 0:
+            raise ValueError("Alias tables need finite weights with a positive sum")
+        scaled = (weights * (len(weights) / total)).tolist()
+        probability = [1.0] * len(scaled)
+        alias = list(range(len(scaled)))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large[-1]
+            probability[less] = scaled[less]
+            alias[less] = more
+            scaled[more] += scaled[less] - 1.0
+            if scaled[more] < 1.0:
+                small.append(large.pop())
+        # Whatever is left has probability one up to rounding error.
+        return cls(probability=np.asarray(probability), alias=np.asarray(alias, dtype=np.intp))
+
+    def __len__(self) -> int:
+        return len(self.probability)
+
+    def draw(self, rng: random.Random) -> int:
+        position = rng.random() * len(self)
+        column = min(int(position), len(self) - 1)
+        return column if position - column < self.probability[column] else int(self.alias[column])
+
+    def draw_batch(self, generator: np.random.Generator, size: int) -> np.ndarray:
+        position = generator.random(size) * len(self)
+        column = np.minimum(position.astype(np.intp), len(self) - 1)
+        return np.where(position - column < self.probability[column], column, self.alias[column])
+
+
+@dataclass(frozen=True)
+class _Cell:
+    """Values of the records in one condition cell and, if weighted, their alias table."""
+
+    values: np.ndarray
+    table: AliasTable | None = None
+
+
+def _encode(column: Sequence | np.ndarray) -> tuple[np.ndarray, tuple]:
+    """Integer codes of ``column`` and the level each code stands for."""
+    # Only typed arrays take the sorted path; converting Python sequences would turn
+    # str-Enum members into truncated strings that no longer equal their values.
+    if isinstance(column, np.ndarray) and column.dtype.kind in "biufU":
+        levels, codes = np.unique(column, return_inverse=True)
+        return codes.astype(np.int32), tuple(levels.tolist())
+    lookup: dict = {}
+    codes = np.fromiter(
+        (lookup.setdefault(value, len(lookup)) for value in column),
+        dtype=np.int32,
+        count=len(column),
+    )
+    return codes, tuple(lookup)
+
+
+def _make_cell(values: np.ndarray, weights: np.ndarray | None) -> _Cell | None:
+    if weights is None:
+        return _Cell(values)
+    if not weights.sum() > 0:
+        return None
+    return _Cell(values, AliasTable.from_weights(weights))
+
+
+def _build_condition_index(
+    values: np.ndarray,
+    weights: np.ndarray | None,
+    codes: dict[str, np.ndarray],
+    levels: dict[str, tuple],
+) -> dict[ConditionKey, dict[tuple, _Cell]]:
+    """Map every subset of condition keys to the records of each key combination.
+
+    Cells keep the record order so that unweighted conditional draws match a full scan.
+    Cells whose weights sum to zero are left out.
+    """
+    index: dict[ConditionKey, dict[tuple, _Cell]] = {}
+    sorted_keys = sorted(codes)
+    for size in range(1, len(sorted_keys) + 1):
+        for subset in combinations(sorted_keys, size):
+            shape = tuple(len(levels[key]) for key in subset)
+            flat = np.ravel_multi_index(tuple(codes[key] for key in subset), shape)
+            order = np.argsort(flat, kind="stable")
+            keys, starts = np.unique(flat[order], return_index=True)
+            cells: dict[tuple, _Cell] = {}
+            for key, rows in zip(keys.tolist(), np.split(order, starts[1:]), strict=True):
+                cell = _make_cell(values[rows], None if weights is None else weights[rows])
+                if cell is None:
+                    continue
+                position = np.unravel_index(key, shape)
+                level = tuple(levels[k][int(c)] for k, c in zip(subset, position, strict=True))
+                cells[level] = cell
+            index[subset] = cells
+    return index
+
+
+def _record_columns(
+    records: Sequence[dict],
+) -> tuple[np.ndarray, np.ndarray | None, dict[str, Sequence | np.ndarray]]:
+    keys = sorted({key for record in records for key in record.get("conditions", {})})
+    weighted = any("weight" in record for record in records)
+    weights = [record.get("weight", 1.0) for record in records] if weighted else None
+    return (
+        np.asarray([record["value"] for record in records], dtype=float),
+        None if weights is None else np.asarray(weights, dtype=float),
+        {key: [record.get("conditions", {}).get(key) for record in records] for key in keys},
+    )
+
+
+def _encode_conditions(
+    conditions: Mapping[str, Sequence | np.ndarray],
+) -> tuple[dict[str, np.ndarray], dict[str, tuple]]:
+    codes: dict[str, np.ndarray] = {}
+    levels: dict[str, tuple] = {}
+    for key, column in conditions.items():
+        codes[key], levels[key] = _encode(column)
+    return codes, levels
 
 
 @dataclass
 class EmpiricalDistribution:
-    records: list[dict]
+    """Observed values, optional design weights and the conditions of each record.
 
-    def sample(self, rng: random.Random, conditions: dict | None = None) -> float:
-        if not self.records:
-            raise ValueError("Empirical distribution has no records")
+    Records are held as columns: ``values``, ``weights`` (``None`` for equal weights) and,
+    per condition key, integer ``codes`` into that key's ``levels``. A record without a
+    key has the level ``None``. Weighted draws use one alias table per condition cell.
+    ``EmpiricalDistribution(records=...)`` is kept as a shortcut for ``from_records``.
+    """
+
+    values: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    weights: np.ndarray | None = None
+    codes: dict[str, np.ndarray] = field(default_factory=dict)
+    levels: dict[str, tuple] = field(default_factory=dict)
+    records: InitVar[Sequence[dict] | None] = None
+    _all: _Cell | None = field(init=False, repr=False, compare=False)
+    _index: dict[ConditionKey, dict[tuple, _Cell]] = field(
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    def __post_init__(self, records: Sequence[dict] | None) -> None:
+        if records is not None:
+            if len(self.values) or self.weights is not None or self.codes:
+                raise ValueError("Pass either records or value columns, not both")
+            self.values, self.weights, conditions = _record_columns(records)
+            self.codes, self.levels = _encode_conditions(conditions)
+        self.values = np.asarray(self.values, dtype=float)
+        if self.weights is not None:
+            self.weights = np.asarray(self.weights, dtype=float)
+            if self.weights.shape != self.values.shape:
+                raise ValueError("weights must have one entry per value")
+            if np.any(self.weights < 0) or not np.all(np.isfinite(self.weights)):
+                raise ValueError("weights must be finite and non-negative")
+        if any(len(codes) != len(self.values) for codes in self.codes.values()):
+            raise ValueError("condition columns must have one entry per value")
+        self._all = _make_cell(self.values, self.weights) if len(self.values) else None
+        self._index = _build_condition_index(self.values, self.weights, self.codes, self.levels)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        values: Sequence[float] | np.ndarray,
+        weights: Sequence[float] | np.ndarray | None = None,
+        conditions: dict[str, Sequence | np.ndarray] | None = None,
+    ) -> EmpiricalDistribution:
+        """Build from a value column, an optional weight column and condition columns."""
+        codes, levels = _encode_conditions(conditions or {})
+        return cls(
+            values=np.asarray(values, dtype=float),
+            weights=None if weights is None else np.asarray(weights, dtype=float),
+            codes=codes,
+            levels=levels,
+        )
+
+    @classmethod
+    def from_records(cls, records: Sequence[dict]) -> EmpiricalDistribution:
+        """Build from ``{"value", "weight", "conditions"}`` dicts; ``weight`` is optional."""
+        return cls.from_arrays(*_record_columns(records))
+
+    def _cell(self, conditions: dict | None) -> _Cell | None:
         if not conditions:
-            record = rng.choice(self.records)
-            return float(record["value"])
-        candidates = []
-        for record in self.records:
-            record_conditions = record.get("conditions", {})
-            if all(record_conditions.get(key) == value for key, value in conditions.items()):
-                candidates.append(record)
-        if not candidates:
+            return self._all
+        known = {key: value for key, value in conditions.items() if (key,) in self._index}
+        # Records never carry unknown keys, so they only match a ``None`` condition.
+        if any(value is not None for key, value in conditions.items() if key not in known):
+            return None
+        if not known:
+            return self._all
+        subset = tuple(sorted(known))
+        return self._index[subset].get(tuple(known[key] for key in subset))
+
+    def candidates(self, conditions: dict | None = None) -> np.ndarray:
+        cell = self._cell(conditions)
+        return self.values[:0] if cell is None else cell.values
+
+    def _matching(self, conditions: dict | None) -> _Cell:
+        if not len(self.values):
+            raise ValueError("Empirical distribution has no records")
+        cell = self._cell(conditions)
+        if cell is None:
             raise ValueError("No matching records for conditions")
-        record = rng.choice(candidates)
-        return float(record["value"])
+        return cell
+
+    def sample(self, rng: random.Random, conditions: dict | None = None) -> float:
+        cell = self._matching(conditions)
+        if cell.table is not None:
+            return float(cell.values[cell.table.draw(rng)])
+        return float(rng.choice(cell.values))
+
+    def sample_batch(
+        self,
+        generator: np.random.Generator,
+        size: int,
+        conditions: dict | None = None,
+    ) -> np.ndarray:
+        cell = self._matching(conditions)
+        if cell.table is not None:
+            return cell.values[cell.table.draw_batch(generator, size)]
+        return cell.values[generator.integers(0, len(cell.values), size=size)]
 
 
 @dataclass
 class DistributionFactory:
     _parametric: dict[str, DistributionCallable] = field(default_factory=dict)
     _empirical: dict[str, EmpiricalDistribution] = field(default_factory=dict)
+    _batch: dict[str, BatchDistributionCallable] = field(default_factory=dict)
+    profiler: Profiler | NullProfiler = field(default=NULL_PROFILER, repr=False, compare=False)
+    streams: NamedStreams | None = field(default=None, repr=False, compare=False)
 
-    def register(self, name: str, sampler: DistributionCallable) -> None:
+    def register(
+        self,
+        name: str,
+        sampler: DistributionCallable,
+        batch_sampler: BatchDistributionCallable | None = None,
+    ) -> None:
         self._parametric[name] = sampler
+        if batch_sampler is None:
+            self._batch.pop(name, None)
+        else:
+            self._batch[name] = batch_sampler
+
+    def register_empirical(self, name: str, records: Sequence[dict]) -> None:
+        self._empirical[name] = EmpiricalDistribution.from_records(records)
 
-    def register_empirical(self, name: str, records: list[dict]) -> None:
-        self._empirical[name] = EmpiricalDistribution(records=records)
+    def register_empirical_arrays(
+        self,
+        name: str,
+        values: Sequence[float] | np.ndarray,
+        weights: Sequence[float] | np.ndarray | None = None,
+        conditions: dict[str, Sequence | np.ndarray] | None = None,
+    ) -> None:
+        """Register columns of microdata without building a dict per record."""
+        self._empirical[name] = EmpiricalDistribution.from_arrays(values, weights, conditions)
 
     def sample(self, name: str, rng: random.Random, conditions: dict | None = None) -> float:
+        self.profiler.count_draws(name)
+        if isinstance(rng, CounterRandom):
+            rng = rng.for_draws(name)
+        elif self.streams is not None:
+            rng = self.streams.rng(name)
         if name in self._parametric:
             return float(self._parametric[name](rng, conditions))
         if name in self._empirical:
             return self._empirical[name].sample(rng, conditions)
         raise KeyError(f"Distribution '{name}' not registered")
+
+    def sample_batch(
+        self,
+        name: str,
+        generator: np.random.Generator,
+        cell_ids: np.ndarray,
+        cell_conditions: Sequence[dict | None] | None = None,
+    ) -> np.ndarray:
+        """Draw one value per entry of ``cell_ids``, grouped by demographic cell.
+
+        ``cell_conditions[cell]`` holds the conditions shared by every person in ``cell``;
+        without it all draws are unconditional. Parametric distributions registered
+        without a ``batch_sampler`` fall back to their scalar sampler. While ``streams``
+        is set, draws come from the stream of ``name`` instead of ``generator``. A
+        ``CounterGenerator`` gives every person draws keyed by its own index instead.
+        """
+        cell_ids = np.asarray(cell_ids, dtype=np.intp)
+        if self.streams is not None and not isinstance(generator, CounterGenerator):
+            generator = self.streams.generator(name)
+        self.profiler.count_draws(name, len(cell_ids))
+        with self.profiler.phase(f"distribution:{name}"):
+            return self._sample_cells(name, generator, cell_ids, cell_conditions)
+
+    def _sample_cells(
+        self,
+        name: str,
+        generator: np.random.Generator,
+        cell_ids: np.ndarray,
+        cell_conditions: Sequence[dict | None] | None,
+    ) -> np.ndarray:
+        if name in self._batch:
+            draw_cell = self._batch[name]
+        elif name in self._empirical:
+            draw_cell = self._empirical[name].sample_batch
+        elif name in self._parametric and isinstance(generator, CounterGenerator):
+            draw_cell = _counter_fallback(self._parametric[name])
+        elif name in self._parametric:
+            draw_cell = _scalar_fallback(self._parametric[name], generator)
+        else:
+            raise KeyError(f"Distribution '{name}' not registered")
+        samples = np.empty(len(cell_ids), dtype=float)
+        if cell_conditions is None:
+            samples[:] = draw_cell(_bind(generator, name), len(cell_ids), None)
+            return samples
+        order = np.argsort(cell_ids, kind="stable")
+        counts = np.bincount(cell_ids, minlength=len(cell_conditions))
+        start = 0
+        for cell, count in enumerate(counts.tolist()):
+            if count:
+                members = order[start : start + count]
+                samples[members] = draw_cell(
+                    _bind(generator, name, members), count, cell_conditions[cell]
+                )
+                start += count
+        return samples
+
+
+def _scalar_fallback(
+    sampler: DistributionCallable,
+    generator: np.random.Generator,
+) -> BatchDistributionCallable:
+    rng = random.Random(int(generator.integers(2**63)))
+
+    def _draw(_generator: np.random.Generator, size: int, conditions: dict | None) -> np.ndarray:
+        return np.fromiter(
+            (float(sampler(rng, conditions)) for _ in range(size)),
+            dtype=float,
+            count=size,
+        )
+
+    return _draw
+
+
+def _bind(
+    generator: np.random.Generator,
+    name: str,
+    members: np.ndarray | None = None,
+) -> np.random.Generator:
+    if isinstance(generator, CounterGenerator):
+        return generator.for_draws(name, members)
+    return generator
+
+
+def _counter_fallback(sampler: DistributionCallable) -> BatchDistributionCallable:
+    def _draw(generator: np.random.Generator, size: int, conditions: dict | None) -> np.ndarray:
+        assert isinstance(generator, CounterGenerator)
+        return np.fromiter(
+            (
+                float(
+                    sampler(
+                        CounterRandom(generator.seed, generator.year, index, generator.name),
+                        conditions,
+                    )
+                )
+                for index in generator.index.tolist()
+            ),
+            dtype=float,
+            count=size,
+        )
+
+    return _draw
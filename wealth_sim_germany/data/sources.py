@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import itertools
+import json
+import shutil
+import tempfile
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Protocol
+
+import numpy as np
+
+from wealth_sim_germany.data.distributions import DistributionFactory
+
+CACHE_VERSION = 1
+CACHE_META_FILE = "columns.json"
+DEFAULT_CHUNK_ROWS = 1 << 16
+HASH_BLOCK_BYTES = 1 << 20
+
+ColumnTable = dict[str, np.ndarray]
+
+
+class DataSource(Protocol):
+    """A reference table delivered as one typed array per column."""
+
+    def fingerprint(self) -> str:
+        """Digest of everything ``load`` depends on; it keys the binary cache."""
+        ...
+
+    def load(self) -> ColumnTable: ...
+
+
+def _parse_column(values: tuple[str, ...], dtype: np.dtype) -> np.ndarray:
+    if dtype.kind == "f":
+        # Empty float cells are missing values.
+        return np.asarray([value or "nan" for value in values], dtype=dtype)
+    if dtype.kind in "iu":
+        return np.asarray(values).astype(dtype)
+    return np.asarray(values, dtype=dtype)
+
+
+def _first_invalid(values: tuple[str, ...], dtype: np.dtype) -> int:
+    for position, value in enumerate(values):
+        try:
+            _parse_column((value,), dtype)
+        except ValueError:
+            return position
+    return 0
+
+
+def _infer_dtype(values: tuple[str, ...]) -> np.dtype:
+    try:
+        _parse_column(values, np.dtype(float))
+    except ValueError:
+        return np.dtype(str)
+    return np.dtype(float)
+
+
+@dataclass(frozen=True)
+class CSVSource:
+    """A CSV file with a header row, parsed ``chunk_rows`` rows at a time.
+
+    Columns listed in ``dtypes`` are parsed to that dtype; the others become floats when
+    every value parses as a number and strings otherwise. Types are guessed from the
+    first chunk; if a later chunk holds text in a column guessed numeric, the file is
+    read again with that column as strings, so the result never depends on
+    ``chunk_rows``. Each chunk is converted to arrays as soon as it is read, so no
+    per-row objects outlive it.
+    """
+
+    path: str | Path
+    dtypes: Mapping[str, str | type | np.dtype] = field(default_factory=dict)
+    delimiter: str = ","
+    chunk_rows: int = DEFAULT_CHUNK_ROWS
+
+    def __post_init__(self) -> None:
+        if self.chunk_rows <= 0:
+            raise ValueError("chunk_rows must be positive")
+
+    def fingerprint(self) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        options = {
+            "version": CACHE_VERSION,
+            "delimiter": self.delimiter,
+            "dtypes": {name: np.dtype(dtype).str for name, dtype in sorted(self.dtypes.items())},
+        }
+        digest.update(json.dumps(options, sort_keys=True).encode())
+        with Path(self.path).open("rb") as handle:
+            for block in iter(lambda: handle.read(HASH_BLOCK_BYTES), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def load(self) -> ColumnTable:
+        strings: set[str] = set()
+        while True:
+            try:
+                return self._load(strings)
+            except _NotNumeric as exc:
+                # Read the file again so earlier chunks keep their original text.
+                strings.add(exc.column)
+
+    def _load(self, strings: set[str]) -> ColumnTable:
+        with Path(self.path).open(newline="") as handle:
+            reader = csv.reader(handle, delimiter=self.delimiter)
+            header = next(reader, None)
+            if header is None:
+                raise ValueError(f"{self.path} has no header row")
+            unknown = set(self.dtypes) - set(header)
+            if unknown:
+                raise KeyError(f"{self.path} has no columns {sorted(unknown)}")
+            dtypes: dict[str, np.dtype] = {
+                name: np.dtype(dtype) for name, dtype in self.dtypes.items()
+            }
+            dtypes.update((name, np.dtype(str)) for name in strings)
+            chunks: dict[str, list[np.ndarray]] = {name: [] for name in header}
+            first_row = 0
+            for rows in _batched(filter(None, reader), self.chunk_rows):
+                columns = list(zip(*rows, strict=True))
+                for name, values in zip(header, columns, strict=True):
+                    if name not in dtypes:
+                        dtypes[name] = _infer_dtype(values)
+                    try:
+                        chunks[name].append(_parse_column(values, dtypes[name]))
+                    except ValueError as exc:
+                        if name not in self.dtypes:
+                            raise _NotNumeric(name) from exc
+                        row = first_row + _first_invalid(values, dtypes[name]) + 1
+                        raise ValueError(
+                            f"{self.path}: column '{name}' cannot parse data row {row} "
+                            f"as {dtypes[name]}; declare its type in dtypes"
+                        ) from exc
+                first_row += len(rows)
+        return {
+            name: np.concatenate(parts) if parts else np.zeros(0, dtypes.get(name, float))
+            for name, parts in chunks.items()
+        }
+
+
+class _NotNumeric(Exception):
+    """An inferred numeric column turned out to hold text."""
+
+    def __init__(self, column: str) -> None:
+        super().__init__(column)
+        self.column = column
+
+
+def _batched(rows: Iterable[list[str]], size: int) -> Iterable[list[list[str]]]:
+    iterator = iter(rows)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def _read_cache(directory: Path) -> ColumnTable:
+    names = json.loads((directory / CACHE_META_FILE).read_text())["columns"]
+    return {
+        name: np.load(directory / f"column-{position}.npy", mmap_mode="r")
+        for position, name in enumerate(names)
+    }
+
+
+def _write_cache(directory: Path, table: ColumnTable) -> None:
+    """Write ``table`` to a private staging directory, then rename it into place.
+
+    The rename is atomic, so readers only ever see complete caches. If another process
+    renamed its copy first, ours is discarded.
+    """
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{directory.name}.", dir=directory.parent))
+    try:
+        for position, column in enumerate(table.values()):
+            np.save(staging / f"column-{position}.npy", column)
+        (staging / CACHE_META_FILE).write_text(json.dumps({"columns": list(table)}))
+        staging.rename(directory)
+    except OSError:
+        if not (directory / CACHE_META_FILE).exists():
+            raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def load_columns(source: DataSource, cache_dir: str | Path | None = None) -> ColumnTable:
+    """``source.load()``, cached under ``cache_dir`` when given.
+
+    The cache holds one ``.npy`` file per column in a directory named after the
+    source's fingerprint and is read back memory-mapped. An edited file or different
+    parse options change the fingerprint, so they are loaded afresh.
+    """
+    if cache_dir is None:
+        return source.load()
+    directory = Path(cache_dir) / source.fingerprint()
+    if (directory / CACHE_META_FILE).exists():
+        return _read_cache(directory)
+    table = source.load()
+    _write_cache(directory, table)
+    return table
+
+
+def register_source(
+    factory: DistributionFactory,
+    name: str,
+    source: DataSource,
+    value: str = "value",
+    weight: str | None = None,
+    conditions: Iterable[str] = (),
+    cache_dir: str | Path | None = None,
+) -> ColumnTable:
+    """Register the ``value`` column of ``source`` as empirical distribution ``name``.
+
+    ``weight`` names an optional design-weight column and ``conditions`` the columns
+    draws can be conditioned on. Returns the loaded table.
+    """
+    table = load_columns(source, cache_dir)
+    factory.register_empirical_arrays(
+        name,
+        values=table[value],
+        weights=None if weight is None else table[weight],
+        conditions={key: table[key] for key in conditions},
+    )
+    return table
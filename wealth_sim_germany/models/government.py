@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Protocol
+from typing import Protocol, runtime_checkable
+
+import numpy as np
 
 from wealth_sim_germany.models.person import Person
+from wealth_sim_germany.models.population import Population
 from wealth_sim_germany.utils.types import GovFunction
 
 
@@ -11,6 +14,21 @@ class TransferRule(Protocol):
     def compute_transfer(self, person: Person, government: Government) -> float: ...
 
 
+@runtime_checkable
+class BatchTransferRule(TransferRule, Protocol):
+    """A ``TransferRule`` that can also price a whole ``Population`` at once.
+
+    ``compute_transfers_batch`` returns one transfer per row, equal to what
+    ``compute_transfer`` gives for ``population.person(row)``.
+    """
+
+    def compute_transfers_batch(
+        self,
+        population: Population,
+        government: Government,
+    ) -> np.ndarray: ...
+
+
 @dataclass
 class Government:
     spending_shares: dict[GovFunction, float]
@@ -23,9 +41,19 @@ class Government:
     debt: float = 0.0
     deficit: float = 0.0
 
-    def collect_taxes_from_population(self, persons: list[Person]) -> None:
-        self.tax_revenue = sum(person.taxes for person in persons)
-        self.social_contributions = sum(person.social_contrib for person in persons)
+    def collect_taxes_from_population(self, persons: list[Person] | Population) -> None:
+        if isinstance(persons, Population):
+            self.record_revenue(float(persons.taxes.sum()), float(persons.social_contrib.sum()))
+        else:
+            self.record_revenue(
+                sum(person.taxes for person in persons),
+                sum(person.social_contrib for person in persons),
+            )
+
+    def record_revenue(self, tax_revenue: float, social_contributions: float) -> None:
+        """Book the year's revenue, e.g. after summing it over population chunks."""
+        self.tax_revenue = tax_revenue
+        self.social_contributions = social_contributions
         self.total_revenue = self.tax_revenue + self.social_contributions
 
     def allocate_expenditure(
@@ -59,7 +87,35 @@ class Government:
                 self.deficit = max_deficit
         self.debt += self.deficit
 
-    def pay_transfers(self, persons: list[Person], transfer_rule: TransferRule) -> None:
+    def pay_transfers(
+        self,
+        persons: list[Person] | Population,
+        transfer_rule: TransferRule,
+    ) -> None:
+        if isinstance(persons, Population) and isinstance(transfer_rule, BatchTransferRule):
+            transfers = np.asarray(
+                transfer_rule.compute_transfers_batch(persons, self),
+                dtype=float,
+            )
+            persons.transfers = persons.transfers + transfers
+            return
+        if isinstance(persons, Population):
+            # Rows are paid through detached ``Person`` copies; the amounts are written back.
+            transfers = np.fromiter(
+                (
+                    self.pay_transfer(persons.person(index), transfer_rule)
+                    for index in range(len(persons))
+                ),
+                dtype=float,
+                count=len(persons),
+            )
+            persons.transfers = persons.transfers + transfers
+            return
         for person in persons:
-            transfer = transfer_rule.compute_transfer(person, self)
-            person.transfers += transfer
+            self.pay_transfer(person, transfer_rule)
+
+    def pay_transfer(self, person: Person, transfer_rule: TransferRule) -> float:
+        """Add ``person``'s transfer under ``transfer_rule`` to its transfers; return it."""
+        transfer = transfer_rule.compute_transfer(person, self)
+        person.transfers += transfer
+        return transfer
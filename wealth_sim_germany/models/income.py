@@ -3,8 +3,12 @@ from __future__ import annotations
 import random
 from dataclasses import dataclass
 
+import numpy as np
+
+from wealth_sim_germany.data.cells import DemographicCells
 from wealth_sim_germany.data.distributions import DistributionFactory
 from wealth_sim_germany.models.person import Person
+from wealth_sim_germany.models.population import Population
 
 
 @dataclass
@@ -38,3 +42,33 @@ class IncomeModel:
         )
         person.capital_income = capital_income
         return capital_income
+
+    def sample_labor_income_batch(
+        self,
+        population: Population,
+        generator: np.random.Generator,
+        cells: DemographicCells | None = None,
+    ) -> np.ndarray:
+        cells = cells or population.cells()
+        population.labor_income = self.distribution_factory.sample_batch(
+            self.labor_distribution,
+            generator,
+            cells.cell_ids,
+            cells.conditions,
+        )
+        return population.labor_income
+
+    def sample_capital_income_batch(
+        self,
+        population: Population,
+        generator: np.random.Generator,
+        cells: DemographicCells | None = None,
+    ) -> np.ndarray:
+        cells = cells or population.cells()
+        population.capital_income = self.distribution_factory.sample_batch(
+            self.capital_distribution,
+            generator,
+            cells.cell_ids,
+            cells.conditions,
+        )
+        return population.capital_income
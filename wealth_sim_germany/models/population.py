@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+
+import numpy as np
+
+from wealth_sim_germany.data.cells import (
+    EDUCATION_LEVELS,
+    REGIONS,
+    SEXES,
+    DemographicCells,
+)
+from wealth_sim_germany.models.person import Person
+
+DEMOGRAPHIC_FIELDS = ("age", "sex", "education", "region")
+FLOAT_FIELDS = (
+    "labor_income",
+    "capital_income",
+    "transfers",
+    "total_income",
+    "taxes",
+    "social_contrib",
+    "net_income",
+    "liquid_assets",
+    "illiquid_assets",
+    "debt",
+    "stocks",
+    "net_wealth",
+    "weight",
+)
+STATE_FIELDS = tuple(name for name in FLOAT_FIELDS if name != "weight")
+COLUMN_DTYPES: dict[str, np.dtype] = {
+    "age": np.dtype(np.int16),
+    "sex": np.dtype(np.int8),
+    "education": np.dtype(np.int8),
+    "region": np.dtype(np.int8),
+    **{name: np.dtype(float) for name in FLOAT_FIELDS},
+}
+ROW_BYTES = sum(dtype.itemsize for dtype in COLUMN_DTYPES.values())
+
+
+@dataclass
+class Population:
+    """Structure-of-arrays counterpart of ``list[Person]``.
+
+    Every ``Person`` field is held as one column. ``sex``, ``education`` and ``region`` are
+    stored as ``int8`` codes indexing ``SEXES``, ``EDUCATION_LEVELS`` and ``REGIONS``.
+    Methods replace columns rather than writing into them, which lets ``fork`` share
+    columns between copies until one of them diverges.
+    """
+
+    age: np.ndarray
+    sex: np.ndarray
+    education: np.ndarray
+    region: np.ndarray
+    labor_income: np.ndarray
+    capital_income: np.ndarray
+    transfers: np.ndarray
+    total_income: np.ndarray
+    taxes: np.ndarray
+    social_contrib: np.ndarray
+    net_income: np.ndarray
+    liquid_assets: np.ndarray
+    illiquid_assets: np.ndarray
+    debt: np.ndarray
+    stocks: np.ndarray
+    net_wealth: np.ndarray
+    weight: np.ndarray
+
+    @classmethod
+    def from_demographics(
+        cls,
+        age: np.ndarray,
+        sex: np.ndarray,
+        education: np.ndarray,
+        region: np.ndarray,
+        weight: np.ndarray | None = None,
+    ) -> Population:
+        size = len(age)
+        columns = {name: np.zeros(size) for name in FLOAT_FIELDS}
+        columns["weight"] = np.ones(size) if weight is None else np.asarray(weight, dtype=float)
+        return cls(
+            age=np.asarray(age, dtype=np.int16),
+            sex=np.asarray(sex, dtype=np.int8),
+            education=np.asarray(education, dtype=np.int8),
+            region=np.asarray(region, dtype=np.int8),
+            **columns,
+        )
+
+    @classmethod
+    def from_persons(cls, persons: Iterable[Person]) -> Population:
+        persons = list(persons)
+        sex_codes = {sex: code for code, sex in enumerate(SEXES)}
+        education_codes = {education: code for code, education in enumerate(EDUCATION_LEVELS)}
+        region_codes = {region: code for code, region in enumerate(REGIONS)}
+        columns = {
+            name: np.fromiter(
+                (getattr(person, name) for person in persons), dtype=float, count=len(persons)
+            )
+            for name in FLOAT_FIELDS
+        }
+        return cls(
+            age=np.fromiter((p.age for p in persons), dtype=np.int16, count=len(persons)),
+            sex=np.fromiter((sex_codes[p.sex] for p in persons), dtype=np.int8, count=len(persons)),
+            education=np.fromiter(
+                (education_codes[p.education] for p in persons), dtype=np.int8, count=len(persons)
+            ),
+            region=np.fromiter(
+                (region_codes[p.region] for p in persons), dtype=np.int8, count=len(persons)
+            ),
+            **columns,
+        )
+
+    @classmethod
+    def open_memmap(cls, directory: str | Path, size: int) -> Population:
+        """Zero-filled population whose columns are ``.npy`` files memory-mapped in ``directory``.
+
+        Only ``weight`` is initialised (to one); it is written in blocks so that creating
+        the files does not allocate a full column in memory.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        population = cls(
+            **{
+                name: np.lib.format.open_memmap(
+                    directory / f"{name}.npy", mode="w+", dtype=dtype, shape=(size,)
+                )
+                for name, dtype in COLUMN_DTYPES.items()
+            }
+        )
+        for start in range(0, size, 1 << 20):
+            population.weight[start : start + (1 << 20)] = 1.0
+        return population
+
+    def to_memmap(self, directory: str | Path, chunk_size: int) -> Population:
+        """Copy the population into memory-mapped columns, ``chunk_size`` rows at a time."""
+        target = Population.open_memmap(directory, len(self))
+        for start, chunk in self.chunks(chunk_size):
+            target.write_chunk(start, chunk, COLUMN_DTYPES)
+        return target
+
+    def chunk(self, start: int, stop: int) -> Population:
+        """Rows ``start:stop`` as views of this population's columns."""
+        return Population(
+            **{field.name: getattr(self, field.name)[start:stop] for field in fields(self)}
+        )
+
+    def chunks(self, chunk_size: int) -> Iterator[tuple[int, Population]]:
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        for start in range(0, len(self), chunk_size):
+            yield start, self.chunk(start, start + chunk_size)
+
+    def write_chunk(self, start: int, chunk: Population, names: Iterable[str]) -> None:
+        """Write the ``names`` columns of ``chunk`` into rows starting at ``start`` in place.
+
+        Unlike every other method this mutates the shared columns, so it must only be
+        used on columns the caller owns, such as those from ``open_memmap``.
+        """
+        stop = start + len(chunk)
+        for name in names:
+            getattr(self, name)[start:stop] = getattr(chunk, name)
+
+    def fork(self) -> Population:
+        """Shallow copy sharing every column copy-on-write."""
+        return replace(self)
+
+    def __len__(self) -> int:
+        return len(self.age)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, field.name).nbytes for field in fields(self))
+
+    def person(self, index: int) -> Person:
+        return Person(
+            age=int(self.age[index]),
+            sex=SEXES[self.sex[index]],
+            education=EDUCATION_LEVELS[self.education[index]],
+            region=REGIONS[self.region[index]],
+            **{name: float(getattr(self, name)[index]) for name in FLOAT_FIELDS},
+        )
+
+    def to_persons(self) -> list[Person]:
+        return [self.person(index) for index in range(len(self))]
+
+    def cells(self) -> DemographicCells:
+        return DemographicCells.from_codes(self.age, self.sex, self.education, self.region)
+
+    def compute_total_gross_income(self) -> np.ndarray:
+        self.total_income = self.labor_income + self.capital_income + self.transfers
+        return self.total_income
+
+    def apply_tax_result(
+        self,
+        income_tax: np.ndarray,
+        social_contrib: np.ndarray,
+        capital_tax: np.ndarray,
+    ) -> None:
+        self.taxes = income_tax + capital_tax
+        self.social_contrib = social_contrib
+        self.net_income = self.total_income - self.taxes - self.social_contrib
+
+    def update_wealth(
+        self,
+        savings_rate: np.ndarray,
+        labor_return_rate: np.ndarray | float,
+        capital_return_rate: np.ndarray | float,
+    ) -> None:
+        savings = self.net_income * savings_rate
+        labor_return = self.liquid_assets * labor_return_rate
+        capital_return = self.illiquid_assets * capital_return_rate
+        self.liquid_assets = self.liquid_assets + savings + labor_return
+        self.illiquid_assets = self.illiquid_assets + capital_return
+        self.net_wealth = self.liquid_assets + self.illiquid_assets + self.stocks - self.debt
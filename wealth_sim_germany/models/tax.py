@@ -1,10 +1,141 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import bisect
+import math
+from dataclasses import dataclass, field
+from functools import lru_cache
 
-from wealth_sim_germany.config.schemas import TaxConfig
+import numpy as np
+
+from wealth_sim_germany.config.schemas import IncomeTaxTariffConfig, TaxConfig
 from wealth_sim_germany.models.person import Person
 
+TARIFF_STEP = 10_000.0
+
+
+@dataclass(frozen=True)
+class TariffTable:
+    """Breakpoints and per-zone coefficients of an income tax tariff.
+
+    Within zone ``k`` the tax is
+    ``base[k] + rate[k] * x + t * (linear[k] + t * quadratic[k])`` with
+    ``t = (x - lower_bounds[k]) / TARIFF_STEP``; zones are closed at their upper bound.
+    """
+
+    lower_bounds: np.ndarray
+    base: np.ndarray
+    rate: np.ndarray
+    linear: np.ndarray
+    quadratic: np.ndarray
+
+
+@lru_cache(maxsize=128)
+def tariff_table(tariff: IncomeTaxTariffConfig) -> TariffTable:
+    zone2_a, zone2_b = tariff.zone2_coefficients
+    zone3_a, zone3_b, zone3_c = tariff.zone3_coefficients
+    return TariffTable(
+        lower_bounds=np.array(
+            [
+                0.0,
+                tariff.basic_allowance,
+                tariff.zone2_limit,
+                tariff.zone3_limit,
+                tariff.zone4_limit,
+            ]
+        ),
+        base=np.array([0.0, 0.0, zone3_c, -tariff.zone4_offset, -tariff.top_offset]),
+        rate=np.array([0.0, 0.0, 0.0, tariff.zone4_rate, tariff.top_rate]),
+        linear=np.array([0.0, zone2_b, zone3_b, 0.0, 0.0]),
+        quadratic=np.array([0.0, zone2_a, zone3_a, 0.0, 0.0]),
+    )
+
+
+def _evaluate_tariff(table: TariffTable, taxable_income: np.ndarray) -> np.ndarray:
+    income = np.floor(np.maximum(taxable_income, 0.0))
+    zone = np.searchsorted(table.lower_bounds, income, side="left") - 1
+    np.maximum(zone, 0, out=zone)
+    step = (income - table.lower_bounds[zone]) / TARIFF_STEP
+    tax = table.base[zone] + table.rate[zone] * income
+    tax += step * (table.linear[zone] + step * table.quadratic[zone])
+    return np.floor(np.maximum(tax, 0.0))
+
+
+@lru_cache(maxsize=128)
+def _scalar_zones(tariff: IncomeTaxTariffConfig) -> tuple[tuple[float, ...], ...]:
+    """``tariff_table`` as plain floats: the lower bounds, then one row per zone."""
+    table = tariff_table(tariff)
+    return (
+        tuple(table.lower_bounds.tolist()),
+        *zip(
+            table.lower_bounds.tolist(),
+            table.base.tolist(),
+            table.rate.tolist(),
+            table.linear.tolist(),
+            table.quadratic.tolist(),
+            strict=True,
+        ),
+    )
+
+
+def _evaluate_tariff_scalar(tariff: IncomeTaxTariffConfig, taxable_income: float) -> float:
+    lower_bounds, *zones = _scalar_zones(tariff)
+    income = math.floor(max(taxable_income, 0.0))
+    lower, base, rate, linear, quadratic = zones[
+        max(bisect.bisect_left(lower_bounds, income) - 1, 0)
+    ]
+    step = (income - lower) / TARIFF_STEP
+    tax = base + rate * income
+    tax += step * (linear + step * quadratic)
+    return float(math.floor(max(tax, 0.0)))
+
+
+def compute_tariff_tax_scalar(
+    tariff: IncomeTaxTariffConfig,
+    taxable_income: float,
+    joint: bool | None = None,
+) -> float:
+    """``compute_tariff_tax`` for a single income, without building arrays."""
+    divisor = 2.0 if (tariff.splitting if joint is None else joint) else 1.0
+    income_tax = _evaluate_tariff_scalar(tariff, taxable_income / divisor) * divisor
+    if tariff.solidarity_rate == 0.0:
+        return income_tax
+    exemption = tariff.solidarity_exemption * divisor
+    if income_tax <= exemption:
+        return income_tax
+    surcharge = min(
+        income_tax * tariff.solidarity_rate,
+        max(income_tax - exemption, 0.0) * tariff.solidarity_phase_in_rate,
+    )
+    return income_tax + math.floor(surcharge * 100.0) / 100.0
+
+
+def compute_tariff_tax(
+    tariff: IncomeTaxTariffConfig,
+    taxable_income: np.ndarray,
+    joint: np.ndarray | bool | None = None,
+) -> np.ndarray:
+    """Income tax plus Solidaritätszuschlag for an array of taxable incomes.
+
+    ``joint`` marks couples assessed with splitting; it defaults to ``tariff.splitting``.
+    """
+    table = tariff_table(tariff)
+    taxable_income = np.asarray(taxable_income, dtype=float)
+    joint_mask = np.broadcast_to(
+        np.asarray(tariff.splitting if joint is None else joint, dtype=bool),
+        taxable_income.shape,
+    )
+    divisor = np.where(joint_mask, 2.0, 1.0)
+    income_tax = _evaluate_tariff(table, taxable_income / divisor) * divisor
+    if tariff.solidarity_rate == 0.0:
+        return income_tax
+    exemption = tariff.solidarity_exemption * divisor
+    surcharge = np.minimum(
+        income_tax * tariff.solidarity_rate,
+        np.maximum(income_tax - exemption, 0.0) * tariff.solidarity_phase_in_rate,
+    )
+    surcharge = np.where(income_tax > exemption, np.floor(surcharge * 100.0) / 100.0, 0.0)
+    return income_tax + surcharge
+
 
 @dataclass(frozen=True)
 class TaxResult:
@@ -17,11 +148,45 @@ class TaxResult:
         return self.income_tax + self.social_contrib + self.capital_tax
 
 
+@dataclass(frozen=True)
+class BatchTaxResult:
+    gross_income: np.ndarray
+    income_tax: np.ndarray
+    social_contrib: np.ndarray
+    capital_tax: np.ndarray
+
+    @property
+    def total(self) -> np.ndarray:
+        return self.income_tax + self.social_contrib + self.capital_tax
+
+
 @dataclass(frozen=True)
 class TaxCalculator:
     config: TaxConfig
+    _tariffs: dict[int, IncomeTaxTariffConfig | None] = field(
+        default_factory=dict,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    def tariff_for_year(self, year: int | None) -> IncomeTaxTariffConfig | None:
+        """Return the most recent tariff in force in ``year``, or ``None`` for the flat rate."""
+        if year is None:
+            return None
+        if year not in self._tariffs:
+            in_force = [
+                tariff_year for tariff_year in self.config.income_tax_tariffs if tariff_year <= year
+            ]
+            self._tariffs[year] = (
+                self.config.income_tax_tariffs[max(in_force)] if in_force else None
+            )
+        return self._tariffs[year]
 
-    def compute_income_tax(self, taxable_income: float) -> float:
+    def compute_income_tax(self, taxable_income: float, year: int | None = None) -> float:
+        tariff = self.tariff_for_year(year)
+        if tariff is not None:
+            return compute_tariff_tax_scalar(tariff, taxable_income)
         taxable_income = max(taxable_income, 0.0)
         return taxable_income * self.config.income_tax_rate
 
@@ -33,14 +198,49 @@ class TaxCalculator:
         gross_income = max(gross_income, 0.0)
         return gross_income * self.config.social_contrib_rate
 
-    def compute_all_taxes(self, person: Person) -> TaxResult:
+    def compute_all_taxes(self, person: Person, year: int | None = None) -> TaxResult:
         gross_income = person.compute_total_gross_income()
-        taxable_income = gross_income - person.capital_income
-        income_tax = self.compute_income_tax(taxable_income)
+        return self.compute_taxes(gross_income, person.capital_income, year)
+
+    def compute_taxes(
+        self,
+        gross_income: float,
+        capital_income: float,
+        year: int | None = None,
+    ) -> TaxResult:
+        """``compute_all_taxes`` for a gross income the caller has already computed."""
+        taxable_income = gross_income - capital_income
+        income_tax = self.compute_income_tax(taxable_income, year)
         social_contrib = self.compute_social_contributions(gross_income)
-        capital_tax = self.compute_capital_tax(person.capital_income)
+        capital_tax = self.compute_capital_tax(capital_income)
         return TaxResult(
             income_tax=income_tax,
             social_contrib=social_contrib,
             capital_tax=capital_tax,
         )
+
+    def compute_all_taxes_batch(
+        self,
+        labor_income: np.ndarray,
+        capital_income: np.ndarray,
+        transfers: np.ndarray,
+        year: int | None = None,
+    ) -> BatchTaxResult:
+        """Array form of ``compute_all_taxes`` for whole income columns."""
+        gross_income = labor_income + capital_income + transfers
+        tariff = self.tariff_for_year(year)
+        if tariff is not None:
+            income_tax = compute_tariff_tax(tariff, gross_income - capital_income)
+        else:
+            income_tax = np.maximum(gross_income - capital_income, 0.0)
+            income_tax *= self.config.income_tax_rate
+        social_contrib = np.maximum(gross_income, 0.0)
+        social_contrib *= self.config.social_contrib_rate
+        capital_tax = np.maximum(capital_income, 0.0)
+        capital_tax *= self.config.capital_gains_rate
+        return BatchTaxResult(
+            gross_income=gross_income,
+            income_tax=income_tax,
+            social_contrib=social_contrib,
+            capital_tax=capital_tax,
+        )
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from wealth_sim_germany.models.person import Person
+from wealth_sim_germany.models.population import Population
+
+if TYPE_CHECKING:
+    from wealth_sim_germany.models.government import Government
+
+
+def _phase_out(
+    maximum: float,
+    income: np.ndarray | float,
+    threshold: float,
+    rate: float,
+) -> np.ndarray:
+    return np.maximum(maximum - rate * np.maximum(income - threshold, 0.0), 0.0)
+
+
+@dataclass(frozen=True)
+class FlatTransfer:
+    """The same ``amount`` for every person."""
+
+    amount: float
+
+    def compute_transfer(self, person: Person, government: Government) -> float:
+        return self.amount
+
+    def compute_transfers_batch(self, population: Population, government: Government) -> np.ndarray:
+        return np.full(len(population), self.amount)
+
+
+@dataclass(frozen=True)
+class MeansTestedTransfer:
+    """``max_benefit`` withdrawn at ``phase_out_rate`` above a market income of ``threshold``.
+
+    Market income is labour plus capital income.
+    """
+
+    max_benefit: float
+    threshold: float
+    phase_out_rate: float
+
+    def __post_init__(self) -> None:
+        if self.phase_out_rate < 0:
+            raise ValueError("phase_out_rate must be non-negative")
+
+    def compute_transfer(self, person: Person, government: Government) -> float:
+        income = person.labor_income + person.capital_income
+        return float(_phase_out(self.max_benefit, income, self.threshold, self.phase_out_rate))
+
+    def compute_transfers_batch(self, population: Population, government: Government) -> np.ndarray:
+        income = population.labor_income + population.capital_income
+        return _phase_out(self.max_benefit, income, self.threshold, self.phase_out_rate)
+
+
+@dataclass(frozen=True)
+class BasicIncomeSupport:
+    """Bürgergeld-like minimum income, in annual euros.
+
+    Persons whose countable assets (liquid assets plus stocks; housing is exempt)
+    exceed ``asset_allowance`` get nothing. Everyone else receives ``standard_rate``
+    minus their capital income and the part of their labour income above
+    ``earnings_allowance``, withdrawn at ``withdrawal_rate``.
+    """
+
+    standard_rate: float = 6_756.0
+    asset_allowance: float = 40_000.0
+    earnings_allowance: float = 1_200.0
+    withdrawal_rate: float = 0.8
+
+    def compute_transfer(self, person: Person, government: Government) -> float:
+        if person.liquid_assets + person.stocks > self.asset_allowance:
+            return 0.0
+        counted = person.capital_income + self.withdrawal_rate * max(
+            person.labor_income - self.earnings_allowance, 0.0
+        )
+        return max(self.standard_rate - counted, 0.0)
+
+    def compute_transfers_batch(self, population: Population, government: Government) -> np.ndarray:
+        counted = population.capital_income + self.withdrawal_rate * np.maximum(
+            population.labor_income - self.earnings_allowance, 0.0
+        )
+        benefit = np.maximum(self.standard_rate - counted, 0.0)
+        eligible = population.liquid_assets + population.stocks <= self.asset_allowance
+        return np.where(eligible, benefit, 0.0)
+
+
+@dataclass(frozen=True)
+class ChildBenefit:
+    """Kindergeld-like ``amount`` per year for every person younger than ``max_age``."""
+
+    amount: float = 3_000.0
+    max_age: int = 18
+
+    def compute_transfer(self, person: Person, government: Government) -> float:
+        return self.amount if person.age < self.max_age else 0.0
+
+    def compute_transfers_batch(self, population: Population, government: Government) -> np.ndarray:
+        return np.where(population.age < self.max_age, self.amount, 0.0)
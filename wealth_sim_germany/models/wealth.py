@@ -3,9 +3,13 @@ from __future__ import annotations
 import random
 from dataclasses import dataclass
 
+import numpy as np
+
 from wealth_sim_germany.config.schemas import MacroParams
+from wealth_sim_germany.data.cells import DemographicCells
 from wealth_sim_germany.data.distributions import DistributionFactory
 from wealth_sim_germany.models.person import Person
+from wealth_sim_germany.models.population import Population
 
 
 @dataclass
@@ -77,3 +81,54 @@ class WealthModel:
             labor_return_rate=labor_return_rate,
             capital_return_rate=capital_return_rate,
         )
+
+    def _sample_batch(
+        self,
+        name: str,
+        generator: np.random.Generator,
+        cells: DemographicCells,
+    ) -> np.ndarray:
+        return self.distribution_factory.sample_batch(
+            name,
+            generator,
+            cells.cell_ids,
+            cells.conditions,
+        )
+
+    def initialise_wealth_batch(
+        self,
+        population: Population,
+        generator: np.random.Generator,
+        cells: DemographicCells | None = None,
+    ) -> None:
+        cells = cells or population.cells()
+        population.liquid_assets = self._sample_batch(
+            self.liquid_assets_distribution, generator, cells
+        )
+        population.illiquid_assets = self._sample_batch(
+            self.illiquid_assets_distribution, generator, cells
+        )
+        population.debt = self._sample_batch(self.debt_distribution, generator, cells)
+        population.stocks = self._sample_batch(self.stocks_distribution, generator, cells)
+        population.net_wealth = (
+            population.liquid_assets + population.illiquid_assets + population.stocks
+        ) - population.debt
+
+    def evolve_wealth_batch(
+        self,
+        population: Population,
+        generator: np.random.Generator,
+        macro_params: MacroParams,
+        cells: DemographicCells | None = None,
+    ) -> None:
+        cells = cells or population.cells()
+        savings_rate = self._sample_batch(self.savings_rate_distribution, generator, cells)
+        labor_return_rate = self._sample_batch(self.labor_return_distribution, generator, cells)
+        capital_return_rate = self._sample_batch(self.capital_return_distribution, generator, cells)
+        labor_return_rate += macro_params.gdp_growth
+        capital_return_rate += macro_params.gdp_growth + macro_params.inflation
+        population.update_wealth(
+            savings_rate=savings_rate,
+            labor_return_rate=labor_return_rate,
+            capital_return_rate=capital_return_rate,
+        )
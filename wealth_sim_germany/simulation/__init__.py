@@ -1,9 +1,52 @@
+from wealth_sim_germany.simulation.adaptive import AdaptiveEnsembleResult, run_adaptive_ensemble
 from wealth_sim_germany.simulation.engine import SimulationController, SimulationResult
-from wealth_sim_germany.simulation.time_step import SimulationContext, run_single_year
+from wealth_sim_germany.simulation.ensemble import (
+    EnsembleResult,
+    ScenarioComparison,
+    compare_scenarios,
+    run_ensemble,
+)
+from wealth_sim_germany.simulation.panel import PanelReader, PanelRecorder, PanelSpec
+from wealth_sim_germany.simulation.sinks import (
+    BackgroundSink,
+    CSVSink,
+    NPZSink,
+    ParquetSink,
+    ResultSink,
+    open_sink,
+)
+from wealth_sim_germany.simulation.state import SimulationState
+from wealth_sim_germany.simulation.sweep import SweepResult, run_sweep
+from wealth_sim_germany.simulation.time_step import (
+    SimulationContext,
+    run_single_year,
+    run_single_year_columnar,
+    run_single_year_fused,
+)
 
 __all__ = [
+    "AdaptiveEnsembleResult",
+    "BackgroundSink",
+    "CSVSink",
+    "EnsembleResult",
+    "NPZSink",
+    "PanelReader",
+    "PanelRecorder",
+    "PanelSpec",
+    "ParquetSink",
+    "ResultSink",
+    "ScenarioComparison",
     "SimulationContext",
     "SimulationController",
     "SimulationResult",
+    "SimulationState",
+    "SweepResult",
+    "compare_scenarios",
+    "open_sink",
+    "run_adaptive_ensemble",
+    "run_ensemble",
     "run_single_year",
+    "run_single_year_columnar",
+    "run_single_year_fused",
+    "run_sweep",
 ]
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from wealth_sim_germany.analysis.moments import RunningMoments
+from wealth_sim_germany.simulation.ensemble import replication_pool, stack_replications
+
+if TYPE_CHECKING:
+    from wealth_sim_germany.simulation.engine import SimulationController
+
+DEFAULT_BATCH_SIZE = 8
+DEFAULT_MAX_REPLICATIONS = 1_000
+DEFAULT_CONFIDENCE = 0.95
+
+BatchRunner = Callable[[list[np.random.SeedSequence]], list[list[dict[str, float]]]]
+
+
+@dataclass
+class AdaptiveEnsembleResult:
+    """Per-year mean, variance and confidence half-width of each indicator.
+
+    ``converged`` tells whether every targeted indicator met its tolerance in every year
+    before the replication or time budget ran out.
+    """
+
+    scenario_name: str
+    start_year: int
+    years: int
+    n_replications: int
+    n_batches: int
+    seed: int
+    confidence: float
+    converged: bool
+    tolerances: dict[str, float]
+    mean: dict[str, np.ndarray]
+    variance: dict[str, np.ndarray]
+    half_width: dict[str, np.ndarray]
+
+
+@contextmanager
+def _replication_runner(
+    controller: SimulationController,
+    workers: int,
+) -> Iterator[BatchRunner]:
+    """Batch runner reusing one process pool for every batch."""
+    with replication_pool(controller, workers) as run:
+        yield lambda seeds: run([(seed, False) for seed in seeds])
+
+
+def run_adaptive_ensemble(
+    controller: SimulationController,
+    tolerances: Mapping[str, float],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_replications: int = DEFAULT_MAX_REPLICATIONS,
+    max_seconds: float | None = None,
+    workers: int = 1,
+    seed: int | None = None,
+    confidence: float = DEFAULT_CONFIDENCE,
+) -> AdaptiveEnsembleResult:
+    """Run batches of replications until every targeted indicator is precise enough.
+
+    ``tolerances`` maps indicators of ``build_aggregates`` to the largest acceptable
+    half-width of the ``confidence`` interval of their yearly mean. Batches of
+    ``batch_size`` replications run (over ``workers`` processes) until all tolerances are
+    met in every year, ``max_replications`` have run or ``max_seconds`` have passed.
+    Results are folded into running moments as they arrive, and replication ``i`` uses
+    the same seed as in ``run_ensemble``, so the outcome does not depend on ``workers``.
+    """
+    if not tolerances:
+        raise ValueError("At least one indicator tolerance is required")
+    if any(tolerance <= 0 for tolerance in tolerances.values()):
+        raise ValueError("Tolerances must be positive")
+    if batch_size <= 0 or max_replications <= 0:
+        raise ValueError("batch_size and max_replications must be positive")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be in (0, 1)")
+    if seed is None:
+        seed = controller.rng.getrandbits(128)
+    root = np.random.SeedSequence(seed)
+    deadline = None if max_seconds is None else time.monotonic() + max_seconds
+    moments: RunningMoments | None = None
+    indicators: tuple[str, ...] = ()
+    n_batches = 0
+    converged = False
+    with _replication_runner(controller, workers) as run_batch:
+        while moments is None or moments.count < max_replications:
+            remaining = max_replications - (0 if moments is None else moments.count)
+            batch_indicators, values = stack_replications(
+                run_batch(root.spawn(min(batch_size, remaining)))
+            )
+            if moments is None:
+                indicators = batch_indicators
+                missing = set(tolerances) - set(indicators)
+                if missing:
+                    raise KeyError(f"Unknown indicators: {sorted(missing)}")
+                moments = RunningMoments(values.shape[1:])
+            for replication in values:
+                moments.update(replication)
+            n_batches += 1
+            half_width = moments.half_width(confidence)
+            converged = all(
+                np.all(half_width[:, indicators.index(name)] <= tolerance)
+                for name, tolerance in tolerances.items()
+            )
+            if converged or (deadline is not None and time.monotonic() >= deadline):
+                break
+    assert moments is not None
+    half_width = moments.half_width(confidence)
+    variance = moments.variance
+    return AdaptiveEnsembleResult(
+        scenario_name=controller.scenario.name,
+        start_year=controller.scenario.start_year,
+        years=controller.scenario.years,
+        n_replications=moments.count,
+        n_batches=n_batches,
+        seed=seed,
+        confidence=confidence,
+        converged=converged,
+        tolerances=dict(tolerances),
+        mean={name: moments.mean[:, idx] for idx, name in enumerate(indicators)},
+        variance={name: variance[:, idx] for idx, name in enumerate(indicators)},
+        half_width={name: half_width[:, idx] for idx, name in enumerate(indicators)},
+    )
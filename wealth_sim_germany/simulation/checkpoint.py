@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+import random
+import shutil
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from wealth_sim_germany.models.government import Government
+from wealth_sim_germany.models.person import Person
+from wealth_sim_germany.models.population import Population
+from wealth_sim_germany.simulation.state import SimulationState
+from wealth_sim_germany.utils.rng import CounterStreams, NamedStreams, streams_from_dict
+from wealth_sim_germany.utils.types import GovFunction
+
+CHECKPOINT_VERSION = 1
+STATE_FILE = "state.json"
+
+
+@dataclass
+class Checkpoint:
+    """Simulation state after a completed year, as restored by ``load_checkpoint``.
+
+    Population columns are memory-mapped copy-on-write, so opening a checkpoint does not
+    read or copy the population.
+    """
+
+    path: Path
+    next_year: int
+    representation: str
+    population: Population
+    government: Government
+    rng_state: tuple
+    generator_state: dict | None
+    yearly: list[dict[str, float]]
+    streams: NamedStreams | CounterStreams | None = None
+
+    def persons(self) -> list[Person] | Population:
+        if self.representation == "persons":
+            return self.population.to_persons()
+        return self.population
+
+    def restore_generator(self) -> np.random.Generator | None:
+        if self.generator_state is None:
+            return None
+        bit_generator = getattr(np.random, self.generator_state["bit_generator"])()
+        bit_generator.state = self.generator_state
+        return np.random.Generator(bit_generator)
+
+    def to_state(self, rng: random.Random) -> SimulationState:
+        """Restore the checkpoint, loading the saved RNG state into ``rng``."""
+        rng.setstate(self.rng_state)
+        return SimulationState(
+            next_year=self.next_year,
+            persons=self.persons(),
+            government=self.government,
+            rng=rng,
+            generator=self.restore_generator(),
+            yearly=self.yearly,
+            streams=self.streams,
+        )
+
+
+def checkpoint_path(directory: str | Path, year: int) -> Path:
+    """Location of the checkpoint written after simulating ``year``."""
+    return Path(directory) / f"year-{year}"
+
+
+def _government_to_dict(government: Government) -> dict[str, Any]:
+    return {
+        "spending_shares": {key.value: value for key, value in government.spending_shares.items()},
+        "deficit_limit": government.deficit_limit,
+        "gdp": government.gdp,
+        "tax_revenue": government.tax_revenue,
+        "social_contributions": government.social_contributions,
+        "total_revenue": government.total_revenue,
+        "expenditure": {key.value: value for key, value in government.expenditure.items()},
+        "debt": government.debt,
+        "deficit": government.deficit,
+    }
+
+
+def _government_from_dict(data: dict[str, Any]) -> Government:
+    return Government(
+        spending_shares={GovFunction(key): value for key, value in data["spending_shares"].items()},
+        deficit_limit=data["deficit_limit"],
+        gdp=data["gdp"],
+        tax_revenue=data["tax_revenue"],
+        social_contributions=data["social_contributions"],
+        total_revenue=data["total_revenue"],
+        expenditure={GovFunction(key): value for key, value in data["expenditure"].items()},
+        debt=data["debt"],
+        deficit=data["deficit"],
+    )
+
+
+def write_checkpoint(path: str | Path, state: SimulationState) -> Path:
+    """Write one ``.npy`` file per population column plus a JSON state file.
+
+    The snapshot is assembled in a sibling directory and renamed into place, so an
+    interrupted write never leaves a partial checkpoint behind.
+    """
+    target = Path(path)
+    staging = target.with_name(f".{target.name}.tmp")
+    if staging.exists():
+        shutil.rmtree(staging)
+    staging.mkdir(parents=True)
+    persons = state.persons
+    representation = "columnar" if isinstance(persons, Population) else "persons"
+    population = persons if isinstance(persons, Population) else Population.from_persons(persons)
+    for column in fields(population):
+        np.save(staging / f"{column.name}.npy", getattr(population, column.name))
+    version, internal_state, gauss_next = state.rng.getstate()
+    payload = {
+        "version": CHECKPOINT_VERSION,
+        "next_year": state.next_year,
+        "representation": representation,
+        "government": _government_to_dict(state.government),
+        "rng_state": [version, list(internal_state), gauss_next],
+        "generator_state": (
+            None if state.generator is None else state.generator.bit_generator.state
+        ),
+        "yearly": state.yearly,
+        "streams": None if state.streams is None else state.streams.to_dict(),
+    }
+    (staging / STATE_FILE).write_text(json.dumps(payload))
+    if target.exists():
+        shutil.rmtree(target)
+    staging.rename(target)
+    return target
+
+
+def load_checkpoint(path: str | Path) -> Checkpoint:
+    checkpoint_dir = Path(path)
+    state = json.loads((checkpoint_dir / STATE_FILE).read_text())
+    if state["version"] != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version: {state['version']}")
+    population = Population(
+        **{
+            column.name: np.load(checkpoint_dir / f"{column.name}.npy", mmap_mode="c")
+            for column in fields(Population)
+        }
+    )
+    version, internal_state, gauss_next = state["rng_state"]
+    return Checkpoint(
+        path=checkpoint_dir,
+        next_year=state["next_year"],
+        representation=state["representation"],
+        population=population,
+        government=_government_from_dict(state["government"]),
+        rng_state=(version, tuple(internal_state), gauss_next),
+        generator_state=state["generator_state"],
+        yearly=state["yearly"],
+        streams=None if state.get("streams") is None else streams_from_dict(state["streams"]),
+    )
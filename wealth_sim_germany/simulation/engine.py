@@ -1,17 +1,58 @@
 from __future__ import annotations
 
+import contextlib
 import random
-from dataclasses import dataclass
+import shutil
+import tempfile
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import numpy as np
 
 from wealth_sim_germany.analysis.aggregations import build_aggregates
 from wealth_sim_germany.config.schemas import ScenarioConfig
+from wealth_sim_germany.config.sweep import SweepPoint, SweepSpec
 from wealth_sim_germany.data.distributions import DistributionFactory
 from wealth_sim_germany.models.government import Government, TransferRule
 from wealth_sim_germany.models.income import IncomeModel
 from wealth_sim_germany.models.person import Person
+from wealth_sim_germany.models.population import COLUMN_DTYPES, Population
 from wealth_sim_germany.models.tax import TaxCalculator
 from wealth_sim_germany.models.wealth import WealthModel
-from wealth_sim_germany.simulation.time_step import SimulationContext, run_single_year
+from wealth_sim_germany.simulation.adaptive import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CONFIDENCE,
+    DEFAULT_MAX_REPLICATIONS,
+    AdaptiveEnsembleResult,
+    run_adaptive_ensemble,
+)
+from wealth_sim_germany.simulation.checkpoint import (
+    checkpoint_path,
+    load_checkpoint,
+    write_checkpoint,
+)
+from wealth_sim_germany.simulation.ensemble import (
+    DEFAULT_QUANTILES,
+    EnsembleResult,
+    ScenarioComparison,
+    compare_scenarios,
+    run_ensemble,
+)
+from wealth_sim_germany.simulation.panel import PanelRecorder
+from wealth_sim_germany.simulation.sinks import ResultSink, rows_to_arrays
+from wealth_sim_germany.simulation.state import SimulationState
+from wealth_sim_germany.simulation.sweep import SweepResult, run_sweep
+from wealth_sim_germany.simulation.time_step import (
+    DEFAULT_MEMORY_BUDGET,
+    SimulationContext,
+    chunk_size_for_budget,
+    run_single_year_chunked,
+    run_single_year_columnar,
+    run_single_year_fused,
+)
+from wealth_sim_germany.utils.profiling import NULL_PROFILER, NullProfiler, Profiler
+from wealth_sim_germany.utils.rng import CounterStreams, NamedStreams
 from wealth_sim_germany.utils.types import EducationLevel, Region, Sex
 
 
@@ -21,6 +62,11 @@ class SimulationResult:
     start_year: int
     years: int
     yearly: list[dict[str, float]]
+    profile: Profiler | None = None
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """One array per indicator holding its value for every simulated year."""
+        return rows_to_arrays(self.yearly)
 
 
 def _default_population(size: int) -> list[Person]:
@@ -40,6 +86,24 @@ def _default_population(size: int) -> list[Person]:
     return persons
 
 
+def _default_columnar_population(size: int, start: int = 0) -> Population:
+    idx = np.arange(start, start + size)
+    return Population.from_demographics(
+        age=30 + (idx % 40),
+        sex=idx % len(Sex),
+        education=idx % len(EducationLevel),
+        region=idx % len(Region),
+    )
+
+
+def _default_chunked_population(size: int, directory: str | Path, chunk_size: int) -> Population:
+    population = Population.open_memmap(directory, size)
+    for start in range(0, size, chunk_size):
+        chunk = _default_columnar_population(min(chunk_size, size - start), start)
+        population.write_chunk(start, chunk, COLUMN_DTYPES)
+    return population
+
+
 class SimulationController:
     def __init__(
         self,
@@ -49,10 +113,29 @@ class SimulationController:
         wealth_model: WealthModel | None = None,
         tax_calculator: TaxCalculator | None = None,
         transfer_rule: TransferRule | None = None,
-        persons: list[Person] | None = None,
+        persons: list[Person] | Population | None = None,
         government: Government | None = None,
         rng: random.Random | None = None,
+        generator: np.random.Generator | None = None,
+        streams: NamedStreams | CounterStreams | None = None,
+        columnar: bool = False,
+        storage_dir: str | Path | None = None,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
     ) -> None:
+        """Set up a simulation of ``scenario``.
+
+        With ``streams`` every distribution draws from its own named stream instead of
+        ``rng``/``generator``, so runs of different scenarios see common random numbers.
+        ``CounterStreams`` additionally key every draw by person and year, which makes
+        results independent of chunking and loop order.
+        ``columnar`` simulates a ``Population`` instead of a ``list[Person]``. Giving
+        ``storage_dir`` enables the out-of-core mode: the population is memory-mapped into
+        a fresh subdirectory of ``storage_dir`` (deleted by ``close``) and each year is
+        processed in chunks sized so that the working memory stays within
+        ``memory_budget`` bytes. In this mode the reported Gini comes from a streaming
+        sketch and may fall short of the exact value by up to the sketch's
+        ``gini_error_bound()``.
+        """
         self.scenario = scenario
         self.distribution_factory = distribution_factory or DistributionFactory()
         self.income_model = income_model or IncomeModel(self.distribution_factory)
@@ -64,10 +147,65 @@ class SimulationController:
         self.persons = persons
         self.government = government
         self.rng = rng or random.Random()
+        self.generator = generator
+        self.streams = streams
+        self.columnar = columnar
+        self.storage_dir = storage_dir
+        self.memory_budget = memory_budget
+        self.chunk_size = chunk_size_for_budget(memory_budget)
+        self._stored_population: Population | None = None
+        self._storage_dirs: list[Path] = []
 
-    def initialise(self) -> tuple[list[Person], Government]:
+    def __getstate__(self) -> dict:
+        # Copies (ensemble replicas, pool workers) store their populations separately and
+        # must not delete the original's storage.
+        return {**self.__dict__, "_stored_population": None, "_storage_dirs": []}
+
+    def close(self) -> None:
+        """Delete the population storage this controller created under ``storage_dir``.
+
+        A population or state still living there becomes unusable, so the controller
+        starts from a fresh population on its next run.
+        """
+        if self._stored_population is not None and self.persons is self._stored_population:
+            self.persons = None
+        self._stored_population = None
+        for directory in self._storage_dirs:
+            shutil.rmtree(directory, ignore_errors=True)
+        self._storage_dirs = []
+
+    def _storage(self) -> Path:
+        if self.storage_dir is None:
+            raise ValueError("storage_dir is required for chunked simulation")
+        Path(self.storage_dir).mkdir(parents=True, exist_ok=True)
+        directory = Path(tempfile.mkdtemp(prefix="population-", dir=self.storage_dir))
+        self._storage_dirs.append(directory)
+        return directory
+
+    def _owned_storage(self, persons: list[Person] | Population) -> Population:
+        """Population memory-mapped in this controller's storage, copying it there if needed.
+
+        Chunked years write in place, so populations shared with forks or checkpoints are
+        copied first.
+        """
+        if persons is self._stored_population:
+            return persons
+        population = (
+            persons if isinstance(persons, Population) else Population.from_persons(persons)
+        )
+        self._stored_population = population.to_memmap(self._storage(), self.chunk_size)
+        return self._stored_population
+
+    def initialise(self) -> tuple[list[Person] | Population, Government]:
         if self.persons is None:
-            self.persons = _default_population(self.scenario.population.synthetic_n)
+            if self.storage_dir is not None:
+                self.persons = self._stored_population = _default_chunked_population(
+                    self.scenario.population.synthetic_n, self._storage(), self.chunk_size
+                )
+            elif self.columnar:
+                self.persons = _default_columnar_population(self.scenario.population.synthetic_n)
+            else:
+                self.persons = _default_population(self.scenario.population.synthetic_n)
         if self.government is None:
             self.government = Government(
                 spending_shares=self.scenario.government.spending_shares,
@@ -76,30 +214,266 @@ class SimulationController:
             )
         return self.persons, self.government
 
-    def run(self) -> SimulationResult:
+    def start_state(self) -> SimulationState:
         persons, government = self.initialise()
+        return SimulationState(
+            next_year=self.scenario.start_year,
+            persons=persons,
+            government=government,
+            rng=self.rng,
+            generator=self.generator,
+            yearly=[],
+            streams=self.streams,
+        )
+
+    def _simulate_year(self, ctx: SimulationContext, state: SimulationState) -> None:
+        year = state.next_year
+        if self.storage_dir is not None:
+            assert isinstance(state.persons, Population)
+            state.persons, state.government, aggregates = run_single_year_chunked(
+                ctx=ctx,
+                population=state.persons,
+                government=state.government,
+                year=year,
+                scenario=self.scenario,
+                chunk_size=self.chunk_size,
+            )
+        else:
+            if isinstance(state.persons, Population):
+                state.persons, state.government = run_single_year_columnar(
+                    ctx=ctx,
+                    population=state.persons,
+                    government=state.government,
+                    year=year,
+                    scenario=self.scenario,
+                )
+            else:
+                state.persons, state.government = run_single_year_fused(
+                    ctx=ctx,
+                    persons=state.persons,
+                    government=state.government,
+                    year=year,
+                    scenario=self.scenario,
+                )
+            with ctx.profiler.phase("aggregation"):
+                aggregates = build_aggregates(state.persons, state.government, year)
+        state.generator = ctx.generator
+        state.yearly.append(aggregates)
+        state.next_year = year + 1
+
+    def advance(
+        self,
+        state: SimulationState,
+        stop_year: int,
+        checkpoint_dir: str | Path | None = None,
+        checkpoint_every: int = 1,
+        profiler: Profiler | NullProfiler = NULL_PROFILER,
+        sink: ResultSink | None = None,
+        panel: PanelRecorder | None = None,
+    ) -> SimulationState:
+        """Simulate the years ``state.next_year`` up to, but excluding, ``stop_year``.
+
+        ``profiler`` records every year phase and the draws per distribution name,
+        ``sink`` receives each year's aggregates as soon as they are computed and
+        ``panel`` stores its person sample after every year.
+        """
+        if checkpoint_every <= 0:
+            raise ValueError("checkpoint_every must be positive")
         ctx = SimulationContext(
             income_model=self.income_model,
             wealth_model=self.wealth_model,
             tax_calculator=self.tax_calculator,
             transfer_rule=self.transfer_rule,
-            rng=self.rng,
+            rng=state.rng,
+            generator=state.generator,
+            profiler=profiler,
+            counter=state.streams if isinstance(state.streams, CounterStreams) else None,
         )
-        yearly_results: list[dict[str, float]] = []
-        current_year = self.scenario.start_year
-        for _ in range(self.scenario.years):
-            persons, government = run_single_year(
-                ctx=ctx,
-                persons=persons,
-                government=government,
-                year=current_year,
-                scenario=self.scenario,
+        if self.storage_dir is not None and state.next_year < stop_year:
+            with profiler.phase("storage"):
+                state.persons = self._owned_storage(state.persons)
+        self.distribution_factory.profiler = profiler
+        if isinstance(state.streams, NamedStreams):
+            self.distribution_factory.streams = state.streams
+        try:
+            while state.next_year < stop_year:
+                year = state.next_year
+                with profiler.phase("year", year=year):
+                    self._simulate_year(ctx, state)
+                if sink is not None:
+                    with profiler.phase("sink"):
+                        sink.write(state.yearly[-1])
+                if panel is not None:
+                    with profiler.phase("panel"):
+                        panel.record(state.persons, year)
+                years_done = state.next_year - self.scenario.start_year
+                if checkpoint_dir is not None and years_done % checkpoint_every == 0:
+                    with profiler.phase("checkpoint", year=year):
+                        write_checkpoint(checkpoint_path(checkpoint_dir, year), state)
+        finally:
+            self.distribution_factory.profiler = NULL_PROFILER
+            self.distribution_factory.streams = None
+        self.persons, self.government, self.rng = state.persons, state.government, state.rng
+        self.streams = state.streams
+        return state
+
+    def run_until(self, stop_year: int) -> SimulationState:
+        """Simulate from the start year up to, but excluding, ``stop_year``."""
+        return self.advance(self.start_state(), stop_year)
+
+    def run(
+        self,
+        checkpoint_dir: str | Path | None = None,
+        checkpoint_every: int = 1,
+        resume_from: str | Path | SimulationState | None = None,
+        profile: bool = False,
+        sink: ResultSink | None = None,
+        panel: PanelRecorder | None = None,
+    ) -> SimulationResult:
+        """Simulate every scenario year and collect the yearly aggregates.
+
+        With ``checkpoint_dir`` the state is written every ``checkpoint_every`` years to
+        ``checkpoint_path(checkpoint_dir, year)``. ``resume_from`` continues bit-exactly from
+        such a checkpoint or from an in-memory ``SimulationState``. ``profile`` attaches
+        per-phase timings and counters as ``SimulationResult.profile``. ``sink`` (see
+        ``open_sink``) streams the yearly aggregates and is closed when the run ends.
+        ``panel`` records microdata of a person sample every year.
+        """
+        profiler = Profiler() if profile else NULL_PROFILER
+        try:
+            if resume_from is None:
+                state = self.start_state()
+            elif isinstance(resume_from, SimulationState):
+                state = resume_from
+            else:
+                state = load_checkpoint(resume_from).to_state(self.rng)
+            state = self.advance(
+                state,
+                self.scenario.start_year + self.scenario.years,
+                checkpoint_dir=checkpoint_dir,
+                checkpoint_every=checkpoint_every,
+                profiler=profiler,
+                sink=sink,
+                panel=panel,
             )
-            yearly_results.append(build_aggregates(persons, government, current_year))
-            current_year += 1
+        except BaseException:
+            if sink is not None:
+                # The simulation error matters more than any failure to flush its output.
+                with contextlib.suppress(Exception):
+                    sink.close()
+            raise
+        if sink is not None:
+            sink.close()
         return SimulationResult(
             scenario_name=self.scenario.name,
             start_year=self.scenario.start_year,
             years=self.scenario.years,
-            yearly=yearly_results,
+            yearly=state.yearly,
+            profile=profiler if isinstance(profiler, Profiler) else None,
+        )
+
+    def with_scenario(self, scenario: ScenarioConfig) -> SimulationController:
+        """Controller sharing this one's models but simulating ``scenario``'s policy."""
+        return SimulationController(
+            scenario=scenario,
+            distribution_factory=self.distribution_factory,
+            income_model=self.income_model,
+            wealth_model=self.wealth_model,
+            tax_calculator=replace(self.tax_calculator, config=scenario.tax),
+            transfer_rule=self.transfer_rule,
+            columnar=self.columnar,
+            storage_dir=self.storage_dir,
+            memory_budget=self.memory_budget,
+        )
+
+    def fork_scenarios(
+        self,
+        reform_year: int,
+        variants: dict[str, ScenarioConfig],
+    ) -> dict[str, SimulationResult]:
+        """Simulate the shared prefix once, then every variant from ``reform_year`` on.
+
+        Variants may differ in ``tax``, ``government`` and ``macro`` settings and must share
+        the baseline start year. Each fork continues with the same random draws, and a
+        columnar population is shared copy-on-write until a variant replaces a column.
+        """
+        for name, scenario in variants.items():
+            if scenario.start_year != self.scenario.start_year:
+                raise ValueError(f"Variant '{name}' must share the baseline start year")
+        prefix = self.run_until(reform_year)
+        results: dict[str, SimulationResult] = {}
+        for name, scenario in variants.items():
+            state = prefix.fork()
+            state.government.spending_shares = dict(scenario.government.spending_shares)
+            state.government.deficit_limit = scenario.government.deficit_limit
+            variant = self.with_scenario(scenario)
+            try:
+                results[name] = variant.run(resume_from=state)
+            finally:
+                variant.close()
+        return results
+
+    def run_ensemble(
+        self,
+        n_replications: int,
+        workers: int = 1,
+        seed: int | None = None,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+        antithetic: bool = False,
+        controls: Mapping[str, float | Sequence[float]] | None = None,
+    ) -> EnsembleResult:
+        return run_ensemble(
+            self,
+            n_replications,
+            workers=workers,
+            seed=seed,
+            quantiles=quantiles,
+            antithetic=antithetic,
+            controls=controls,
+        )
+
+    def run_adaptive_ensemble(
+        self,
+        tolerances: Mapping[str, float],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_replications: int = DEFAULT_MAX_REPLICATIONS,
+        max_seconds: float | None = None,
+        workers: int = 1,
+        seed: int | None = None,
+        confidence: float = DEFAULT_CONFIDENCE,
+    ) -> AdaptiveEnsembleResult:
+        return run_adaptive_ensemble(
+            self,
+            tolerances,
+            batch_size=batch_size,
+            max_replications=max_replications,
+            max_seconds=max_seconds,
+            workers=workers,
+            seed=seed,
+            confidence=confidence,
+        )
+
+    def compare_scenarios(
+        self,
+        reform: ScenarioConfig,
+        n_replications: int,
+        workers: int = 1,
+        seed: int | None = None,
+        common_random_numbers: bool = True,
+    ) -> ScenarioComparison:
+        return compare_scenarios(
+            self,
+            reform,
+            n_replications,
+            workers=workers,
+            seed=seed,
+            common_random_numbers=common_random_numbers,
         )
+
+    def run_sweep(
+        self,
+        points: SweepSpec | Sequence[SweepPoint],
+        workers: int = 1,
+        seed: int | None = None,
+    ) -> SweepResult:
+        return run_sweep(self, points, workers=workers, seed=seed)
@@ -0,0 +1,341 @@
+from __future__ import annotations
+
+import copy
+import random
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from wealth_sim_germany.utils.rng import streams_like
+
+if TYPE_CHECKING:
+    from wealth_sim_germany.config.schemas import ScenarioConfig
+    from wealth_sim_germany.simulation.engine import SimulationController
+
+DEFAULT_QUANTILES = (0.05, 0.5, 0.95)
+
+ReplicationTask = tuple[np.random.SeedSequence, bool]
+ReplicationRunner = Callable[[Sequence[ReplicationTask]], list[list[dict[str, float]]]]
+
+_worker_controller: SimulationController | None = None
+
+
+@dataclass
+class EnsembleResult:
+    """Per-year statistics of each indicator across Monte Carlo replications.
+
+    ``mean[indicator]`` and ``variance[indicator]`` hold one value per simulated year and
+    ``quantiles[q][indicator]`` the matching quantile band. ``variance_reduction[method]``
+    holds, per indicator and year, how many times smaller the variance of the mean
+    estimate is than with independent replications (``antithetic``, ``control_variates``).
+    """
+
+    scenario_name: str
+    start_year: int
+    years: int
+    n_replications: int
+    seed: int
+    mean: dict[str, np.ndarray]
+    variance: dict[str, np.ndarray]
+    quantiles: dict[float, dict[str, np.ndarray]]
+    variance_reduction: dict[str, dict[str, np.ndarray]] = field(default_factory=dict)
+
+
+@dataclass
+class ScenarioComparison:
+    """Per-year effect of a reform (reform minus baseline) across paired replications.
+
+    ``variance_reduction[indicator]`` compares the variance of the paired differences
+    with the variance two independent ensembles would give.
+    """
+
+    baseline: str
+    reform: str
+    start_year: int
+    years: int
+    n_replications: int
+    seed: int
+    common_random_numbers: bool
+    mean_difference: dict[str, np.ndarray]
+    variance: dict[str, np.ndarray]
+    variance_reduction: dict[str, np.ndarray]
+
+
+def replication_seeds(seed: int, n_replications: int) -> list[np.random.SeedSequence]:
+    return np.random.SeedSequence(seed).spawn(n_replications)
+
+
+def _children(seed_sequence: np.random.SeedSequence, n: int) -> list[np.random.SeedSequence]:
+    # ``SeedSequence.spawn`` would give different children on every call for the same seed.
+    return [
+        np.random.SeedSequence(
+            seed_sequence.entropy,
+            spawn_key=(*seed_sequence.spawn_key, child),
+            pool_size=seed_sequence.pool_size,
+        )
+        for child in range(n)
+    ]
+
+
+def seed_replica(
+    controller: SimulationController,
+    seed_sequence: np.random.SeedSequence,
+    antithetic: bool = False,
+) -> None:
+    """Seed ``controller`` so that every distribution draws from its own stream.
+
+    Streams keep the kind ``controller`` was configured with (see ``streams_like``).
+    The replica seeded with ``antithetic=True`` mirrors the draws of the plain one.
+    """
+    rng_seed, generator_seed = _children(seed_sequence, 2)
+    seed = int(rng_seed.generate_state(1, np.uint64)[0])
+    controller.rng = random.Random(seed)
+    controller.generator = np.random.default_rng(generator_seed)
+    controller.streams = streams_like(controller.streams, seed, antithetic)
+
+
+def run_replication(
+    controller: SimulationController,
+    seed_sequence: np.random.SeedSequence,
+    antithetic: bool = False,
+) -> list[dict[str, float]]:
+    """Run one replication on a private copy of ``controller`` seeded from ``seed_sequence``."""
+    replica = copy.deepcopy(controller)
+    seed_replica(replica, seed_sequence, antithetic)
+    try:
+        return replica.run().yearly
+    finally:
+        replica.close()
+
+
+def _init_worker(controller: SimulationController) -> None:
+    global _worker_controller
+    _worker_controller = controller
+
+
+def _run_worker_replication(task: ReplicationTask) -> list[dict[str, float]]:
+    if _worker_controller is None:
+        raise RuntimeError("Ensemble worker was not initialised")
+    return run_replication(_worker_controller, *task)
+
+
+def run_replications(
+    controller: SimulationController,
+    seeds: Sequence[np.random.SeedSequence],
+    workers: int = 1,
+    antithetic: bool = False,
+) -> list[list[dict[str, float]]]:
+    """Run one replication per seed, in seed order, optionally over a process pool.
+
+    With ``antithetic`` every seed yields a plain and a mirrored replication, in that
+    order.
+    """
+    mirrors = (False, True) if antithetic else (False,)
+    tasks = [(seed_sequence, mirror) for seed_sequence in seeds for mirror in mirrors]
+    with replication_pool(controller, min(workers, len(tasks))) as run:
+        return run(tasks)
+
+
+@contextmanager
+def replication_pool(controller: SimulationController, workers: int) -> Iterator[ReplicationRunner]:
+    """Runner of ``(seed_sequence, antithetic)`` replication tasks of ``controller``.
+
+    With more than one worker every call reuses the same process pool, each worker
+    holding one copy of ``controller``; otherwise the tasks run in this process. Results
+    come back in task order.
+    """
+    if workers <= 1:
+        yield lambda tasks: [run_replication(controller, *task) for task in tasks]
+        return
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(controller,),
+    ) as executor:
+        yield lambda tasks: list(executor.map(_run_worker_replication, tasks))
+
+
+def stack_replications(
+    replications: Sequence[list[dict[str, float]]],
+) -> tuple[tuple[str, ...], np.ndarray]:
+    """Stack yearly rows into an array of shape (replications, years, indicators)."""
+    indicators = tuple(replications[0][0])
+    values = np.array(
+        [[[row[name] for name in indicators] for row in yearly] for yearly in replications],
+        dtype=float,
+    )
+    return indicators, values
+
+
+def _variance(values: np.ndarray) -> np.ndarray:
+    return values.var(axis=0, ddof=1) if len(values) > 1 else np.zeros(values.shape[1:])
+
+
+def reduction_factor(naive: np.ndarray, reduced: np.ndarray) -> np.ndarray:
+    """``naive / reduced`` variance; infinite when the noise is removed, 1 without noise."""
+    naive = np.asarray(naive, dtype=float)
+    reduced = np.asarray(reduced, dtype=float)
+    factor = np.divide(naive, reduced, out=np.ones_like(naive), where=reduced > 0)
+    return np.where((reduced <= 0) & (naive > 0), np.inf, factor)
+
+
+def control_variate_adjust(
+    values: np.ndarray,
+    indicators: Sequence[str],
+    controls: Mapping[str, float | Sequence[float]],
+) -> np.ndarray:
+    """Replications of shape (replications, years, indicators) adjusted by control variates.
+
+    ``controls`` maps indicators with a known expectation (a scalar or one value per
+    year) to that expectation. Per year, every indicator is regressed on the controls'
+    deviations from their expectations and the fitted part is subtracted, which keeps
+    the mean unbiased and removes the variance the controls explain.
+    """
+    missing = set(controls) - set(indicators)
+    if missing:
+        raise KeyError(f"Unknown control indicators: {sorted(missing)}")
+    if len(values) <= len(controls) + 1:
+        raise ValueError("Control variates need more replications than controls plus one")
+    columns = [indicators.index(name) for name in controls]
+    expected = np.stack(
+        [
+            np.broadcast_to(np.asarray(controls[name], dtype=float), values.shape[1])
+            for name in controls
+        ],
+        axis=1,
+    )
+    deviations = values[:, :, columns] - expected
+    centred = deviations - deviations.mean(axis=0)
+    adjusted = np.empty_like(values)
+    for year in range(values.shape[1]):
+        response = values[:, year] - values[:, year].mean(axis=0)
+        beta = np.linalg.lstsq(centred[:, year], response, rcond=None)[0]
+        adjusted[:, year] = values[:, year] - deviations[:, year] @ beta
+    return adjusted
+
+
+def run_ensemble(
+    controller: SimulationController,
+    n_replications: int,
+    workers: int = 1,
+    seed: int | None = None,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    antithetic: bool = False,
+    controls: Mapping[str, float | Sequence[float]] | None = None,
+) -> EnsembleResult:
+    """Run independent replications of ``controller`` and summarise them per year.
+
+    Child seeds are spawned from ``seed`` and results are combined in replication order,
+    so the result does not depend on ``workers``. Each replication starts from a copy of
+    the controller's current population and government.
+
+    ``antithetic`` runs the replications as pairs whose draws mirror each other and
+    averages within each pair; ``controls`` (see ``control_variate_adjust``) corrects the
+    mean for the observed deviation of indicators with known expectations. Quantiles and
+    ``variance`` always describe the individual replications.
+    """
+    if n_replications <= 0:
+        raise ValueError("n_replications must be positive")
+    if antithetic and n_replications % 2:
+        raise ValueError("Antithetic ensembles need an even number of replications")
+    if seed is None:
+        seed = controller.rng.getrandbits(128)
+    n_seeds = n_replications // 2 if antithetic else n_replications
+    replications = run_replications(
+        controller, replication_seeds(seed, n_seeds), workers, antithetic=antithetic
+    )
+    indicators, values = stack_replications(replications)
+    variance = _variance(values)
+    bands = np.quantile(values, list(quantiles), axis=0)
+    units = values
+    reductions: dict[str, np.ndarray] = {}
+    if antithetic:
+        units = values.reshape(n_seeds, 2, *values.shape[1:]).mean(axis=1)
+        reductions["antithetic"] = reduction_factor(variance, 2 * _variance(units))
+    if controls:
+        adjusted = control_variate_adjust(units, indicators, controls)
+        reductions["control_variates"] = reduction_factor(_variance(units), _variance(adjusted))
+        units = adjusted
+    estimate = units.mean(axis=0)
+    return EnsembleResult(
+        scenario_name=controller.scenario.name,
+        start_year=controller.scenario.start_year,
+        years=controller.scenario.years,
+        n_replications=n_replications,
+        seed=seed,
+        mean={name: estimate[:, idx] for idx, name in enumerate(indicators)},
+        variance={name: variance[:, idx] for idx, name in enumerate(indicators)},
+        quantiles={
+            float(q): {name: bands[q_idx, :, idx] for idx, name in enumerate(indicators)}
+            for q_idx, q in enumerate(quantiles)
+        },
+        variance_reduction={
+            method: {name: factor[:, idx] for idx, name in enumerate(indicators)}
+            for method, factor in reductions.items()
+        },
+    )
+
+
+def _reform_controller(
+    controller: SimulationController, reform: ScenarioConfig
+) -> SimulationController:
+    reformed = controller.with_scenario(reform)
+    reformed.persons = controller.persons
+    if controller.government is not None:
+        reformed.government = copy.deepcopy(controller.government)
+        reformed.government.spending_shares = dict(reform.government.spending_shares)
+        reformed.government.deficit_limit = reform.government.deficit_limit
+    return reformed
+
+
+def compare_scenarios(
+    controller: SimulationController,
+    reform: ScenarioConfig,
+    n_replications: int,
+    workers: int = 1,
+    seed: int | None = None,
+    common_random_numbers: bool = True,
+) -> ScenarioComparison:
+    """Estimate the effect of ``reform`` against ``controller``'s scenario.
+
+    Replication ``i`` of the reform reuses the seed of baseline replication ``i`` when
+    ``common_random_numbers`` is set, so both see the same draws per person and
+    distribution name and the noise largely cancels in their difference. Without it the
+    reform runs on independent seeds.
+    """
+    if n_replications <= 1:
+        raise ValueError("Comparisons need at least two replications")
+    if (
+        reform.start_year != controller.scenario.start_year
+        or reform.years != controller.scenario.years
+    ):
+        raise ValueError("The reform must simulate the same years as the baseline")
+    if seed is None:
+        seed = controller.rng.getrandbits(128)
+    seeds = replication_seeds(seed, 2 * n_replications)
+    baseline_seeds = seeds[:n_replications]
+    reform_seeds = baseline_seeds if common_random_numbers else seeds[n_replications:]
+    indicators, baseline = stack_replications(run_replications(controller, baseline_seeds, workers))
+    _, reformed = stack_replications(
+        run_replications(_reform_controller(controller, reform), reform_seeds, workers)
+    )
+    difference = reformed - baseline
+    variance = _variance(difference)
+    factor = reduction_factor(_variance(baseline) + _variance(reformed), variance)
+    mean = difference.mean(axis=0)
+    return ScenarioComparison(
+        baseline=controller.scenario.name,
+        reform=reform.name,
+        start_year=controller.scenario.start_year,
+        years=controller.scenario.years,
+        n_replications=n_replications,
+        seed=seed,
+        common_random_numbers=common_random_numbers,
+        mean_difference={name: mean[:, idx] for idx, name in enumerate(indicators)},
+        variance={name: variance[:, idx] for idx, name in enumerate(indicators)},
+        variance_reduction={name: factor[:, idx] for idx, name in enumerate(indicators)},
+    )
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from wealth_sim_germany.data.cells import EDUCATION_LEVELS, REGIONS, SEXES
+from wealth_sim_germany.models.person import Person
+from wealth_sim_germany.models.population import COLUMN_DTYPES, Population
+
+META_FILE = "panel.json"
+SAMPLE_DIR = "sample"
+DEFAULT_PANEL_COLUMNS = (
+    "labor_income",
+    "capital_income",
+    "transfers",
+    "taxes",
+    "social_contrib",
+    "net_income",
+    "net_wealth",
+)
+STRATUM_LEVELS: dict[str, tuple] = {
+    "sex": SEXES,
+    "education": EDUCATION_LEVELS,
+    "region": REGIONS,
+}
+
+
+@dataclass(frozen=True)
+class PanelSpec:
+    """Which persons and columns a ``PanelRecorder`` follows.
+
+    ``fraction`` of every stratum (each combination of the ``strata`` fields) is drawn
+    without replacement, at least one person per non-empty stratum. The draw uses its
+    own generator seeded by ``seed``, so recording never changes the simulation.
+    """
+
+    fraction: float = 0.01
+    columns: tuple[str, ...] = DEFAULT_PANEL_COLUMNS
+    strata: tuple[str, ...] = ("sex", "education", "region")
+    seed: int = 0
+    chunk_size: int = 1 << 20
+
+    def __post_init__(self) -> None:
+        if not 0 < self.fraction <= 1:
+            raise ValueError("fraction must be in (0, 1]")
+        unknown = set(self.strata) - set(STRATUM_LEVELS)
+        if unknown:
+            raise ValueError(f"Unsupported strata fields: {sorted(unknown)}")
+
+
+def _stratum_codes(
+    persons: list[Person] | Population,
+    strata: tuple[str, ...],
+    start: int,
+    stop: int,
+) -> np.ndarray:
+    shape = tuple(len(STRATUM_LEVELS[name]) for name in strata)
+    if isinstance(persons, Population):
+        codes = [np.asarray(getattr(persons, name)[start:stop], dtype=np.intp) for name in strata]
+    else:
+        lookups = {
+            name: {level: code for code, level in enumerate(STRATUM_LEVELS[name])}
+            for name in strata
+        }
+        codes = [
+            np.fromiter(
+                (lookups[name][getattr(person, name)] for person in persons[start:stop]),
+                dtype=np.intp,
+                count=stop - start,
+            )
+            for name in strata
+        ]
+    if not codes:
+        return np.zeros(stop - start, dtype=np.intp)
+    return np.ravel_multi_index(codes, shape)
+
+
+def stratified_sample(
+    persons: list[Person] | Population,
+    spec: PanelSpec,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Sorted row indices of the panel sample and their design weights.
+
+    Two passes of ``spec.chunk_size`` rows: the first counts every stratum, the second
+    maps each person's rank within its stratum onto the ranks chosen for that stratum.
+    Only one byte per person is held beyond the current chunk.
+    """
+    size = len(persons)
+    n_strata = math.prod(len(STRATUM_LEVELS[name]) for name in spec.strata)
+    counts = np.zeros(n_strata, dtype=np.int64)
+    for start in range(0, size, spec.chunk_size):
+        stop = min(size, start + spec.chunk_size)
+        codes = _stratum_codes(persons, spec.strata, start, stop)
+        counts += np.bincount(codes, minlength=n_strata)
+
+    generator = np.random.default_rng(spec.seed)
+    sampled = np.where(counts > 0, np.maximum(np.rint(counts * spec.fraction), 1), 0)
+    offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    chosen = np.zeros(size, dtype=bool)
+    for stratum in np.flatnonzero(sampled).tolist():
+        ranks = generator.choice(int(counts[stratum]), int(sampled[stratum]), replace=False)
+        chosen[offsets[stratum] + ranks] = True
+
+    seen = np.zeros(n_strata, dtype=np.int64)
+    selected: list[np.ndarray] = []
+    selected_strata: list[np.ndarray] = []
+    for start in range(0, size, spec.chunk_size):
+        stop = min(size, start + spec.chunk_size)
+        codes = _stratum_codes(persons, spec.strata, start, stop)
+        order = np.argsort(codes, kind="stable")
+        chunk_counts = np.bincount(codes, minlength=n_strata)
+        group_starts = np.concatenate([[0], np.cumsum(chunk_counts)[:-1]])
+        sorted_codes = codes[order]
+        ranks = np.empty(len(codes), dtype=np.int64)
+        ranks[order] = np.arange(len(codes)) - group_starts[sorted_codes] + seen[sorted_codes]
+        rows = np.flatnonzero(chosen[offsets[codes] + ranks])
+        selected.append(start + rows)
+        selected_strata.append(codes[rows])
+        seen += chunk_counts
+
+    if not selected:
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+    strata = np.concatenate(selected_strata)
+    return np.concatenate(selected), counts[strata] / sampled[strata]
+
+
+def _take(
+    persons: list[Person] | Population,
+    index: np.ndarray,
+    columns: tuple[str, ...],
+) -> dict[str, np.ndarray]:
+    """Values of ``columns`` for the rows in ``index``; enum fields come back as codes."""
+    if isinstance(persons, Population):
+        return {name: np.asarray(getattr(persons, name)[index]) for name in columns}
+    rows = [persons[i] for i in index.tolist()]
+    values: dict[str, np.ndarray] = {}
+    for name in columns:
+        if name in STRATUM_LEVELS:
+            lookup = {level: code for code, level in enumerate(STRATUM_LEVELS[name])}
+            values[name] = np.array([lookup[getattr(row, name)] for row in rows], dtype=np.int8)
+        else:
+            values[name] = np.array([getattr(row, name) for row in rows], dtype=COLUMN_DTYPES[name])
+    return values
+
+
+class PanelRecorder:
+    """Writes the ``spec`` columns of a fixed person sample to ``directory`` every year.
+
+    The sample is drawn from the first population recorded. Each year becomes a
+    ``year-<year>`` directory with one ``.npy`` file per column, so readers can
+    memory-map single years without touching the rest of the panel.
+    """
+
+    def __init__(self, directory: str | Path, spec: PanelSpec | None = None) -> None:
+        self.directory = Path(directory)
+        self.spec = spec or PanelSpec()
+        self.index: np.ndarray | None = None
+        self.years: list[int] = []
+
+    def record(self, persons: list[Person] | Population, year: int) -> None:
+        if self.index is None:
+            self._select(persons)
+        assert self.index is not None
+        year_dir = self.directory / f"year-{year}"
+        year_dir.mkdir(parents=True, exist_ok=True)
+        for name, values in _take(persons, self.index, self.spec.columns).items():
+            np.save(year_dir / f"{name}.npy", values)
+        self.years.append(year)
+        self._write_meta()
+
+    def _select(self, persons: list[Person] | Population) -> None:
+        self.index, design_weight = stratified_sample(persons, self.spec)
+        sample_dir = self.directory / SAMPLE_DIR
+        sample_dir.mkdir(parents=True, exist_ok=True)
+        np.save(sample_dir / "index.npy", self.index)
+        np.save(sample_dir / "design_weight.npy", design_weight)
+        demographics = _take(persons, self.index, ("age", *STRATUM_LEVELS, "weight"))
+        for name, values in demographics.items():
+            np.save(sample_dir / f"{name}.npy", values)
+
+    def _write_meta(self) -> None:
+        meta = {
+            "fraction": self.spec.fraction,
+            "strata": list(self.spec.strata),
+            "columns": list(self.spec.columns),
+            "years": self.years,
+        }
+        staging = self.directory / f".{META_FILE}.tmp"
+        staging.write_text(json.dumps(meta))
+        staging.replace(self.directory / META_FILE)
+
+
+class PanelReader:
+    """Lazy, memory-mapped access to a panel written by ``PanelRecorder``."""
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+        meta = json.loads((self.directory / META_FILE).read_text())
+        self.fraction: float = meta["fraction"]
+        self.strata: tuple[str, ...] = tuple(meta["strata"])
+        self.columns: tuple[str, ...] = tuple(meta["columns"])
+        self.years: tuple[int, ...] = tuple(meta["years"])
+
+    def __len__(self) -> int:
+        return len(self.sample("index"))
+
+    def sample(self, name: str) -> np.ndarray:
+        """Per-person sample column: ``index``, ``design_weight``, demographics or ``weight``."""
+        return np.load(self.directory / SAMPLE_DIR / f"{name}.npy", mmap_mode="r")
+
+    def year(self, name: str, year: int) -> np.ndarray:
+        if name not in self.columns:
+            raise KeyError(f"Column '{name}' was not recorded")
+        if year not in self.years:
+            raise KeyError(f"Year {year} was not recorded")
+        return np.load(self.directory / f"year-{year}" / f"{name}.npy", mmap_mode="r")
+
+    def trajectories(self, name: str) -> np.ndarray:
+        """``name`` for every sampled person and year, shaped (persons, years)."""
+        return np.stack([self.year(name, year) for year in self.years], axis=1)
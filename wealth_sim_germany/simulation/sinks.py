@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import abc
+import csv
+import importlib
+import queue
+import threading
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Protocol
+
+import numpy as np
+
+DEFAULT_BUFFER_ROWS = 256
+DEFAULT_QUEUE_SIZE = 1_024
+
+pyarrow_module: Any | None
+parquet_module: Any | None
+
+try:
+    pyarrow_module = importlib.import_module("pyarrow")
+    parquet_module = importlib.import_module("pyarrow.parquet")
+except ModuleNotFoundError:  # pragma: no cover - fallback when pyarrow isn't installed
+    pyarrow_module = None
+    parquet_module = None
+
+
+class ResultSink(Protocol):
+    """Receives each year's aggregates as soon as they are computed."""
+
+    def write(self, row: Mapping[str, float]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+def rows_to_arrays(rows: Sequence[Mapping[str, float]]) -> dict[str, np.ndarray]:
+    """Columnar view of yearly rows: one array per indicator, in row order."""
+    if not rows:
+        return {}
+    return {name: np.array([row[name] for row in rows]) for name in rows[0]}
+
+
+class _BufferedSink(abc.ABC):
+    def __init__(self, buffer_rows: int) -> None:
+        self.buffer_rows = buffer_rows
+        self._rows: list[Mapping[str, float]] = []
+
+    def write(self, row: Mapping[str, float]) -> None:
+        self._rows.append(row)
+        if len(self._rows) >= self.buffer_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._rows:
+            self._write_rows(self._rows)
+            self._rows = []
+
+    def close(self) -> None:
+        self.flush()
+
+    @abc.abstractmethod
+    def _write_rows(self, rows: list[Mapping[str, float]]) -> None: ...
+
+
+class CSVSink(_BufferedSink):
+    """Appends rows to a CSV file, writing the header with the first batch."""
+
+    def __init__(self, path: str | Path, buffer_rows: int = DEFAULT_BUFFER_ROWS) -> None:
+        super().__init__(buffer_rows)
+        self.path = Path(path)
+        self._file = self.path.open("w", newline="")
+        self._writer: csv.DictWriter | None = None
+
+    def _write_rows(self, rows: list[Mapping[str, float]]) -> None:
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, fieldnames=list(rows[0]))
+            self._writer.writeheader()
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def close(self) -> None:
+        super().close()
+        self._file.close()
+
+
+class NPZSink(_BufferedSink):
+    """Collects rows into per-indicator arrays saved as one ``.npz`` archive on ``close``.
+
+    The archive format cannot be appended to, so rows are only held as arrays until then.
+    """
+
+    def __init__(self, path: str | Path, buffer_rows: int = DEFAULT_BUFFER_ROWS) -> None:
+        super().__init__(buffer_rows)
+        self.path = Path(path)
+        self._blocks: list[dict[str, np.ndarray]] = []
+
+    def _write_rows(self, rows: list[Mapping[str, float]]) -> None:
+        self._blocks.append(rows_to_arrays(rows))
+
+    def close(self) -> None:
+        super().close()
+        columns = list(self._blocks[0]) if self._blocks else []
+        arrays: dict[str, Any] = {
+            name: np.concatenate([block[name] for block in self._blocks]) for name in columns
+        }
+        np.savez(self.path, **arrays)
+
+
+class ParquetSink(_BufferedSink):
+    """Writes every buffered batch as a Parquet row group; requires ``pyarrow``."""
+
+    def __init__(self, path: str | Path, buffer_rows: int = DEFAULT_BUFFER_ROWS) -> None:
+        if pyarrow_module is None or parquet_module is None:
+            raise ModuleNotFoundError("ParquetSink requires the optional pyarrow package")
+        super().__init__(buffer_rows)
+        self.path = Path(path)
+        self._writer: Any | None = None
+
+    def _write_rows(self, rows: list[Mapping[str, float]]) -> None:
+        assert pyarrow_module is not None and parquet_module is not None
+        table = pyarrow_module.table(rows_to_arrays(rows))
+        if self._writer is None:
+            self._writer = parquet_module.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        super().close()
+        if self._writer is not None:
+            self._writer.close()
+
+
+class BackgroundSink:
+    """Forwards rows to ``sink`` on a writer thread so the simulation never waits on I/O.
+
+    ``write`` only blocks once ``max_queued`` rows are pending. An error raised by the
+    wrapped sink is re-raised by the next ``write`` or by ``close``.
+    """
+
+    def __init__(self, sink: ResultSink, max_queued: int = DEFAULT_QUEUE_SIZE) -> None:
+        self.sink = sink
+        self._queue: queue.Queue[Mapping[str, float] | None] = queue.Queue(max_queued)
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._drain, name="result-sink", daemon=True)
+        self._thread.start()
+
+    def write(self, row: Mapping[str, float]) -> None:
+        self._raise_error()
+        self._queue.put(dict(row))
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+        self._raise_error()
+
+    def _drain(self) -> None:
+        while True:
+            row = self._queue.get()
+            if row is None:
+                break
+            if self._error is None:
+                try:
+                    self.sink.write(row)
+                except BaseException as error:  # re-raised on the simulation thread
+                    self._error = error
+        try:
+            self.sink.close()
+        except BaseException as error:
+            self._error = self._error or error
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+
+SINK_TYPES: dict[str, type[CSVSink] | type[NPZSink] | type[ParquetSink]] = {
+    ".csv": CSVSink,
+    ".npz": NPZSink,
+    ".parquet": ParquetSink,
+}
+
+
+def open_sink(path: str | Path, background: bool = True) -> ResultSink:
+    """Sink for ``path`` chosen by its suffix, running on a writer thread by default."""
+    suffix = Path(path).suffix.lower()
+    if suffix not in SINK_TYPES:
+        raise ValueError(f"No result sink for '{suffix}' files; use one of {sorted(SINK_TYPES)}")
+    sink = SINK_TYPES[suffix](path)
+    return BackgroundSink(sink) if background else sink
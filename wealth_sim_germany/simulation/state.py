@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import copy
+import random
+from dataclasses import dataclass
+
+import numpy as np
+
+from wealth_sim_germany.models.government import Government
+from wealth_sim_germany.models.person import Person
+from wealth_sim_germany.models.population import Population
+from wealth_sim_germany.utils.rng import CounterStreams, NamedStreams
+
+
+@dataclass
+class SimulationState:
+    """Everything a run needs to continue from ``next_year``."""
+
+    next_year: int
+    persons: list[Person] | Population
+    government: Government
+    rng: random.Random
+    generator: np.random.Generator | None
+    yearly: list[dict[str, float]]
+    streams: NamedStreams | CounterStreams | None = None
+
+    def fork(self) -> SimulationState:
+        """Independent copy of the state that continues with identical random draws.
+
+        A ``Population`` is forked copy-on-write; person lists are deep-copied.
+        """
+        rng = random.Random()
+        rng.setstate(self.rng.getstate())
+        if isinstance(self.persons, Population):
+            persons: list[Person] | Population = self.persons.fork()
+        else:
+            persons = copy.deepcopy(self.persons)
+        return SimulationState(
+            next_year=self.next_year,
+            persons=persons,
+            government=copy.deepcopy(self.government),
+            rng=rng,
+            generator=copy.deepcopy(self.generator),
+            yearly=[dict(row) for row in self.yearly],
+            streams=None if self.streams is None else self.streams.fork(),
+        )
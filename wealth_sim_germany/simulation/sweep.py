@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import copy
+import random
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from wealth_sim_germany.config.schemas import ConfigError, ScenarioConfig
+from wealth_sim_germany.config.sweep import SweepPoint, SweepSpec
+from wealth_sim_germany.models.person import Person
+from wealth_sim_germany.models.population import Population
+from wealth_sim_germany.simulation.ensemble import stack_replications
+from wealth_sim_germany.utils.rng import streams_like
+
+if TYPE_CHECKING:
+    from wealth_sim_germany.simulation.engine import SimulationController
+
+_worker_controller: SimulationController | None = None
+_worker_population: list[Person] | Population | None = None
+
+
+@dataclass
+class SweepResult:
+    """Yearly indicators of every sweep point, stacked as (point, year, indicator)."""
+
+    points: list[dict[str, Any]]
+    indicators: tuple[str, ...]
+    years: np.ndarray
+    values: np.ndarray
+    seed: int
+
+    def indicator(self, name: str) -> np.ndarray:
+        """``name`` for every point and year, shaped (points, years)."""
+        return self.values[:, :, self.indicators.index(name)]
+
+
+def run_point(
+    controller: SimulationController,
+    population: list[Person] | Population,
+    scenario: ScenarioConfig,
+    seed: int,
+) -> list[dict[str, float]]:
+    """Simulate ``scenario`` with ``controller``'s models on a private copy of ``population``."""
+    point = controller.with_scenario(scenario)
+    point.persons = (
+        population.fork() if isinstance(population, Population) else copy.deepcopy(population)
+    )
+    point.rng = random.Random(seed)
+    point.streams = streams_like(controller.streams, seed)
+    try:
+        return point.run().yearly
+    finally:
+        point.close()
+
+
+def _init_worker(controller: SimulationController, population: list[Person] | Population) -> None:
+    global _worker_controller, _worker_population
+    _worker_controller = controller
+    _worker_population = population
+
+
+def _run_worker_point(task: tuple[ScenarioConfig, int]) -> list[dict[str, float]]:
+    if _worker_controller is None or _worker_population is None:
+        raise RuntimeError("Sweep worker was not initialised")
+    scenario, seed = task
+    return run_point(_worker_controller, _worker_population, scenario, seed)
+
+
+def _check_compatible(points: Sequence[SweepPoint]) -> None:
+    first = points[0].scenario
+    for number, point in enumerate(points):
+        scenario = point.scenario
+        if (scenario.start_year, scenario.years) != (first.start_year, first.years):
+            raise ConfigError(f"Sweep point {number} changes the simulated years")
+        if scenario.population != first.population:
+            raise ConfigError(f"Sweep point {number} changes the shared population")
+
+
+def run_sweep(
+    controller: SimulationController,
+    points: SweepSpec | Sequence[SweepPoint],
+    workers: int = 1,
+    seed: int | None = None,
+) -> SweepResult:
+    """Run every sweep point with ``controller``'s models, optionally over a process pool.
+
+    The population is built once (or taken from ``controller.persons``) and every point
+    starts from a copy of it. All points draw from streams seeded with ``seed``, of the
+    kind ``controller`` uses, so they see common random numbers and differ only through
+    their parameters; results do not depend on ``workers``.
+    """
+    if isinstance(points, SweepSpec):
+        points = points.expand()
+    if not points:
+        raise ValueError("A sweep needs at least one point")
+    _check_compatible(points)
+    if seed is None:
+        seed = controller.rng.getrandbits(64)
+    builder = controller.with_scenario(points[0].scenario)
+    population = controller.persons
+    if population is None:
+        population, _ = builder.initialise()
+    tasks = [(point.scenario, seed) for point in points]
+    try:
+        if workers <= 1 or len(tasks) <= 1:
+            runs = [
+                run_point(controller, population, scenario, task_seed)
+                for scenario, task_seed in tasks
+            ]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(tasks)),
+                initializer=_init_worker,
+                initargs=(controller, population),
+            ) as executor:
+                runs = list(executor.map(_run_worker_point, tasks))
+    finally:
+        builder.close()
+    indicators, values = stack_replications(runs)
+    first = points[0].scenario
+    return SweepResult(
+        points=[point.values for point in points],
+        indicators=indicators,
+        years=np.arange(first.start_year, first.start_year + first.years),
+        values=values,
+        seed=seed,
+    )
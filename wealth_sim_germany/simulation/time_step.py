@@ -1,14 +1,36 @@
 from __future__ import annotations
 
 import random
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+import numpy as np
+
+from wealth_sim_germany.analysis.aggregations import AggregateAccumulator
+from wealth_sim_germany.analysis.sketch import DEFAULT_COMPRESSION
 from wealth_sim_germany.config.schemas import ScenarioConfig
+from wealth_sim_germany.data.cells import DemographicCells
 from wealth_sim_germany.models.government import Government, TransferRule
 from wealth_sim_germany.models.income import IncomeModel
 from wealth_sim_germany.models.person import Person
+from wealth_sim_germany.models.population import ROW_BYTES, STATE_FIELDS, Population
 from wealth_sim_germany.models.tax import TaxCalculator
 from wealth_sim_germany.models.wealth import WealthModel
+from wealth_sim_germany.utils.profiling import NULL_PROFILER, NullProfiler, Profiler
+from wealth_sim_germany.utils.rng import CounterStreams
+
+DEFAULT_MEMORY_BUDGET = 1 << 30
+# Peak working memory of a chunked year relative to the chunk's raw column bytes: the
+# chunk's replaced columns plus the sampling and tax temporaries alive at the same time.
+CHUNK_WORKING_SET = 4
+# Fixed allowance for the aggregate sketch and other per-year state.
+CHUNK_OVERHEAD = 1 << 21
+
+
+def chunk_size_for_budget(memory_budget: int) -> int:
+    """Rows per chunk that keep a chunked year within ``memory_budget`` bytes."""
+    if memory_budget <= 0:
+        raise ValueError("memory_budget must be positive")
+    return max(1, (memory_budget - CHUNK_OVERHEAD) // (ROW_BYTES * CHUNK_WORKING_SET))
 
 
 @dataclass
@@ -18,6 +40,43 @@ class SimulationContext:
     tax_calculator: TaxCalculator
     transfer_rule: TransferRule
     rng: random.Random
+    generator: np.random.Generator | None = None
+    profiler: Profiler | NullProfiler = NULL_PROFILER
+    counter: CounterStreams | None = None
+    _person_rngs: dict[tuple[int, int], random.Random] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def numpy_generator(self) -> np.random.Generator:
+        if self.generator is None:
+            self.generator = np.random.default_rng(self.rng.getrandbits(64))
+        return self.generator
+
+    def rows_generator(self, year: int, start: int, size: int) -> np.random.Generator:
+        """Generator for population rows ``start`` to ``start + size`` in ``year``.
+
+        With ``counter`` streams the draws depend only on the rows, not on how the
+        population is chunked; otherwise this is the shared ``numpy_generator``.
+        """
+        if self.counter is None:
+            return self.numpy_generator()
+        return self.counter.generator(year, np.arange(start, start + size))
+
+    def person_rng(self, year: int, index: int) -> random.Random:
+        """Scalar stream for person ``index`` in ``year``; the shared ``rng`` by default.
+
+        Counter streams are kept for the rest of the year, so every phase continues the
+        person's draws from each distribution.
+        """
+        if self.counter is None:
+            return self.rng
+        key = (year, index)
+        rng = self._person_rngs.get(key)
+        if rng is None:
+            if self._person_rngs and next(iter(self._person_rngs))[0] != year:
+                self._person_rngs.clear()
+            rng = self._person_rngs[key] = self.counter.rng(year, index)
+        return rng
 
 
 def run_single_year(
@@ -27,29 +86,219 @@ def run_single_year(
     year: int,
     scenario: ScenarioConfig,
 ) -> tuple[list[Person], Government]:
-    for person in persons:
-        ctx.income_model.sample_labor_income(person, ctx.rng)
-        ctx.income_model.sample_capital_income(person, ctx.rng)
-        person.compute_total_gross_income()
-
-    for person in persons:
-        tax_result = ctx.tax_calculator.compute_all_taxes(person)
-        person.apply_tax_result(
+    profiler = ctx.profiler
+    profiler.count("persons", len(persons))
+    with profiler.phase("income"):
+        for index, person in enumerate(persons):
+            rng = ctx.person_rng(year, index)
+            ctx.income_model.sample_labor_income(person, rng)
+            ctx.income_model.sample_capital_income(person, rng)
+            person.compute_total_gross_income()
+
+    with profiler.phase("taxes"):
+        for person in persons:
+            tax_result = ctx.tax_calculator.compute_all_taxes(person, year)
+            person.apply_tax_result(
+                income_tax=tax_result.income_tax,
+                social_contrib=tax_result.social_contrib,
+                capital_tax=tax_result.capital_tax,
+            )
+
+    with profiler.phase("revenue"):
+        government.collect_taxes_from_population(persons)
+        government.allocate_expenditure()
+
+    with profiler.phase("transfers"):
+        government.pay_transfers(persons, ctx.transfer_rule)
+        for person in persons:
+            person.compute_total_gross_income()
+            person.net_income = person.total_income - person.taxes - person.social_contrib
+
+    with profiler.phase("wealth"):
+        for index, person in enumerate(persons):
+            ctx.wealth_model.evolve_wealth(person, ctx.person_rng(year, index), scenario.macro)
+
+    with profiler.phase("fiscal_rules"):
+        government.apply_fiscal_rules()
+    return persons, government
+
+
+def run_single_year_fused(
+    ctx: SimulationContext,
+    persons: list[Person],
+    government: Government,
+    year: int,
+    scenario: ScenarioConfig,
+) -> tuple[list[Person], Government]:
+    """``run_single_year`` with one pass over ``persons`` per dependency barrier.
+
+    The first pass samples income, taxes it and sums the revenue; the government then
+    books the revenue and allocates spending, which transfer rules may read; the second
+    pass pays transfers, settles net income and evolves wealth. Gross income is computed
+    once per pass. Draws happen in the same order as in ``run_single_year``, so both
+    kernels give the same results.
+    """
+    profiler = ctx.profiler
+    profiler.count("persons", len(persons))
+    income_model = ctx.income_model
+    tax_calculator = ctx.tax_calculator
+    tax_revenue = 0.0
+    social_contributions = 0.0
+    with profiler.phase("income_and_taxes"):
+        for index, person in enumerate(persons):
+            rng = ctx.person_rng(year, index)
+            income_model.sample_labor_income(person, rng)
+            income_model.sample_capital_income(person, rng)
+            gross_income = person.compute_total_gross_income()
+            tax_result = tax_calculator.compute_taxes(gross_income, person.capital_income, year)
+            person.apply_tax_result(
+                income_tax=tax_result.income_tax,
+                social_contrib=tax_result.social_contrib,
+                capital_tax=tax_result.capital_tax,
+            )
+            tax_revenue += person.taxes
+            social_contributions += person.social_contrib
+
+    # Barrier: transfers may depend on the government's revenue and spending.
+    with profiler.phase("revenue"):
+        government.record_revenue(tax_revenue, social_contributions)
+        government.allocate_expenditure()
+
+    transfer_rule = ctx.transfer_rule
+    wealth_model = ctx.wealth_model
+    with profiler.phase("transfers_and_wealth"):
+        for index, person in enumerate(persons):
+            government.pay_transfer(person, transfer_rule)
+            person.net_income = (
+                person.compute_total_gross_income() - person.taxes - person.social_contrib
+            )
+            wealth_model.evolve_wealth(person, ctx.person_rng(year, index), scenario.macro)
+
+    with profiler.phase("fiscal_rules"):
+        government.apply_fiscal_rules()
+    return persons, government
+
+
+def _earn_and_pay_taxes(
+    ctx: SimulationContext,
+    population: Population,
+    cells: DemographicCells,
+    year: int,
+    start: int = 0,
+) -> None:
+    generator = ctx.rows_generator(year, start, len(population))
+    with ctx.profiler.phase("income"):
+        ctx.income_model.sample_labor_income_batch(population, generator, cells)
+        ctx.income_model.sample_capital_income_batch(population, generator, cells)
+    with ctx.profiler.phase("taxes"):
+        tax_result = ctx.tax_calculator.compute_all_taxes_batch(
+            population.labor_income,
+            population.capital_income,
+            population.transfers,
+            year,
+        )
+        population.total_income = tax_result.gross_income
+        population.apply_tax_result(
             income_tax=tax_result.income_tax,
             social_contrib=tax_result.social_contrib,
             capital_tax=tax_result.capital_tax,
         )
 
-    government.collect_taxes_from_population(persons)
-    government.allocate_expenditure()
 
-    government.pay_transfers(persons, ctx.transfer_rule)
-    for person in persons:
-        person.compute_total_gross_income()
-        person.net_income = person.total_income - person.taxes - person.social_contrib
+def _receive_transfers_and_save(
+    ctx: SimulationContext,
+    population: Population,
+    cells: DemographicCells,
+    government: Government,
+    scenario: ScenarioConfig,
+    year: int,
+    start: int = 0,
+) -> None:
+    with ctx.profiler.phase("transfers"):
+        government.pay_transfers(population, ctx.transfer_rule)
+        population.compute_total_gross_income()
+        population.net_income = (
+            population.total_income - population.taxes - population.social_contrib
+        )
+    with ctx.profiler.phase("wealth"):
+        ctx.wealth_model.evolve_wealth_batch(
+            population, ctx.rows_generator(year, start, len(population)), scenario.macro, cells
+        )
 
-    for person in persons:
-        ctx.wealth_model.evolve_wealth(person, ctx.rng, scenario.macro)
 
-    government.apply_fiscal_rules()
-    return persons, government
+def _cells(ctx: SimulationContext, population: Population) -> DemographicCells:
+    with ctx.profiler.phase("cells"):
+        return population.cells()
+
+
+def run_single_year_columnar(
+    ctx: SimulationContext,
+    population: Population,
+    government: Government,
+    year: int,
+    scenario: ScenarioConfig,
+) -> tuple[Population, Government]:
+    """Columnar counterpart of ``run_single_year`` operating on whole population arrays."""
+    ctx.profiler.count("persons", len(population))
+    cells = _cells(ctx, population)
+    _earn_and_pay_taxes(ctx, population, cells, year)
+
+    with ctx.profiler.phase("revenue"):
+        government.collect_taxes_from_population(population)
+        government.allocate_expenditure()
+
+    _receive_transfers_and_save(ctx, population, cells, government, scenario, year)
+
+    with ctx.profiler.phase("fiscal_rules"):
+        government.apply_fiscal_rules()
+    return population, government
+
+
+def run_single_year_chunked(
+    ctx: SimulationContext,
+    population: Population,
+    government: Government,
+    year: int,
+    scenario: ScenarioConfig,
+    chunk_size: int,
+    sketch_compression: int = DEFAULT_COMPRESSION,
+) -> tuple[Population, Government, dict[str, float]]:
+    """``run_single_year_columnar`` over ``chunk_size``-row blocks of ``population``.
+
+    Results are written back into ``population``'s columns in place, so they must be
+    owned by the caller (typically memory-mapped via ``Population.open_memmap``). Each
+    phase makes one pass over the chunks; revenue is summed across chunks before the
+    government allocates spending, and the year's aggregates are reduced during the
+    last pass. They are returned because evaluating ``build_aggregates`` on the whole
+    population would defeat the memory bound.
+    """
+    profiler = ctx.profiler
+    profiler.count("persons", len(population))
+    tax_revenue = 0.0
+    social_contributions = 0.0
+    for start, chunk in population.chunks(chunk_size):
+        profiler.count("chunks")
+        _earn_and_pay_taxes(ctx, chunk, _cells(ctx, chunk), year, start)
+        tax_revenue += float(chunk.taxes.sum())
+        social_contributions += float(chunk.social_contrib.sum())
+        with profiler.phase("write_back"):
+            population.write_chunk(start, chunk, STATE_FIELDS)
+
+    with profiler.phase("revenue"):
+        government.record_revenue(tax_revenue, social_contributions)
+        government.allocate_expenditure()
+
+    aggregates = AggregateAccumulator(sketch_compression)
+    for start, chunk in population.chunks(chunk_size):
+        profiler.count("chunks")
+        _receive_transfers_and_save(
+            ctx, chunk, _cells(ctx, chunk), government, scenario, year, start
+        )
+        with profiler.phase("aggregation"):
+            aggregates.update(chunk)
+        with profiler.phase("write_back"):
+            population.write_chunk(start, chunk, STATE_FIELDS)
+
+    with profiler.phase("fiscal_rules"):
+        government.apply_fiscal_rules()
+    return population, government, aggregates.result(government, year)
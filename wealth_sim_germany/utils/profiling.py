@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+_NULL_PHASE: AbstractContextManager[None] = nullcontext()
+
+
+@dataclass
+class PhaseStats:
+    calls: int = 0
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+
+
+@dataclass
+class TraceEvent:
+    name: str
+    start: float
+    duration: float
+    args: dict[str, Any]
+
+
+class NullProfiler:
+    """Instrumentation that records nothing; used when profiling is off."""
+
+    def phase(self, name: str, **args: Any) -> AbstractContextManager[None]:
+        return _NULL_PHASE
+
+    def count(self, name: str, amount: int = 1) -> None:
+        pass
+
+    def count_draws(self, distribution: str, amount: int = 1) -> None:
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+@dataclass
+class Profiler:
+    """Wall time, CPU time and call counts per named phase, plus counters.
+
+    ``draws`` counts the values sampled per distribution name. Every phase invocation is
+    also kept as a trace event for ``write_chrome_trace``.
+    """
+
+    phases: dict[str, PhaseStats] = field(default_factory=dict)
+    counters: dict[str, int] = field(default_factory=dict)
+    draws: dict[str, int] = field(default_factory=dict)
+    events: list[TraceEvent] = field(default_factory=list)
+    origin: float = field(default_factory=time.perf_counter)
+
+    @contextmanager
+    def phase(self, name: str, **args: Any) -> Iterator[None]:
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - wall_start
+            stats = self.phases.get(name)
+            if stats is None:
+                stats = self.phases[name] = PhaseStats()
+            stats.calls += 1
+            stats.wall_time += wall_time
+            stats.cpu_time += time.process_time() - cpu_start
+            self.events.append(TraceEvent(name, wall_start - self.origin, wall_time, args))
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def count_draws(self, distribution: str, amount: int = 1) -> None:
+        self.draws[distribution] = self.draws.get(distribution, 0) + amount
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "phases": {name: asdict(stats) for name, stats in self.phases.items()},
+            "counters": dict(self.counters),
+            "draws": dict(self.draws),
+        }
+
+    def write_json(self, path: str | Path) -> Path:
+        target = Path(path)
+        target.write_text(json.dumps(self.to_dict(), indent=2))
+        return target
+
+    def write_chrome_trace(self, path: str | Path) -> Path:
+        """Write the phase events in the Chrome trace format (``chrome://tracing``, Perfetto)."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": event.name,
+                "ph": "X",
+                "ts": event.start * 1e6,
+                "dur": event.duration * 1e6,
+                "pid": pid,
+                "tid": 0,
+                "args": event.args,
+            }
+            for event in self.events
+        ]
+        target = Path(path)
+        target.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+        return target
@@ -0,0 +1,590 @@
+from __future__ import annotations
+
+import hashlib
+import random
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+SCALAR_STREAM = 0
+BATCH_STREAM = 1
+
+
+class AntitheticRandom(random.Random):
+    """``random.Random`` whose draws mirror those of a plain generator with the same state.
+
+    ``random`` returns ``1 - u``, ``uniform``, ``gauss``, ``normalvariate`` and
+    ``lognormvariate`` are reflected about their centre and ``choice`` picks from the
+    other end of the sequence, so each draw is the antithetic partner of the draw a plain
+    ``random.Random`` makes from the same state.
+    """
+
+    def __init__(self, x: Any = None) -> None:
+        self._mirror = True
+        super().__init__(x)
+
+    def random(self) -> float:
+        value = super().random()
+        return 1.0 - value if self._mirror else value
+
+    def getrandbits(self, k: int) -> int:
+        # Defining this keeps integer draws on the bit stream instead of ``random``.
+        return super().getrandbits(k)
+
+    def normalvariate(self, mu: float = 0.0, sigma: float = 1.0) -> float:
+        return 2.0 * mu - self._plain(super().normalvariate, mu, sigma)
+
+    def gauss(self, mu: float = 0.0, sigma: float = 1.0) -> float:
+        return 2.0 * mu - self._plain(super().gauss, mu, sigma)
+
+    def choice(self, seq: Any) -> Any:
+        return seq[len(seq) - 1 - super().choice(range(len(seq)))]
+
+    def _plain(self, draw: Any, mu: float, sigma: float) -> float:
+        # Normal variates use uniforms internally; reflect the result, not the inputs.
+        self._mirror = False
+        try:
+            return draw(mu, sigma)
+        finally:
+            self._mirror = True
+
+
+class AntitheticGenerator(np.random.Generator):
+    """``np.random.Generator`` returning the antithetic partner of a plain generator's draws.
+
+    Uniform, normal and lognormal variates and integers are reflected; other methods
+    draw as usual, which keeps them valid but not negatively correlated.
+    """
+
+    def random(self, size: Any = None, dtype: Any = np.float64, out: Any = None) -> Any:
+        return 1.0 - super().random(size, dtype)
+
+    def uniform(self, low: Any = 0.0, high: Any = 1.0, size: Any = None) -> Any:
+        return np.add(low, high) - super().uniform(low, high, size)
+
+    def standard_normal(self, size: Any = None, dtype: Any = np.float64, out: Any = None) -> Any:
+        return -super().standard_normal(size, dtype)
+
+    def normal(self, loc: Any = 0.0, scale: Any = 1.0, size: Any = None) -> Any:
+        return np.multiply(2.0, loc) - super().normal(loc, scale, size)
+
+    def lognormal(self, mean: Any = 0.0, sigma: Any = 1.0, size: Any = None) -> Any:
+        return np.exp(np.multiply(2.0, mean)) / super().lognormal(mean, sigma, size)
+
+    def integers(
+        self,
+        low: Any,
+        high: Any = None,
+        size: Any = None,
+        dtype: Any = np.int64,
+        endpoint: bool = False,
+    ) -> Any:
+        if high is None:
+            low, high = 0, low
+        top = high if endpoint else np.subtract(high, 1)
+        return np.add(low, top) - super().integers(low, high, size, dtype, endpoint)
+
+    def __reduce__(self) -> tuple:
+        return (type(self), (self.bit_generator,))
+
+
+def _name_key(name: str) -> int:
+    return int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), "little")
+
+
+def _restore_generator(state: dict, antithetic: bool) -> np.random.Generator:
+    bit_generator = getattr(np.random, state["bit_generator"])()
+    bit_generator.state = state
+    return AntitheticGenerator(bit_generator) if antithetic else np.random.Generator(bit_generator)
+
+
+@dataclass
+class NamedStreams:
+    """One independent random stream per distribution name, all derived from ``seed``.
+
+    Runs sharing ``seed`` draw every name's values from the same stream, so a person gets
+    the same draws across scenarios no matter how many values other distributions need
+    (common random numbers). ``antithetic`` streams mirror the draws of plain ones.
+    """
+
+    seed: int
+    antithetic: bool = False
+    _rngs: dict[str, random.Random] = field(default_factory=dict, repr=False, compare=False)
+    _generators: dict[str, np.random.Generator] = field(
+        default_factory=dict,
+        repr=False,
+        compare=False,
+    )
+
+    def _seed_sequence(self, name: str, kind: int) -> np.random.SeedSequence:
+        return np.random.SeedSequence(self.seed, spawn_key=(_name_key(name), kind))
+
+    def rng(self, name: str) -> random.Random:
+        """Scalar stream for ``name``, created on first use."""
+        if name not in self._rngs:
+            state = self._seed_sequence(name, SCALAR_STREAM).generate_state(2, np.uint64)
+            seed = int(state[0]) << 64 | int(state[1])
+            self._rngs[name] = AntitheticRandom(seed) if self.antithetic else random.Random(seed)
+        return self._rngs[name]
+
+    def generator(self, name: str) -> np.random.Generator:
+        """Batch stream for ``name``, created on first use."""
+        if name not in self._generators:
+            bit_generator = np.random.PCG64(self._seed_sequence(name, BATCH_STREAM))
+            self._generators[name] = (
+                AntitheticGenerator(bit_generator)
+                if self.antithetic
+                else np.random.Generator(bit_generator)
+            )
+        return self._generators[name]
+
+    def fork(self) -> NamedStreams:
+        """Independent copy that continues every stream with identical draws."""
+        return NamedStreams.from_dict(self.to_dict())
+
+    def to_dict(self) -> dict[str, Any]:
+        rngs = {}
+        for name, rng in self._rngs.items():
+            version, internal_state, gauss_next = rng.getstate()
+            rngs[name] = [version, list(internal_state), gauss_next]
+        return {
+            "seed": self.seed,
+            "antithetic": self.antithetic,
+            "rngs": rngs,
+            "generators": {
+                name: generator.bit_generator.state for name, generator in self._generators.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> NamedStreams:
+        streams = cls(seed=data["seed"], antithetic=data["antithetic"])
+        for name, (version, internal_state, gauss_next) in data["rngs"].items():
+            rng = AntitheticRandom() if streams.antithetic else random.Random()
+            rng.setstate((version, tuple(internal_state), gauss_next))
+            streams._rngs[name] = rng
+        for name, state in data["generators"].items():
+            streams._generators[name] = _restore_generator(state, streams.antithetic)
+        return streams
+
+
+PHILOX_ROUNDS = 10
+PHILOX_M0 = 0xD2511F53
+PHILOX_M1 = 0xCD9E8D57
+PHILOX_W0 = 0x9E3779B9
+PHILOX_W1 = 0xBB67AE85
+_MASK32 = 0xFFFFFFFF
+_TWO_53 = float(1 << 53)
+
+
+def _philox_rounds(words: np.ndarray, key: tuple[int, int]) -> np.ndarray:
+    """Philox4x32-10 in place on ``words``, a (4, n) ``uint64`` array of 32-bit values."""
+    c0, c1, c2, c3 = words
+    m0, m1, mask = np.uint64(PHILOX_M0), np.uint64(PHILOX_M1), np.uint64(_MASK32)
+    shift = np.uint64(32)
+    p0 = np.empty_like(c0)
+    p1 = np.empty_like(c0)
+    k0, k1 = key
+    for _ in range(PHILOX_ROUNDS):
+        np.multiply(c0, m0, out=p0)
+        np.multiply(c2, m1, out=p1)
+        np.right_shift(p1, shift, out=c0)
+        c0 ^= c1
+        c0 ^= np.uint64(k0)
+        np.bitwise_and(p1, mask, out=c1)
+        np.right_shift(p0, shift, out=c2)
+        c2 ^= c3
+        c2 ^= np.uint64(k1)
+        np.bitwise_and(p0, mask, out=c3)
+        k0 = (k0 + PHILOX_W0) & _MASK32
+        k1 = (k1 + PHILOX_W1) & _MASK32
+    return words
+
+
+def philox4x32(counters: np.ndarray, key: tuple[int, int]) -> np.ndarray:
+    """Philox4x32-10 block function applied to every row of ``counters`` (n, 4).
+
+    Returns the (n, 4) ``uint32`` output words. Each counter maps to its own
+    pseudo-random block, so any subset of counters can be evaluated independently.
+    """
+    words = np.array(np.asarray(counters, dtype=np.uint64).T, order="C")
+    return _philox_rounds(words, key).T.astype(np.uint32)
+
+
+def philox4x32_scalar(counter: tuple[int, int, int, int], key: tuple[int, int]) -> tuple:
+    """``philox4x32`` for a single counter, in plain integer arithmetic."""
+    c0, c1, c2, c3 = counter
+    k0, k1 = key
+    for _ in range(PHILOX_ROUNDS):
+        p0 = PHILOX_M0 * c0
+        p1 = PHILOX_M1 * c2
+        c0, c1, c2, c3 = (p1 >> 32) ^ c1 ^ k0, p1 & _MASK32, (p0 >> 32) ^ c3 ^ k1, p0 & _MASK32
+        k0 = (k0 + PHILOX_W0) & _MASK32
+        k1 = (k1 + PHILOX_W1) & _MASK32
+    return c0, c1, c2, c3
+
+
+def _stream_key(seed: int, name: str) -> tuple[int, int]:
+    digest = hashlib.blake2b(f"{seed}:{name}".encode(), digest_size=8).digest()
+    value = int.from_bytes(digest, "little")
+    return value & _MASK32, value >> 32
+
+
+def _uniforms(index: np.ndarray, year: int, slot: int, key: tuple[int, int]) -> np.ndarray:
+    """Uniform in (0, 1) from the block at counter (index, year, slot) of each person."""
+    index = np.asarray(index, dtype=np.uint64)
+    words = np.empty((4, len(index)), dtype=np.uint64)
+    np.bitwise_and(index, np.uint64(_MASK32), out=words[0])
+    np.right_shift(index, np.uint64(32), out=words[1])
+    words[2] = year & _MASK32
+    words[3] = slot & _MASK32
+    words = _philox_rounds(words, key)
+    return _to_unit(words[0], words[1])
+
+
+def _to_unit(high: Any, low: Any) -> Any:
+    # 53 random bits from two words, centred in their interval so 0 and 1 never occur.
+    return ((high >> 5) * 67108864.0 + (low >> 6) + 0.5) / _TWO_53
+
+
+def normal_ppf(p: np.ndarray) -> np.ndarray:
+    """Inverse standard normal CDF (Wichura's AS 241), vectorised over ``p`` in (0, 1)."""
+    p = np.asarray(p, dtype=float)
+    q = p - 0.5
+    result = np.empty_like(p)
+    central = np.abs(q) <= 0.425
+    if central.any():
+        qc = q[central]
+        r = 0.180625 - qc * qc
+        num = (
+            (
+                (
+                    (
+                        (
+                            (2509.0809287301226727 * r + 33430.575583588128105) * r
+                            + 67265.770927008700853
+                        )
+                        * r
+                        + 45921.953931549871457
+                    )
+                    * r
+                    + 13731.693765509461125
+                )
+                * r
+                + 1971.5909503065514427
+            )
+            * r
+            + 133.14166789178437745
+        ) * r + 3.387132872796366608
+        den = (
+            (
+                (
+                    (
+                        (
+                            (5226.495278852545925 * r + 28729.085735721942674) * r
+                            + 39307.89580009271061
+                        )
+                        * r
+                        + 21213.794301586595867
+                    )
+                    * r
+                    + 5394.1960214247511077
+                )
+                * r
+                + 687.1870074920579083
+            )
+            * r
+            + 42.313330701600911252
+        ) * r + 1.0
+        result[central] = qc * num / den
+    tail = ~central
+    if tail.any():
+        qt = q[tail]
+        r = np.sqrt(-np.log(np.where(qt < 0, p[tail], 1.0 - p[tail])))
+        near = r <= 5.0
+        value = np.empty_like(r)
+        rn = r[near] - 1.6
+        value[near] = (
+            (
+                (
+                    (
+                        (
+                            (
+                                (7.7454501427834140764e-4 * rn + 0.0227238449892691845833) * rn
+                                + 0.24178072517745061177
+                            )
+                            * rn
+                            + 1.27045825245236838258
+                        )
+                        * rn
+                        + 3.64784832476320460504
+                    )
+                    * rn
+                    + 5.7694972214606914055
+                )
+                * rn
+                + 4.6303378461565452959
+            )
+            * rn
+            + 1.42343711074968357734
+        ) / (
+            (
+                (
+                    (
+                        (
+                            (
+                                (1.05075007164441684324e-9 * rn + 5.475938084995344946e-4) * rn
+                                + 0.0151986665636164571966
+                            )
+                            * rn
+                            + 0.14810397642748007459
+                        )
+                        * rn
+                        + 0.68976733498510000455
+                    )
+                    * rn
+                    + 1.6763848301838038494
+                )
+                * rn
+                + 2.05319162663775882187
+            )
+            * rn
+            + 1.0
+        )
+        rf = r[~near] - 5.0
+        value[~near] = (
+            (
+                (
+                    (
+                        (
+                            (
+                                (2.01033439929228813265e-7 * rf + 2.71155556874348757815e-5) * rf
+                                + 0.0012426609473880784386
+                            )
+                            * rf
+                            + 0.026532189526576123093
+                        )
+                        * rf
+                        + 0.29656057182850489123
+                    )
+                    * rf
+                    + 1.7848265399172913358
+                )
+                * rf
+                + 5.4637849111641143699
+            )
+            * rf
+            + 6.6579046435011037772
+        ) / (
+            (
+                (
+                    (
+                        (
+                            (
+                                (2.04426310338993978564e-15 * rf + 1.4215117583164458887e-7) * rf
+                                + 1.8463183175100546818e-5
+                            )
+                            * rf
+                            + 7.868691311456132591e-4
+                        )
+                        * rf
+                        + 0.0148753612908506148525
+                    )
+                    * rf
+                    + 0.13692988092273580531
+                )
+                * rf
+                + 0.59983220655588793769
+            )
+            * rf
+            + 1.0
+        )
+        result[tail] = np.where(qt < 0, -value, value)
+    return result
+
+
+class CounterGenerator(np.random.Generator):
+    """Generator drawing one value per person from counter-based streams.
+
+    The ``k``-th call to a supported method (``random``, ``uniform``, ``standard_normal``,
+    ``normal``, ``lognormal``, ``exponential``, ``integers``) returns, for every entry of
+    ``index``, a value computed only from (seed, name, year, person index, ``k``). Slices
+    of the population therefore draw the same numbers whether they are simulated whole,
+    in chunks or in parallel. ``size`` must match the number of persons. Other methods
+    draw from an ordinary Philox generator keyed by the stream and are not
+    order-independent.
+    """
+
+    def __init__(self, seed: int, year: int, index: np.ndarray, name: str = "") -> None:
+        self.seed = seed
+        self.year = year
+        self.index = np.asarray(index, dtype=np.int64)
+        self.name = name
+        self._key = _stream_key(seed, name)
+        self._slot = 0
+        super().__init__(np.random.Philox(key=self._key[0] | self._key[1] << 32))
+
+    def for_draws(self, name: str, rows: np.ndarray | None = None) -> CounterGenerator:
+        """Generator for distribution ``name`` and the persons at positions ``rows``."""
+        index = self.index if rows is None else self.index[rows]
+        return CounterGenerator(self.seed, self.year, index, name)
+
+    def _next_uniforms(self, size: Any) -> np.ndarray:
+        count = len(self.index)
+        shape = (count,) if size is None else size
+        if int(np.prod(shape)) != count:
+            raise ValueError(f"Counter-based draws need exactly one value per person ({count})")
+        uniforms = _uniforms(self.index, self.year, self._slot, self._key)
+        self._slot += 1
+        return uniforms.reshape(shape)
+
+    def random(self, size: Any = None, dtype: Any = np.float64, out: Any = None) -> Any:
+        return self._next_uniforms(size)
+
+    def uniform(self, low: Any = 0.0, high: Any = 1.0, size: Any = None) -> Any:
+        return low + (np.subtract(high, low)) * self._next_uniforms(size)
+
+    def standard_normal(self, size: Any = None, dtype: Any = np.float64, out: Any = None) -> Any:
+        return normal_ppf(self._next_uniforms(size))
+
+    def normal(self, loc: Any = 0.0, scale: Any = 1.0, size: Any = None) -> Any:
+        return loc + np.multiply(scale, normal_ppf(self._next_uniforms(size)))
+
+    def lognormal(self, mean: Any = 0.0, sigma: Any = 1.0, size: Any = None) -> Any:
+        return np.exp(mean + np.multiply(sigma, normal_ppf(self._next_uniforms(size))))
+
+    def exponential(self, scale: Any = 1.0, size: Any = None) -> Any:
+        return -np.multiply(scale, np.log1p(-self._next_uniforms(size)))
+
+    def integers(
+        self,
+        low: Any,
+        high: Any = None,
+        size: Any = None,
+        dtype: Any = np.int64,
+        endpoint: bool = False,
+    ) -> Any:
+        if high is None:
+            low, high = 0, low
+        span = np.subtract(high, low) + (1 if endpoint else 0)
+        return (low + np.floor(self._next_uniforms(size) * span)).astype(dtype)
+
+    def __reduce__(self) -> tuple:
+        return (type(self), (self.seed, self.year, self.index, self.name))
+
+
+class CounterRandom(random.Random):
+    """``random.Random`` over the counter-based stream of one person.
+
+    Draws depend only on (seed, name, year, person ``index``) and how many values this
+    person has drawn so far. Positioned rather than seeded: ``seed`` is a no-op.
+    """
+
+    def __init__(self, seed: int, year: int, index: int, name: str = "") -> None:
+        self._stream = (seed, year, index, name)
+        self._key = _stream_key(seed, name)
+        self._slot = 0
+        self._draws: dict[str, CounterRandom] = {}
+        super().__init__()
+
+    def for_draws(self, name: str) -> CounterRandom:
+        """Stream of the same person and year for distribution ``name``.
+
+        Every call for ``name`` returns the same stream, so a second draw continues at
+        the next slot instead of repeating the first.
+        """
+        stream = self._draws.get(name)
+        if stream is None:
+            seed, year, index, _ = self._stream
+            stream = self._draws[name] = CounterRandom(seed, year, index, name)
+        return stream
+
+    def seed(self, a: Any = None, version: int = 2) -> None:
+        pass
+
+    def getstate(self) -> Any:
+        return self._slot
+
+    def setstate(self, state: Any) -> None:
+        self._slot = state
+
+    def _block(self) -> tuple:
+        _, year, index, _ = self._stream
+        counter = (index & _MASK32, index >> 32, year & _MASK32, self._slot & _MASK32)
+        self._slot += 1
+        return philox4x32_scalar(counter, self._key)
+
+    def random(self) -> float:
+        words = self._block()
+        return _to_unit(words[0], words[1])
+
+    def getrandbits(self, k: int) -> int:
+        value = 0
+        bits = 0
+        while bits < k:
+            for word in self._block():
+                value = value << 32 | word
+            bits += 128
+        return value >> (bits - k)
+
+    def __reduce__(self) -> tuple:
+        return (type(self), self._stream, self._slot)
+
+
+@dataclass(frozen=True)
+class CounterStreams:
+    """Counter-based (Philox4x32-10) random numbers keyed by (seed, year, name, person).
+
+    Unlike ``NamedStreams`` there is no stream state to advance: a person's draws in a
+    year follow from its position in the population alone, so reordering loops, changing
+    the chunk size or splitting the population across workers leaves results unchanged.
+    """
+
+    seed: int
+
+    def uniforms(self, name: str, year: int, index: np.ndarray, slot: int = 0) -> np.ndarray:
+        """The ``slot``-th uniform in (0, 1) of every person in ``index``."""
+        return _uniforms(index, year, slot, _stream_key(self.seed, name))
+
+    def generator(self, year: int, index: np.ndarray) -> CounterGenerator:
+        """Generator for the persons at ``index``; bound to a name by the distributions."""
+        return CounterGenerator(self.seed, year, index)
+
+    def rng(self, year: int, index: int) -> CounterRandom:
+        """Scalar stream of person ``index``; bound to a name by the distributions."""
+        return CounterRandom(self.seed, year, index)
+
+    def fork(self) -> CounterStreams:
+        return self
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"kind": "counter", "seed": self.seed}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CounterStreams:
+        return cls(seed=data["seed"])
+
+
+def streams_from_dict(data: dict[str, Any]) -> NamedStreams | CounterStreams:
+    """Restore streams saved with ``to_dict``."""
+    if data.get("kind") == "counter":
+        return CounterStreams.from_dict(data)
+    return NamedStreams.from_dict(data)
+
+
+def streams_like(
+    template: NamedStreams | CounterStreams | None,
+    seed: int,
+    antithetic: bool = False,
+) -> NamedStreams | CounterStreams:
+    """Fresh streams seeded with ``seed``, of the same kind as ``template``.
+
+    Counter-based templates stay counter-based so replicas keep their per-person draws;
+    anything else gets ``NamedStreams``. Counter-based streams cannot be mirrored.
+    """
+    if isinstance(template, CounterStreams):
+        if antithetic:
+            raise ValueError("Antithetic replications need named streams")
+        return CounterStreams(seed)
+    return NamedStreams(seed, antithetic=antithetic)